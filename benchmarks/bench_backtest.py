@@ -0,0 +1,95 @@
+"""Benchmark: bar-by-bar loop (legacy) vs vectorized ``run_backtest`` over the universe.
+
+Random buy/sell signals on ~5% of the bars of a long-format frame (next-open fills, fees
+on both sides, equal weight per symbol of the universe with idle shares in cash). The reference walks every symbol bar
+by bar in Python, the way a per-``Signal`` design would; the vectorized engine runs array
+operations over all symbols at once.
+
+Usage:
+    python benchmarks/bench_backtest.py [--symbols 400] [--years 10] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import timeit
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from bench_indicators import SESSIONS_PER_YEAR, make_frame
+
+from swing_trade_b3.services.backtest import ACTIONS, run_backtest
+
+FEE_RATE = 0.0005
+
+
+def legacy_equity(prices: pd.DataFrame, signals: pd.DataFrame) -> np.ndarray:
+    """Per-symbol, per-bar loop producing the same portfolio equity curve."""
+    targets = {
+        (sym, day): ACTIONS[action]
+        for day, sym, action in signals[["date", "symbol", "action"]].itertuples(index=False)
+    }
+    day_returns: defaultdict[pd.Timestamp, list[float]] = defaultdict(list)
+    for sym, g in prices.groupby("symbol", sort=False):
+        held = want = prev_close = 0.0
+        for day, open_, close in zip(g["date"], g["open"], g["close"]):
+            growth = 1.0
+            if held:
+                growth *= open_ / prev_close
+            if want:
+                growth *= close / open_
+            if want != held:
+                growth *= 1 - FEE_RATE
+            if held or want:
+                day_returns[day].append(growth - 1)
+            held, prev_close = want, close
+            want = targets.get((sym, day), want)
+    days = sorted(prices["date"].unique())
+    n = prices["symbol"].nunique()
+    rets = np.array([sum(day_returns[d]) / n for d in days])
+    return np.asarray(np.cumprod(1 + rets))
+
+
+def make_signals(prices: pd.DataFrame, share: float = 0.05, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    picked = prices[rng.random(len(prices)) < share]
+    return pd.DataFrame(
+        {
+            "date": picked["date"].array,
+            "symbol": picked["symbol"].to_numpy(),
+            "action": rng.choice(["buy", "sell"], len(picked)),
+        }
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--symbols", type=int, default=400)
+    ap.add_argument("--years", type=int, nargs="+", default=[10])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'rows':>9} {'legacy_ms':>10} {'vector_ms':>10} {'speedup':>8}")
+    for years in args.years:
+        prices = make_frame(args.symbols, years * SESSIONS_PER_YEAR)
+        prices["date"] = pd.to_datetime(prices["date"], utc=True)  # processed dtype
+        signals = make_signals(prices)
+        t0 = time.perf_counter()
+        expected = legacy_equity(prices, signals)
+        t_old = time.perf_counter() - t0  # single run: the loop takes seconds
+        result = run_backtest(prices, signals, fee_rate=FEE_RATE)
+        np.testing.assert_allclose(result.equity.to_numpy(), expected, rtol=1e-9)
+        t_new = min(
+            timeit.repeat(
+                lambda: run_backtest(prices, signals, fee_rate=FEE_RATE),
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(f"{len(prices):>9} {t_old * 1e3:>10.1f} {t_new * 1e3:>10.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: multi-pass (legacy) vs fused ``clean_and_validate`` on multi-symbol frames.
+
+Reports best wall time and peak traced allocations (``tracemalloc``) per implementation,
+plus the already-clean fast path (input that satisfies the schema is returned unchanged).
+
+Usage:
+    python benchmarks/bench_clean.py [--rows 1000000 3000000] [--symbols 400] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+import tracemalloc
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.services.signals import STD_COLS, clean_and_validate
+
+
+def legacy_clean(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """Pre-fusion implementation (one full copy per step), kept for reference."""
+    df = df_raw.copy()
+    df["date"] = pd.to_datetime(df["date"], utc=True)
+    df["symbol"] = df["symbol"].astype("string")
+    for col in ["open", "high", "low", "close"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    df["volume"] = pd.to_numeric(df["volume"], errors="coerce").astype("Int64")
+    df = df.dropna(subset=STD_COLS)
+    df = df[(df[["open", "high", "low", "close"]] >= 0).all(axis=1)]
+    df = df[df["volume"] >= 0]
+    df = (
+        df.sort_values(["symbol", "date"], kind="stable")
+        .drop_duplicates(subset=["symbol", "date"], keep="last")
+        .reset_index(drop=True)
+    )
+    df["volume"] = df["volume"].astype("int64")
+    return df[STD_COLS]
+
+
+def make_frame(rows: int, symbols: int, seed: int = 42) -> pd.DataFrame:
+    """Shuffled multi-symbol bars with ~1% duplicates, NaNs and negative volumes."""
+    rng = np.random.default_rng(seed)
+    per_symbol = max(1, rows // symbols)
+    sym = np.repeat([f"S{i:04d}" for i in range(symbols)], per_symbol)
+    day = np.tile(np.arange(per_symbol), symbols)
+    n = len(sym)
+    price = rng.uniform(1, 100, n)
+    price[rng.random(n) < 0.005] = np.nan
+    volume = rng.integers(0, 10_000_000, n)
+    volume[rng.random(n) < 0.005] = -1
+    df = pd.DataFrame(
+        {
+            "date": pd.Timestamp("2000-01-03", tz="UTC") + pd.to_timedelta(day, unit="D"),
+            "symbol": sym,
+            "open": price,
+            "high": price * 1.01,
+            "low": price * 0.99,
+            "close": price,
+            "volume": volume,
+        }
+    )
+    dups = df.sample(frac=0.01, random_state=seed)
+    return pd.concat([df, dups], ignore_index=True).sample(frac=1.0, random_state=seed)
+
+
+def measure(fn: Callable[[], pd.DataFrame], repeat: int) -> tuple[float, float]:
+    """Best wall time (s) and peak traced allocation (MiB) of ``fn``."""
+    best = min(timeit.repeat(fn, number=1, repeat=repeat))
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 3_000_000])
+    ap.add_argument("--symbols", type=int, default=400)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(
+        f"{'rows':>9} {'legacy_ms':>10} {'legacy_MiB':>10} {'fused_ms':>9} {'fused_MiB':>9}"
+        f" {'speedup':>8} {'clean_ms':>9}"
+    )
+    for n in args.rows:
+        raw = make_frame(n, args.symbols)
+        new = clean_and_validate(raw)
+        pd.testing.assert_frame_equal(new, legacy_clean(raw))
+        t_old, m_old = measure(lambda: legacy_clean(raw), args.repeat)
+        t_new, m_new = measure(lambda: clean_and_validate(raw), args.repeat)
+        t_clean, _m = measure(lambda: clean_and_validate(new), args.repeat)
+        print(
+            f"{len(raw):>9} {t_old * 1e3:>10.1f} {m_old:>10.1f} {t_new * 1e3:>9.1f}"
+            f" {m_new:>9.1f} {t_old / t_new:>7.1f}x {t_clean * 1e3:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: dict/``Signal``-based event loop (legacy) vs ``run_event_backtest``.
+
+Both replay every bar of a long-format frame in (date, symbol) order with the same rule
+(buy 100 shares every ``--period`` bars of a symbol, sell them ``--period // 2`` bars
+later, market orders filled at the next open). The reference keeps pending orders as
+``Signal`` dataclasses in dicts, positions in dicts and reads bars with ``itertuples``; the
+event core uses the slots ``Bar``/``Position`` records and the structured order array.
+Reports the cost per bar.
+
+Usage:
+    python benchmarks/bench_event_backtest.py [--symbols 400] [--years 5] [--period 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import pandas as pd
+from bench_indicators import SESSIONS_PER_YEAR, make_frame
+
+from swing_trade_b3.domain.ports import Signal
+from swing_trade_b3.services.event_backtest import Bar, SimulatedBroker, run_event_backtest
+
+QTY = 100
+CASH = 1_000_000.0
+
+
+def legacy_equity(prices: pd.DataFrame, period: int) -> float:
+    """Final equity of the rule with dict order/position books and ``Signal`` objects."""
+    pending: Dict[str, List[Signal]] = defaultdict(list)
+    positions: Dict[str, Dict[str, Any]] = {}
+    seen: Dict[str, int] = defaultdict(int)
+    cash = CASH
+    for row in prices.sort_values(["date", "symbol"]).itertuples(index=False):
+        for sig in pending.pop(row.symbol, []):
+            qty = QTY if sig.action == "buy" else -QTY
+            pos = positions.setdefault(row.symbol, {"qty": 0, "last": row.open})
+            pos["qty"] += qty
+            cash -= qty * row.open
+        if row.symbol in positions:
+            positions[row.symbol]["last"] = row.close
+        n = seen[row.symbol]
+        seen[row.symbol] = n + 1
+        if n % period == 0:
+            pending[row.symbol].append(Signal(row.date, row.symbol, "buy"))
+        elif n % period == period // 2:
+            pending[row.symbol].append(Signal(row.date, row.symbol, "sell"))
+    return float(cash + sum(p["qty"] * p["last"] for p in positions.values()))
+
+
+class Periodic:
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self.seen: Dict[str, int] = defaultdict(int)
+
+    def on_bar(self, bar: Bar, broker: SimulatedBroker) -> None:
+        n = self.seen[bar.symbol]
+        self.seen[bar.symbol] = n + 1
+        if n % self.period == 0:
+            broker.place_order(bar.symbol, QTY, "buy")
+        elif n % self.period == self.period // 2:
+            broker.place_order(bar.symbol, QTY, "sell")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--symbols", type=int, default=400)
+    ap.add_argument("--years", type=int, nargs="+", default=[5])
+    ap.add_argument("--period", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"{'bars':>9} {'legacy_us/bar':>14} {'event_us/bar':>13} {'speedup':>8}")
+    for years in args.years:
+        prices = make_frame(args.symbols, years * SESSIONS_PER_YEAR)
+        prices["date"] = pd.to_datetime(prices["date"], utc=True)  # processed dtype
+        t0 = time.perf_counter()
+        expected = legacy_equity(prices, args.period)
+        t_old = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        result = run_event_backtest(prices, Periodic(args.period), cash=CASH)
+        t_new = time.perf_counter() - t0
+        assert abs(result.equity.iloc[-1] - expected) <= 1e-6 * CASH, (result, expected)
+        per_old, per_new = t_old / len(prices) * 1e6, t_new / len(prices) * 1e6
+        print(f"{len(prices):>9} {per_old:>14.2f} {per_new:>13.2f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
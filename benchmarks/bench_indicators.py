@@ -0,0 +1,99 @@
+"""Benchmark: per-symbol pandas (legacy) vs vectorized indicators over the whole universe.
+
+Computes RSI, MACD, ATR and Bollinger Bands for every symbol of a long-format frame. The
+reference runs pandas ``ewm``/``rolling`` symbol by symbol; the vectorized implementation
+(``services.indicators.compute_indicators``) runs each filter once over all symbols.
+
+Usage:
+    python benchmarks/bench_indicators.py [--symbols 400] [--years 5 20] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.services.indicators import compute_indicators
+
+SESSIONS_PER_YEAR = 248
+
+
+def legacy_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """Per-symbol reference with the textbook pandas formulations."""
+    out = []
+    for _sym, g in df.groupby("symbol", sort=False):
+        close = g["close"]
+        delta = close.diff().dropna()
+        gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+        rsi = (100 * gain / (gain + loss)).reindex(close.index)
+        rsi.iloc[:14] = np.nan
+        line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        signal = line.ewm(span=9, adjust=False).mean()
+        prev = close.shift()
+        true_range = pd.concat(
+            [g["high"] - g["low"], (g["high"] - prev).abs(), (g["low"] - prev).abs()], axis=1
+        ).max(axis=1)
+        atr = true_range.ewm(alpha=1 / 14, adjust=False).mean()
+        atr.iloc[:13] = np.nan
+        mid = close.rolling(20).mean()
+        std = close.rolling(20).std(ddof=0)
+        out.append(
+            pd.DataFrame(
+                {
+                    "rsi": rsi,
+                    "macd": line,
+                    "macd_signal": signal,
+                    "macd_hist": line - signal,
+                    "atr": atr,
+                    "bb_mid": mid,
+                    "bb_upper": mid + 2 * std,
+                    "bb_lower": mid - 2 * std,
+                }
+            )
+        )
+    return pd.concat([df, pd.concat(out)], axis=1)
+
+
+def make_frame(symbols: int, sessions: int, seed: int = 42) -> pd.DataFrame:
+    """Processed-schema random walks; symbol price levels span three orders of magnitude."""
+    rng = np.random.default_rng(seed)
+    level = np.repeat(10.0 ** rng.uniform(0, 3, symbols), sessions)
+    close = level * np.exp(np.cumsum(rng.normal(0, 0.02, (symbols, sessions)), axis=1).ravel())
+    spread = np.abs(rng.normal(0, 0.01, symbols * sessions)) * close
+    dates = pd.bdate_range("2000-01-03", periods=sessions, tz="UTC")
+    return pd.DataFrame(
+        {
+            "date": np.tile(dates, symbols),
+            "symbol": pd.array(np.repeat([f"S{i:04d}" for i in range(symbols)], sessions)),
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(0, 10_000_000, symbols * sessions),
+        }
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--symbols", type=int, default=400)
+    ap.add_argument("--years", type=int, nargs="+", default=[5, 20])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'rows':>9} {'legacy_ms':>10} {'vector_ms':>10} {'speedup':>8}")
+    for years in args.years:
+        df = make_frame(args.symbols, years * SESSIONS_PER_YEAR)
+        new = compute_indicators(df)
+        pd.testing.assert_frame_equal(new, legacy_indicators(df), rtol=1e-6)
+        t_old = min(timeit.repeat(lambda: legacy_indicators(df), number=1, repeat=args.repeat))
+        t_new = min(timeit.repeat(lambda: compute_indicators(df), number=1, repeat=args.repeat))
+        print(f"{len(df):>9} {t_old * 1e3:>10.1f} {t_new * 1e3:>10.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
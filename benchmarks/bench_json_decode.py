@@ -0,0 +1,46 @@
+"""Benchmark: JSON decoders available to the brapi adapter on max-range payloads.
+
+Usage:
+    python benchmarks/bench_json_decode.py [--rows 6300 60000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from bench_normalize import make_payload
+
+from swing_trade_b3.adapters.connectors.market_data.b3_adapter import (
+    _load_decoder,
+    _normalize_to_ohlcv,
+)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, nargs="+", default=[6_300, 60_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    names = [n for n in ("json", "orjson", "simdjson") if _load_decoder(n) is not None]
+    print(f"{'rows':>8} {'decoder':>9} {'decode_ms':>10} {'decode+normalize_ms':>20}")
+    for n in args.rows:
+        raw = json.dumps(make_payload(n)).encode()
+        for name in names:
+            decode = _load_decoder(name)
+            assert decode is not None
+            t_dec = min(timeit.repeat(lambda: decode(raw), number=1, repeat=args.repeat))
+            t_all = min(
+                timeit.repeat(
+                    lambda: _normalize_to_ohlcv("BENCH3", decode(raw)),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print(f"{n:>8} {name:>9} {t_dec * 1e3:>10.1f} {t_all * 1e3:>20.1f}")
+
+
+if __name__ == "__main__":
+    main()
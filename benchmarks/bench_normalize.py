@@ -0,0 +1,112 @@
+"""Benchmark: row-wise (legacy) vs columnar ``_normalize_to_ohlcv`` on max-range payloads.
+
+Usage:
+    python benchmarks/bench_normalize.py [--rows 6300 60000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import timeit
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from swing_trade_b3.adapters.connectors.market_data.b3_adapter import _normalize_to_ohlcv
+
+
+def legacy_normalize(symbol: str, payload: Dict[str, Any]) -> pd.DataFrame:
+    """Pre-vectorization parser (one dict + one ``pd.to_datetime`` per row), kept for reference."""
+    series = payload["results"][0]["historicalDataPrice"]
+    rows: List[Dict[str, Any]] = []
+    for rec in series:
+        try:
+            ts = int(rec["date"])
+            o = float(rec["open"]) if rec.get("open") is not None else math.nan
+            h = float(rec["high"]) if rec.get("high") is not None else math.nan
+            low_val = float(rec["low"]) if rec.get("low") is not None else math.nan
+            c = float(rec["close"]) if rec.get("close") is not None else math.nan
+            v_raw = rec.get("volume")
+            v = int(v_raw) if v_raw is not None else -1
+        except (KeyError, ValueError, TypeError):
+            continue
+        rows.append(
+            {
+                "date": pd.to_datetime(ts, unit="s", utc=True),
+                "symbol": str(symbol),
+                "open": o,
+                "high": h,
+                "low": low_val,
+                "close": c,
+                "volume": v,
+            }
+        )
+    df = pd.DataFrame.from_records(
+        rows, columns=["date", "symbol", "open", "high", "low", "close", "volume"]
+    )
+    df["date"] = pd.to_datetime(df["date"], utc=True)
+    df["symbol"] = df["symbol"].astype("string")
+    for col in ["open", "high", "low", "close"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    df["volume"] = pd.to_numeric(df["volume"], errors="coerce").astype("Int64")
+    df = df.dropna(subset=["open", "high", "low", "close", "volume", "date", "symbol"])
+    df = df[(df[["open", "high", "low", "close"]] >= 0).all(axis=1)]
+    df = df[df["volume"] >= 0]
+    df = (
+        df.sort_values("date")
+        .drop_duplicates(subset=["symbol", "date"], keep="last")
+        .reset_index(drop=True)
+    )
+    df["volume"] = df["volume"].astype("int64")
+    return df
+
+
+def make_payload(rows: int, seed: int = 42) -> Dict[str, Any]:
+    """Synthetic brapi ``range=max`` payload with daily bars and a few null rows."""
+    rnd = random.Random(seed)
+    start = int(pd.Timestamp("1995-01-02", tz="UTC").timestamp())
+    price = 10.0
+    series: List[Dict[str, Any]] = []
+    for i in range(rows):
+        price = max(0.01, price * (1 + rnd.gauss(0, 0.02)))
+        series.append(
+            {
+                "date": start + i * 86400,
+                "open": round(price, 2),
+                "high": round(price * 1.01, 2),
+                "low": round(price * 0.99, 2),
+                "close": round(price, 2) if i % 997 else None,
+                "volume": rnd.randint(1_000, 10_000_000),
+                "adjustedClose": round(price, 2),
+            }
+        )
+    return {"results": [{"symbol": "BENCH3", "historicalDataPrice": series}]}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, nargs="+", default=[6_300, 60_000])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'rows':>8} {'legacy_ms':>10} {'columnar_ms':>12} {'speedup':>8}")
+    for n in args.rows:
+        payload = make_payload(n)
+        new = _normalize_to_ohlcv("BENCH3", payload)
+        old = legacy_normalize("BENCH3", payload)
+        pd.testing.assert_frame_equal(new, old)
+        t_old = min(
+            timeit.repeat(lambda: legacy_normalize("BENCH3", payload), number=1, repeat=args.repeat)
+        )
+        t_new = min(
+            timeit.repeat(
+                lambda: _normalize_to_ohlcv("BENCH3", payload), number=1, repeat=args.repeat
+            )
+        )
+        print(f"{n:>8} {t_old * 1e3:>10.1f} {t_new * 1e3:>12.1f} {t_old / t_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
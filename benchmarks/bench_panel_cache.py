@@ -0,0 +1,80 @@
+"""Benchmark: pivoting ``data/processed`` on every call (legacy) vs the wide-panel cache.
+
+Writes ``--symbols`` processed files to a temporary directory, then measures:
+
+- legacy: ``load_processed`` for every symbol, concatenate and ``pivot`` the close;
+- cached, unchanged: ``update_wide_panel`` when nothing changed (footer checks only);
+- cached, one day appended: after ``save_processed`` appends a day to every symbol (only
+  the new tail files are read).
+
+Each cached panel must equal the legacy pivot (on the calendar-aligned axis).
+
+Usage:
+    python benchmarks/bench_panel_cache.py [--symbols 400] [--years 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+from bench_indicators import SESSIONS_PER_YEAR, make_frame
+
+from swing_trade_b3.adapters.persistence.panel_cache import update_wide_panel
+from swing_trade_b3.adapters.persistence.repositories import load_processed, save_processed
+from swing_trade_b3.services.calendar import sessions
+
+
+def legacy_close(symbols: List[str], base: Path) -> pd.DataFrame:
+    df = pd.concat([load_processed(s, base) for s in symbols], ignore_index=True)
+    return df.astype({"symbol": object}).pivot(index="date", columns="symbol", values="close")
+
+
+def check(symbols: List[str], base: Path) -> float:
+    t0 = time.perf_counter()
+    panel, _statuses = update_wide_panel(symbols, base)
+    elapsed = time.perf_counter() - t0
+    expected = legacy_close(symbols, base)
+    expected = expected.reindex(
+        expected.index.union(sessions(expected.index[0], expected.index[-1]))
+    )
+    pd.testing.assert_frame_equal(panel.field("close"), expected[symbols], check_freq=False)
+    return elapsed
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--symbols", type=int, default=400)
+    ap.add_argument("--years", type=int, default=20)
+    args = ap.parse_args()
+
+    n = args.years * SESSIONS_PER_YEAR
+    prices = make_frame(args.symbols, n + 1)
+    prices["date"] = pd.to_datetime(prices["date"], utc=True)  # processed dtype
+    last_day = prices["date"] == prices["date"].max()
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        groups = dict(tuple(prices[~last_day].groupby("symbol", sort=False)))
+        symbols = [str(s) for s in groups]
+        for sym, frame in groups.items():
+            save_processed(str(sym), frame, base)
+
+        t0 = time.perf_counter()
+        legacy_close(symbols, base)
+        t_legacy = time.perf_counter() - t0
+        t_first = check(symbols, base)
+        t_same = check(symbols, base)
+        for sym, frame in prices[last_day].groupby("symbol", sort=False):
+            save_processed(str(sym), frame, base)
+        t_append = check(symbols, base)
+
+    print(f"{'rows':>9} {'legacy_s':>9} {'build_s':>8} {'unchanged_s':>12} {'append_s':>9}")
+    print(f"{len(prices):>9} {t_legacy:>9.3f} {t_first:>8.3f} {t_same:>12.3f} {t_append:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
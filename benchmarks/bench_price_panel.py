@@ -0,0 +1,79 @@
+"""Benchmark: shipping pickled frames to every worker (legacy) vs a shared-memory panel.
+
+Each of ``--workers`` processes needs the whole universe (as in a sweep over all symbols).
+The reference passes the long-format frame to every task, so it is pickled, sent and
+unpickled once per worker; the panel is published once and each worker attaches it by
+name. Both compute the per-symbol close sums, which must match. Reports the wall time of
+the fan-out and the bytes sent to workers.
+
+Usage:
+    python benchmarks/bench_price_panel.py [--symbols 400] [--years 10] [--workers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from bench_indicators import SESSIONS_PER_YEAR, make_frame
+
+from swing_trade_b3.services.price_panel import PanelHandle, PricePanel, attach_panel
+
+
+def legacy_sums(prices: pd.DataFrame) -> Dict[str, float]:
+    return {str(k): float(v) for k, v in prices.groupby("symbol")["close"].sum().items()}
+
+
+def panel_sums(handle: PanelHandle) -> Dict[str, float]:
+    panel = attach_panel(handle)
+    close = panel.values[panel.fields.index("close")]
+    return dict(zip(panel.symbols, np.nansum(close, axis=1).tolist()))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--symbols", type=int, default=400)
+    ap.add_argument("--years", type=int, default=10)
+    ap.add_argument("--workers", type=int, default=4)
+    args = ap.parse_args()
+
+    prices = make_frame(args.symbols, args.years * SESSIONS_PER_YEAR)
+    prices["date"] = pd.to_datetime(prices["date"], utc=True)  # processed dtype
+    n = args.workers
+    t0 = time.perf_counter()
+    shared = PricePanel.from_frame(prices).publish()  # before the pool: workers share its tracker
+    t_publish = time.perf_counter() - t0
+    try:
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            list(pool.map(int, range(n)))  # start the workers outside the timings
+            t0 = time.perf_counter()
+            expected = list(pool.map(legacy_sums, [prices] * n))
+            t_old = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            got = list(pool.map(panel_sums, [shared.handle] * n))
+            t_new = t_publish + time.perf_counter() - t0
+    finally:
+        shared.close()
+    for old, new in zip(expected, got):
+        assert old.keys() == new.keys()
+        np.testing.assert_allclose(list(new.values()), list(old.values()), rtol=1e-12)
+
+    sent_old = len(pickle.dumps(prices)) * n
+    sent_new = len(pickle.dumps(shared.handle)) * n
+    print(
+        f"{'rows':>9} {'workers':>7} {'legacy_s':>9} {'panel_s':>8} {'legacy_MB':>10} {'panel_MB':>9}"
+    )
+    print(
+        f"{len(prices):>9} {n:>7} {t_old:>9.3f} {t_new:>8.3f} "
+        f"{sent_old / 1e6:>10.1f} {sent_new / 1e6:>9.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
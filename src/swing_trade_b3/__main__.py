@@ -4,18 +4,33 @@ import argparse
 import json
 import logging
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date, datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
 
 import pandas as pd
 
 from . import __version__
+from .adapters.connectors.market_data.b3_adapter import HttpConfig, close_sessions
 from .adapters.connectors.market_data.composite_provider import fetch_daily
+from .adapters.persistence.dataset import save_dataset
+from .adapters.persistence.indicator_store import update_indicator_state
+from .adapters.persistence.mmap_cache import load_cached, processed_fingerprint
+from .adapters.persistence.panel_cache import panel_cache_dir, update_wide_panel
 from .adapters.persistence.repositories import (
+    last_raw_date,
     load_raw,
     save_processed,
     save_raw,
 )
+from .adapters.persistence.sweep_store import SweepStore
+from .services.calendar import missing_sessions, next_session, session_count
+from .services.price_panel import PanelLoader, SharedPanel
 from .services.signals import clean_and_validate
+from .services.sweep import RSI_MACD_DEFAULTS, param_grid, random_samples, rank, run_sweep
+from .services.throttling import Throttler
 
 
 def _parse_date(s: str) -> date:
@@ -44,12 +59,40 @@ def _make_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Força range=max no provedor (baixa todo histórico e filtra)",
     )
+    pf.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Baixa apenas datas após a última já salva em --out (pula símbolos atualizados)",
+    )
+    pf.add_argument(
+        "--append",
+        action="store_true",
+        help="Grava novas linhas em arquivos delta (sem reescrever a partição anual)",
+    )
     pf.add_argument(
         "--throttle",
         type=float,
         default=0.0,
         help="Intervalo mínimo entre requisições em segundos (ex.: 0.2)",
     )
+    pf.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Coleta concorrente com N workers; o --throttle é global (default: 1)",
+    )
+    pf.add_argument(
+        "--http-cache",
+        metavar="DIR",
+        help="Cache em disco das respostas HTTP (TTL + revalidação ETag), ex.: data/cache/http",
+    )
+    pf.add_argument(
+        "--http-cache-ttl",
+        type=float,
+        default=HttpConfig.cache_ttl_s,
+        help="Segundos em que uma resposta em cache é servida sem consultar o provedor "
+        "(default: 3600)",
+    )
     pf.add_argument(
         "--format",
         choices=["csv", "parquet"],
@@ -103,12 +146,103 @@ def _make_parser() -> argparse.ArgumentParser:
         default="snappy",
         help="Compressão para Parquet (snappy|zstd). Ignorado em CSV.",
     )
+    pp.add_argument(
+        "--dataset",
+        metavar="DIR",
+        help="Também grava no dataset consolidado particionado (ex.: data/dataset)",
+    )
+    pp.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processa N símbolos em paralelo (pool de processos; default: 1)",
+    )
+    pp.add_argument(
+        "--indicators",
+        action="store_true",
+        help="Atualiza o estado incremental de RSI/MACD/ATR ({símbolo}.indicators.json)",
+    )
+    pp.add_argument(
+        "--json-summary",
+        metavar="PATH|-",
+        help="Emite resumo em JSON (use '-' para stdout)",
+    )
     pp.add_argument(
         "--log-json",
         action="store_true",
         help="Ativa logging estruturado em JSON no stdout",
     )
 
+    # sweep command
+    ps = sub.add_parser(
+        "sweep",
+        help="Varredura de parâmetros da estratégia RSI+MACD sobre data/processed",
+    )
+    ps.add_argument("--symbol", "-s", nargs="+", required=True, help="Ticker(s), ex.: PETR4 VALE3")
+    ps.add_argument(
+        "--processed",
+        default="data/processed",
+        help="Diretório dos dados processados (default: data/processed)",
+    )
+    ps.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="NOME=V1,V2",
+        help="Eixo da grade (repetível), ex.: --grid rsi_period=10,14 --grid stop_loss=0,0.05",
+    )
+    ps.add_argument(
+        "--random",
+        action="append",
+        default=[],
+        metavar="NOME=MIN:MAX",
+        help="Faixa sorteada uniformemente (repetível; inteiros se MIN e MAX forem inteiros)",
+    )
+    ps.add_argument(
+        "--samples", type=int, default=0, help="Quantidade de sorteios de --random (default: 0)"
+    )
+    ps.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Semente dos sorteios; mantenha a mesma para retomar a varredura (default: 0)",
+    )
+    ps.add_argument(
+        "--results",
+        default="data/sweeps/sweep.jsonl",
+        help="Tabela de resultados; avaliações já gravadas são puladas "
+        "(default: data/sweeps/sweep.jsonl)",
+    )
+    ps.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Avalia em paralelo com N processos (default: 1)",
+    )
+    ps.add_argument(
+        "--metric",
+        default="total_return",
+        help="Métrica de ordenação do ranking (default: total_return)",
+    )
+    ps.add_argument("--top", type=int, default=10, help="Linhas do ranking (default: 10)")
+    ps.add_argument(
+        "--shared-panel",
+        action="store_true",
+        help="Carrega os preços uma vez e compartilha com os workers via memória compartilhada",
+    )
+
+    # panel command
+    pn = sub.add_parser(
+        "panel",
+        help="Atualiza o cache do painel largo (datas × símbolos) de data/processed",
+    )
+    pn.add_argument("--symbol", "-s", nargs="+", required=True, help="Ticker(s), ex.: PETR4 VALE3")
+    pn.add_argument(
+        "--processed",
+        default="data/processed",
+        help="Diretório dos dados processados (default: data/processed)",
+    )
+
     return p
 
 
@@ -158,6 +292,120 @@ def _setup_logging(as_json: bool) -> None:
     root.addHandler(h)
 
 
+def _up_to_date_entry(
+    sym: str, last: pd.Timestamp, meta: dict[str, object], t0: float
+) -> dict[str, object]:
+    print(f"[{sym}] Já atualizado até {last.date()}.")
+    return {
+        "symbol": sym,
+        "status": "up_to_date",
+        "rows": 0,
+        "files": [],
+        "provider": meta.get("provider"),
+        "range_used": meta.get("range_used"),
+        "date_first": None,
+        "date_last": str(last.date()),
+        "duration_s": round(time.monotonic() - t0, 3),
+        "http": meta.get("http"),
+    }
+
+
+def _fetch_symbol(
+    sym: str,
+    start: date,
+    end: date,
+    *,
+    out_dir: str,
+    out_fmt: str,
+    compression: str,
+    force_max: bool,
+    throttle_wait: Callable[[], None],
+    http: HttpConfig | None = None,
+    incremental: bool = False,
+    append: bool = False,
+) -> tuple[dict[str, object], str | None]:
+    """Fetch and persist one symbol; returns its summary entry and failure message (if any)."""
+    t0 = time.monotonic()
+    meta: dict[str, object] = {}
+    try:
+        last = last_raw_date(sym, out_dir) if incremental else None
+        fetch_start = start
+        if last is not None:
+            fetch_start = max(start, next_session(last.date()))
+            # nothing to download: already stored through `end` (or only non-sessions left)
+            if session_count(fetch_start, end) == 0:
+                return _up_to_date_entry(sym, last, meta, t0), None
+        df = fetch_daily(
+            sym,
+            fetch_start,
+            end,
+            http=http,
+            prefer_max=force_max,
+            throttle_wait=throttle_wait,
+            meta=meta,
+        )
+        if df.empty and last is not None:
+            # incremental gap with no sessions (e.g., holiday): history is still current
+            return _up_to_date_entry(sym, last, meta, t0), None
+        if df.empty:
+            print(f"[{sym}] Nenhum dado retornado no intervalo.")
+            return (
+                {
+                    "symbol": sym,
+                    "status": "no_data",
+                    "rows": 0,
+                    "files": [],
+                    "provider": meta.get("provider"),
+                    "range_used": meta.get("range_used"),
+                    "date_first": None,
+                    "date_last": None,
+                    "http": meta.get("http"),
+                },
+                "no_data",
+            )
+
+        # Persist raw partitions
+        parquet_kwargs: dict[str, Any] = {}
+        if out_fmt == "parquet":
+            parquet_kwargs["compression"] = None if compression == "none" else compression
+        paths = save_raw(sym, df, base_dir=out_dir, fmt=out_fmt, append=append, **parquet_kwargs)
+        first = df["date"].min()
+        last = df["date"].max()
+        return (
+            {
+                "symbol": sym,
+                "status": "ok",
+                "rows": int(len(df)),
+                "provider": meta.get("provider"),
+                "date_first": str(first.date()),
+                "date_last": str(last.date()),
+                "files": [str(p) for p in paths],
+                "range_used": meta.get("range_used"),
+                "duration_s": round(time.monotonic() - t0, 3),
+                "http": meta.get("http"),
+            },
+            None,
+        )
+    except Exception as exc:
+        logging.error("falha na coleta", exc_info=False)
+        print(f"[{sym}] Erro: {exc}")
+        return (
+            {
+                "symbol": sym,
+                "status": "failed",
+                "rows": 0,
+                "files": [],
+                "provider": meta.get("provider"),
+                "date_first": None,
+                "date_last": None,
+                "range_used": meta.get("range_used"),
+                "duration_s": round(time.monotonic() - t0, 3),
+                "http": meta.get("http"),
+            },
+            str(exc),
+        )
+
+
 def _cmd_fetch(args: argparse.Namespace) -> int:
     _setup_logging(bool(args.log_json))
     symbols: list[str] = []
@@ -180,6 +428,7 @@ def _cmd_fetch(args: argparse.Namespace) -> int:
     out_fmt: str = args.format
     compression: str = args.compression
     throttle_s: float = float(args.throttle or 0.0)
+    workers: int = int(getattr(args, "workers", 1))
 
     if end < start:
         print("Erro: --end deve ser >= --start")
@@ -187,89 +436,45 @@ def _cmd_fetch(args: argparse.Namespace) -> int:
     if not symbols:
         print("Erro: --symbol não pode ser vazio")
         return 2
+    if workers < 1:
+        print("Erro: --workers deve ser >= 1")
+        return 2
 
-    successes = 0
-    failures: list[tuple[str, str]] = []
-    per_symbol: list[dict[str, object]] = []
+    limiter = Throttler(throttle_s)
     run_started = datetime.now(timezone.utc)
-    for sym in symbols:
-        t0 = time.monotonic()
-        meta: dict[str, object] = {}
-        try:
-            throttle_calls = {"n": 0}
-
-            def maybe_throttle() -> None:
-                # track calls; actual sleep controlled by caller
-                throttle_calls["n"] += 1
-                if throttle_s > 0:
-                    time.sleep(throttle_s)
-
-            df = fetch_daily(
-                sym,
-                start,
-                end,
-                prefer_max=bool(args.force_max),
-                throttle_wait=maybe_throttle,
-                meta=meta,
-            )
-            if df.empty:
-                print(f"[{sym}] Nenhum dado retornado no intervalo.")
-                failures.append((sym, "no_data"))
-                per_symbol.append(
-                    {
-                        "symbol": sym,
-                        "status": "no_data",
-                        "rows": 0,
-                        "files": [],
-                        "provider": meta.get("provider"),
-                        "range_used": meta.get("range_used"),
-                        "date_first": None,
-                        "date_last": None,
-                        "http": meta.get("http"),
-                    }
-                )
-                continue
-
-            # Persist raw partitions
-            parquet_kwargs = {}
-            if out_fmt == "parquet":
-                parquet_kwargs["compression"] = None if compression == "none" else compression
-            paths = save_raw(sym, df, base_dir=out_dir, fmt=out_fmt, **parquet_kwargs)
-            successes += 1
-            first = df["date"].min()
-            last = df["date"].max()
-            per_symbol.append(
-                {
-                    "symbol": sym,
-                    "status": "ok",
-                    "rows": int(len(df)),
-                    "provider": meta.get("provider"),
-                    "date_first": str(first.date()),
-                    "date_last": str(last.date()),
-                    "files": [str(p) for p in paths],
-                    "range_used": meta.get("range_used"),
-                    "duration_s": round(time.monotonic() - t0, 3),
-                    "http": meta.get("http"),
-                }
-            )
-        except Exception as exc:
-            logging.error("falha na coleta", exc_info=False)
-            print(f"[{sym}] Erro: {exc}")
-            failures.append((sym, str(exc)))
-            per_symbol.append(
-                {
-                    "symbol": sym,
-                    "status": "failed",
-                    "rows": 0,
-                    "files": [],
-                    "provider": meta.get("provider"),
-                    "date_first": None,
-                    "date_last": None,
-                    "range_used": meta.get("range_used"),
-                    "duration_s": round(time.monotonic() - t0, 3),
-                    "http": meta.get("http"),
-                }
-            )
+    fetch_one = partial(
+        _fetch_symbol,
+        start=start,
+        end=end,
+        out_dir=out_dir,
+        out_fmt=out_fmt,
+        compression=compression,
+        force_max=bool(args.force_max),
+        throttle_wait=limiter.wait,
+        # one pooled keep-alive session serves every symbol/worker of this run
+        http=HttpConfig(
+            pool_size=max(workers, HttpConfig.pool_size),
+            cache_dir=getattr(args, "http_cache", None),
+            cache_ttl_s=float(getattr(args, "http_cache_ttl", HttpConfig.cache_ttl_s)),
+        ),
+        incremental=bool(getattr(args, "incremental", False)),
+        append=bool(getattr(args, "append", False)),
+    )
+    try:
+        if workers > 1 and len(symbols) > 1:
+            # I/O-bound: threads share the limiter so the provider budget stays global
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(fetch_one, symbols))
+        else:
+            results = [fetch_one(sym) for sym in symbols]
+    finally:
+        close_sessions()
+
+    per_symbol: list[dict[str, object]] = [entry for entry, _err in results]
+    failures: list[tuple[str, str]] = [
+        (str(entry["symbol"]), err) for entry, err in results if err is not None
+    ]
+    successes = sum(1 for entry in per_symbol if entry["status"] in ("ok", "up_to_date"))
 
     # final summary (M2-SI-7.2)
     total = len(symbols)
@@ -282,7 +487,7 @@ def _cmd_fetch(args: argparse.Namespace) -> int:
     json_summary = getattr(args, "json_summary", None)
     if json_summary:
         run_ended = datetime.now(timezone.utc)
-        payload = {
+        payload: dict[str, object] = {
             "run": {
                 "started_at": run_started.isoformat(),
                 "ended_at": run_ended.isoformat(),
@@ -295,33 +500,99 @@ def _cmd_fetch(args: argparse.Namespace) -> int:
                     "compression": None if compression == "none" else compression,
                     "throttle": throttle_s if throttle_s > 0 else None,
                     "force_max": bool(args.force_max),
+                    "incremental": bool(getattr(args, "incremental", False)),
+                    "http_cache": getattr(args, "http_cache", None),
                     "symbols": symbols,
                 },
             },
             "symbols": per_symbol,
             "summary": {
-                "ok": successes,
+                "ok": sum(1 for s in per_symbol if s["status"] == "ok"),
+                "up_to_date": sum(1 for s in per_symbol if s["status"] == "up_to_date"),
                 "no_data": sum(1 for s in per_symbol if s["status"] == "no_data"),
                 "failed": len(failures),
                 "total": len(symbols),
             },
         }
 
-        try:
-            if json_summary == "-":
-                print(json.dumps(payload, ensure_ascii=False))
-            else:
-                from pathlib import Path
-
-                Path(json_summary).parent.mkdir(parents=True, exist_ok=True)
-                with open(json_summary, "w", encoding="utf-8") as fh:
-                    json.dump(payload, fh, ensure_ascii=False, indent=2)
-        except OSError as exc:
-            print(f"Aviso: falha ao gravar JSON summary ({exc})")
+        _write_json_summary(json_summary, payload)
 
     return 0 if successes > 0 else 1
 
 
+def _write_json_summary(json_summary: str, payload: dict[str, object]) -> None:
+    try:
+        if json_summary == "-":
+            print(json.dumps(payload, ensure_ascii=False))
+        else:
+            Path(json_summary).parent.mkdir(parents=True, exist_ok=True)
+            with open(json_summary, "w", encoding="utf-8") as fh:
+                json.dump(payload, fh, ensure_ascii=False, indent=2)
+    except OSError as exc:
+        print(f"Aviso: falha ao gravar JSON summary ({exc})")
+
+
+def _process_symbol(
+    sym: str,
+    *,
+    raw_dir: str,
+    out_dir: str,
+    out_fmt: str,
+    compression: str,
+    start: date | None = None,
+    end: date | None = None,
+    keep_frame: bool = False,
+    indicators: bool = False,
+) -> tuple[dict[str, object], str | None, pd.DataFrame | None]:
+    """Load, clean and persist one symbol; returns its summary entry, failure and clean frame.
+
+    Runs inside worker processes, so it reports through the returned entry instead of
+    printing. The clean frame is only returned when ``keep_frame`` (dataset writes happen
+    once in the parent to avoid concurrent rewrites of shared partitions).
+    """
+    t0 = time.monotonic()
+    entry: dict[str, object] = {
+        "symbol": sym,
+        "status": "failed",
+        "rows": 0,
+        "path": None,
+        "date_first": None,
+        "date_last": None,
+    }
+    try:
+        df_raw = load_raw(
+            sym,
+            raw_dir,
+            start=pd.Timestamp(start, tz="UTC") if start else None,
+            end=pd.Timestamp(end, tz="UTC") if end else None,
+        )
+        if df_raw.empty:
+            entry.update(status="no_data", duration_s=round(time.monotonic() - t0, 3))
+            return entry, "sem dados brutos", None
+        df = clean_and_validate(df_raw)
+        parquet_kwargs: dict[str, Any] = {}
+        if out_fmt == "parquet":
+            parquet_kwargs["compression"] = None if compression == "none" else compression
+        path = save_processed(sym, df, base_dir=out_dir, fmt=out_fmt, **parquet_kwargs)
+        entry.update(
+            status="ok",
+            rows=int(len(df)),
+            path=str(path),
+            date_first=str(df["date"].min().date()) if len(df) else None,
+            date_last=str(df["date"].max().date()) if len(df) else None,
+            missing_sessions=int(len(missing_sessions(df["date"]))),
+        )
+        if indicators:
+            # folds the stored dataset (a --start/--end window is only part of it)
+            _state, entry["indicators"] = update_indicator_state(sym, out_dir)
+        entry["duration_s"] = round(time.monotonic() - t0, 3)
+        return entry, None, df if keep_frame else None
+    except Exception as exc:
+        logging.error("falha no processamento", exc_info=False)
+        entry["duration_s"] = round(time.monotonic() - t0, 3)
+        return entry, str(exc), None
+
+
 def _cmd_process(args: argparse.Namespace) -> int:
     _setup_logging(bool(args.log_json))
     symbols: list[str] = [s.strip() for s in (args.symbol or [])]
@@ -331,6 +602,8 @@ def _cmd_process(args: argparse.Namespace) -> int:
     out_dir: str = args.out
     out_fmt: str = args.format
     compression: str = args.compression
+    dataset_dir: str | None = getattr(args, "dataset", None)
+    workers: int = int(getattr(args, "workers", 1))
 
     if end is not None and start is not None and end < start:
         print("Erro: --end deve ser >= --start")
@@ -338,32 +611,55 @@ def _cmd_process(args: argparse.Namespace) -> int:
     if not symbols:
         print("Erro: --symbol não pode ser vazio")
         return 2
+    if workers < 1:
+        print("Erro: --workers deve ser >= 1")
+        return 2
+
+    run_started = datetime.now(timezone.utc)
+    process_one = partial(
+        _process_symbol,
+        raw_dir=raw_dir,
+        out_dir=out_dir,
+        out_fmt=out_fmt,
+        compression=compression,
+        start=start,
+        end=end,
+        keep_frame=bool(dataset_dir),
+        indicators=bool(getattr(args, "indicators", False)),
+    )
+    if workers > 1 and len(symbols) > 1:
+        # CPU-bound (parse/validate/encode): one process per core, results in input order
+        with ProcessPoolExecutor(max_workers=min(workers, len(symbols))) as pool:
+            results = list(pool.map(process_one, symbols))
+    else:
+        results = [process_one(sym) for sym in symbols]
 
     successes = 0
     failures: list[tuple[str, str]] = []
-    for sym in symbols:
-        try:
-            df_raw = load_raw(
-                sym,
-                raw_dir,
-                start=pd.Timestamp(start, tz="UTC") if start else None,
-                end=pd.Timestamp(end, tz="UTC") if end else None,
-            )
-            if df_raw.empty:
-                print(f"[{sym}] Nenhum dado bruto encontrado no intervalo.")
-                failures.append((sym, "sem dados brutos"))
-                continue
-            df = clean_and_validate(df_raw)
-            parquet_kwargs = {}
-            if out_fmt == "parquet":
-                parquet_kwargs["compression"] = None if compression == "none" else compression
-            path = save_processed(sym, df, base_dir=out_dir, fmt=out_fmt, **parquet_kwargs)
-            print(f"[{sym}] Processado {len(df)} linhas -> {path}")
+    frames: list[pd.DataFrame] = []
+    for entry, err, frame in results:
+        sym = str(entry["symbol"])
+        if entry["status"] == "ok":
+            print(f"[{sym}] Processado {entry['rows']} linhas -> {entry['path']}")
             successes += 1
+        elif entry["status"] == "no_data":
+            print(f"[{sym}] Nenhum dado bruto encontrado no intervalo.")
+        else:
+            print(f"[{sym}] Erro no processamento: {err}")
+        if err is not None:
+            failures.append((sym, err))
+        if frame is not None:
+            frames.append(frame)
+
+    dataset_error: str | None = None
+    if dataset_dir and frames:
+        try:
+            # a single upsert rewrites each (year, bucket) partition once for the whole run
+            save_dataset(pd.concat(frames, ignore_index=True), dataset_dir)
         except Exception as exc:
-            logging.error("falha no processamento", exc_info=False)
-            print(f"[{sym}] Erro no processamento: {exc}")
-            failures.append((sym, str(exc)))
+            logging.error("falha ao gravar dataset", exc_info=False)
+            print(f"Erro ao gravar dataset: {exc}")
+            dataset_error = str(exc)
 
     total = len(symbols)
     print(f"Resumo processamento: {successes}/{total} símbolos com sucesso.")
@@ -372,7 +668,145 @@ def _cmd_process(args: argparse.Namespace) -> int:
         for sym, msg in failures:
             print(f" - {sym}: {msg}")
 
-    return 0 if successes > 0 else 1
+    json_summary = getattr(args, "json_summary", None)
+    if json_summary:
+        run_ended = datetime.now(timezone.utc)
+        per_symbol = [entry for entry, _err, _frame in results]
+        payload: dict[str, object] = {
+            "run": {
+                "started_at": run_started.isoformat(),
+                "ended_at": run_ended.isoformat(),
+                "duration_s": round((run_ended - run_started).total_seconds(), 3),
+                "args": {
+                    "start": str(start) if start else None,
+                    "end": str(end) if end else None,
+                    "raw": raw_dir,
+                    "out": out_dir,
+                    "format": out_fmt,
+                    "compression": None if compression == "none" else compression,
+                    "dataset": dataset_dir,
+                    "workers": workers,
+                    "symbols": symbols,
+                },
+            },
+            "symbols": per_symbol,
+            "summary": {
+                "ok": successes,
+                "no_data": sum(1 for s in per_symbol if s["status"] == "no_data"),
+                "failed": sum(1 for s in per_symbol if s["status"] == "failed"),
+                "total": total,
+            },
+            "dataset_error": dataset_error,
+        }
+        _write_json_summary(json_summary, payload)
+
+    return 0 if successes > 0 and dataset_error is None else 1
+
+
+def _parse_number(text: str) -> int | float:
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+def _parse_axes(items: list[str], sep: str) -> dict[str, list[int | float]]:
+    axes: dict[str, list[int | float]] = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        if not name or not values:
+            raise ValueError(f"eixo inválido: {item!r}")
+        axes[name.strip()] = [_parse_number(v.strip()) for v in values.split(sep)]
+    return axes
+
+
+def _cmd_sweep(args: argparse.Namespace) -> int:
+    _setup_logging(False)
+    symbols: list[str] = [s.strip() for s in args.symbol if s.strip()]
+    if not symbols:
+        print("Erro: --symbol não pode ser vazio")
+        return 2
+    if args.workers < 1:
+        print("Erro: --workers deve ser >= 1")
+        return 2
+    try:
+        grid = _parse_axes(args.grid, ",")
+        ranges = _parse_axes(args.random, ":")
+    except ValueError as exc:
+        print(f"Erro: {exc}")
+        return 2
+    if any(len(bounds) != 2 for bounds in ranges.values()):
+        print("Erro: --random espera NOME=MIN:MAX")
+        return 2
+    param_sets = param_grid(grid) if grid else []
+    if ranges and args.samples > 0:
+        space = {name: (low, high) for name, (low, high) in ranges.items()}
+        param_sets += random_samples(space, args.samples, seed=args.seed)
+    if not param_sets:
+        param_sets = [{}]  # the strategy defaults
+    unknown = {name for params in param_sets for name in params} - set(RSI_MACD_DEFAULTS)
+    if unknown:
+        print(f"Erro: parâmetro(s) desconhecido(s): {', '.join(sorted(unknown))}")
+        return 2
+
+    store = SweepStore(args.results)
+    loader: Callable[[str], pd.DataFrame] = partial(load_cached, base_dir=args.processed)
+    shared: SharedPanel | None = None
+    if args.shared_panel:
+        # one copy of the prices for all workers instead of one per worker
+        shared = update_wide_panel(symbols, args.processed)[0].publish()
+        loader = PanelLoader(shared.handle)
+    try:
+        summary = run_sweep(
+            symbols,
+            param_sets,
+            store,
+            loader=loader,
+            version=partial(processed_fingerprint, base_dir=args.processed),
+            workers=int(args.workers),
+        )
+    finally:
+        if shared is not None:
+            shared.close()
+    print(
+        f"Varredura: {summary.evaluated} avaliações novas, "
+        f"{summary.skipped} reaproveitadas de {args.results}"
+    )
+    if summary.failures:
+        print("Falhas:")
+        for sym, msg in summary.failures.items():
+            print(f" - {sym}: {msg}")
+    results = store.load()
+    results = results[results["symbol"].isin(symbols)]
+    if results.empty:
+        print("Nenhum resultado para ranquear.")
+        return 1
+    if args.metric not in results.columns:
+        print(f"Erro: métrica desconhecida: {args.metric}")
+        return 1
+    table = rank(results, args.metric, top=args.top)
+    table.columns = [str(c).removeprefix("param.") for c in table.columns]
+    print(table.to_string(index=False))
+    return 0 if not summary.failures else 1
+
+
+def _cmd_panel(args: argparse.Namespace) -> int:
+    _setup_logging(False)
+    symbols: list[str] = [s.strip() for s in args.symbol if s.strip()]
+    if not symbols:
+        print("Erro: --symbol não pode ser vazio")
+        return 2
+    panel, statuses = update_wide_panel(symbols, args.processed)
+    for sym, status in statuses.items():
+        print(f"[{sym}] {status}")
+    if panel.symbols:
+        first, last = panel.dates[0].date(), panel.dates[-1].date()
+        span = f" de {first} a {last}"
+    else:
+        span = ""
+    print(
+        f"Painel: {len(panel.dates)} pregões × {len(panel.symbols)} símbolos{span} "
+        f"-> {panel_cache_dir(args.processed)}"
+    )
+    return 0 if panel.symbols else 1
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -385,6 +819,10 @@ def main(argv: list[str] | None = None) -> int:
         return _cmd_fetch(args)
     if args.cmd == "process":
         return _cmd_process(args)
+    if args.cmd == "sweep":
+        return _cmd_sweep(args)
+    if args.cmd == "panel":
+        return _cmd_panel(args)
     # default: show brief info when no subcommand
     print(f"swing-trade-b3 {__version__} - use 'fetch --help' para coletar dados")
     return 0
@@ -1,18 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import math
 import random
+import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date
-from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple, cast
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 from swing_trade_b3 import __version__
+from swing_trade_b3.adapters.connectors.market_data.http_cache import (
+    CacheEntry,
+    HttpCache,
+    get_cache,
+)
+from swing_trade_b3.adapters.connectors.market_data.range_planner import (
+    FirstDateStore,
+    choose_range,
+    get_first_dates,
+    history_starts_at,
+    plan_range,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import httpx
 
 
 LOG = logging.getLogger(__name__)
@@ -41,12 +60,208 @@ class HttpConfig:
     backoff_base: float = 0.5  # initial backoff seconds
     backoff_factor: float = 2.0
     jitter: Tuple[float, float] = (0.1, 0.5)
+    pool_size: int = 10  # max pooled connections per host (size to the number of workers)
+    keep_alive: bool = True
+    json_decoder: str = "auto"  # auto | orjson | simdjson | json
+    cache_dir: Optional[str] = None  # on-disk response cache (disabled when None)
+    cache_ttl_s: float = 3600.0  # serve cached bars without revalidation for this long
+    cache_max_bytes: int = 256 * 1024 * 1024  # LRU-evicted beyond this size
+
+
+JsonDecoder = Callable[[bytes], Any]
+
+_SESSIONS: Dict[Tuple[int, bool], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
 
 
 def _user_agent() -> str:
     return f"swing-trade-b3/{__version__} (+github.com/leotavo/swing-trade-b3)"
 
 
+def _load_decoder(name: str) -> Optional[JsonDecoder]:
+    if name == "json":
+        return json.loads
+    if name == "orjson":
+        try:
+            import orjson  # optional fast decoder
+        except ImportError:
+            return None
+        return cast(JsonDecoder, orjson.loads)
+    if name == "simdjson":
+        try:
+            import simdjson  # optional fast decoder (pysimdjson)
+        except ImportError:
+            return None
+        return cast(JsonDecoder, simdjson.loads)
+    raise ValueError(f"unknown json decoder: {name}")
+
+
+@lru_cache(maxsize=None)
+def get_json_decoder(name: str = "auto") -> JsonDecoder:
+    """Resolve a JSON decoder by name, falling back to the stdlib when not installed.
+
+    ``auto`` prefers orjson, then simdjson, then ``json``.
+    """
+    candidates = ("orjson", "simdjson", "json") if name == "auto" else (name, "json")
+    for candidate in candidates:  # pragma: no branch - "json" always resolves
+        decoder = _load_decoder(candidate)
+        if decoder is not None:
+            if name not in ("auto", candidate):
+                LOG.info("json decoder unavailable; using stdlib", extra={"decoder": name})
+            return decoder
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def _decode_json(content: bytes, cfg: HttpConfig) -> Dict[str, Any]:
+    try:
+        return cast(Dict[str, Any], get_json_decoder(cfg.json_decoder)(content))
+    except ValueError as exc:  # json/orjson JSONDecodeError and simdjson errors
+        raise ParseError(f"Invalid JSON from provider: {exc}") from exc
+
+
+def _get_session(cfg: HttpConfig) -> requests.Session:
+    """Return the process-wide pooled session for ``cfg`` (created on first use).
+
+    Sessions are shared across symbols, retries and threads so TCP/TLS connections to the
+    provider are reused instead of being re-established on every request.
+    """
+    key = (cfg.pool_size, cfg.keep_alive)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, cfg.pool_size))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if not cfg.keep_alive:
+                session.headers["Connection"] = "close"
+            _SESSIONS[key] = session
+    return session
+
+
+def close_sessions() -> None:
+    """Close and forget all pooled sessions (e.g., at the end of a CLI run)."""
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+def _init_http_meta(meta: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if meta is None:
+        return None
+    http_meta = cast(Dict[str, Any], meta.setdefault("http", {}))
+    http_meta.setdefault("attempts", 0)
+    http_meta.setdefault("retries", 0)
+    http_meta.setdefault("sleep_total_s", 0.0)
+    http_meta.setdefault("last_status", None)
+    http_meta.setdefault("throttle_calls", 0)
+    return http_meta
+
+
+def _count_throttle(http_meta: Optional[Dict[str, Any]]) -> None:
+    if http_meta is not None:
+        http_meta["throttle_calls"] = int(http_meta.get("throttle_calls", 0)) + 1
+
+
+def _record_success(http_meta: Optional[Dict[str, Any]], attempt: int) -> None:
+    if http_meta is not None:
+        http_meta["attempts"] = attempt
+        http_meta["last_status"] = 200
+
+
+def _record_cache(http_meta: Optional[Dict[str, Any]], outcome: str) -> None:
+    if http_meta is not None:
+        http_meta["cache"] = outcome
+
+
+def _cache_lookup(
+    cfg: HttpConfig, url: str, headers: Dict[str, str], http_meta: Optional[Dict[str, Any]]
+) -> Tuple[Optional[HttpCache], Optional[CacheEntry], Optional[Dict[str, Any]]]:
+    """Serve a fresh cached response, or add revalidation headers for a stale one.
+
+    Returns ``(cache, entry, payload)``; ``payload`` is set only on a fresh hit.
+    """
+    if cfg.cache_dir is None:
+        return None, None, None
+    cache = get_cache(cfg.cache_dir, cfg.cache_ttl_s, cfg.cache_max_bytes)
+    entry = cache.get(url)
+    if entry is None:
+        return cache, None, None
+    if cache.is_fresh(entry):
+        _record_cache(http_meta, "hit")
+        return cache, entry, _decode_json(entry.body, cfg)
+    headers.update(entry.validators())
+    return cache, entry, None
+
+
+def _accept_response(
+    resp: Any,
+    *,
+    cfg: HttpConfig,
+    url: str,
+    cache: Optional[HttpCache],
+    entry: Optional[CacheEntry],
+    attempt: int,
+    http_meta: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Payload of a 200 (stored in the cache) or of a 304 revalidating ``entry``, else None."""
+    if resp.status_code == 304 and cache is not None and entry is not None:
+        _record_success(http_meta, attempt)
+        _record_cache(http_meta, "revalidated")
+        return _decode_json(cache.refresh(entry).body, cfg)
+    if resp.status_code != 200:
+        return None
+    _record_success(http_meta, attempt)
+    payload = _decode_json(resp.content, cfg)
+    if cache is not None:
+        cache.put(
+            url,
+            resp.content,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        _record_cache(http_meta, "miss")
+    return payload
+
+
+def _retryable_error(
+    status: int, attempt: int, url: str, http_meta: Optional[Dict[str, Any]]
+) -> Exception | None:
+    """Classify a non-200 status; returns the error to retry on, or None if not retryable."""
+    if status == 429:
+        # Rate limit; raise after retries exhausted
+        LOG.warning(
+            f"http_get 429 ratelimited (attempt={attempt})",
+            extra={"attempt": attempt, "url": url, "status": status},
+        )
+        if http_meta is not None:  # pragma: no branch
+            http_meta["last_status"] = 429
+        return RateLimitError("HTTP 429 Too Many Requests")
+    if 500 <= status < 600:
+        LOG.warning(
+            f"http_get 5xx (status={status}, attempt={attempt})",
+            extra={"attempt": attempt, "url": url, "status": status},
+        )
+        if http_meta is not None:
+            http_meta["last_status"] = status
+        return ServerError(f"HTTP {status}")
+    # Unhandled status — do not retry unless 4xx/5xx categories above
+    if http_meta is not None:  # pragma: no branch
+        http_meta["last_status"] = status
+    return None
+
+
+def _backoff_s(cfg: HttpConfig, attempt: int, http_meta: Optional[Dict[str, Any]]) -> float:
+    sleep_s = cfg.backoff_base * (cfg.backoff_factor ** (attempt - 1))
+    sleep_s += random.uniform(*cfg.jitter)
+    if http_meta is not None:  # pragma: no branch
+        http_meta["retries"] = int(http_meta.get("retries", 0)) + 1
+        prev = float(http_meta.get("sleep_total_s", 0.0))
+        http_meta["sleep_total_s"] = round(prev + float(sleep_s), 3)
+    return sleep_s
+
+
 def _http_get_json(
     url: str,
     *,
@@ -56,21 +271,17 @@ def _http_get_json(
 ) -> Dict[str, Any]:
     headers = {"User-Agent": _user_agent(), "Accept": "application/json"}
     last_err: Exception | None = None
-    http_meta: Optional[Dict[str, Any]] = None
-    if meta is not None:
-        http_meta = cast(Dict[str, Any], meta.setdefault("http", {}))
-        http_meta.setdefault("attempts", 0)
-        http_meta.setdefault("retries", 0)
-        http_meta.setdefault("sleep_total_s", 0.0)
-        http_meta.setdefault("last_status", None)
-        http_meta.setdefault("throttle_calls", 0)
+    http_meta = _init_http_meta(meta)
+    cache, entry, cached = _cache_lookup(cfg, url, headers, http_meta)
+    if cached is not None:
+        return cached
+    session = _get_session(cfg)
     for attempt in range(1, cfg.max_retries + 1):
         if throttle_wait is not None:
             throttle_wait()
-            if http_meta is not None:
-                http_meta["throttle_calls"] = int(http_meta.get("throttle_calls", 0)) + 1
+            _count_throttle(http_meta)
         try:
-            resp = requests.get(url, headers=headers, timeout=cfg.timeout)
+            resp = session.get(url, headers=headers, timeout=cfg.timeout)
         except (requests.Timeout, requests.ConnectionError) as exc:
             last_err = exc
             LOG.warning(
@@ -78,45 +289,101 @@ def _http_get_json(
                 extra={"attempt": attempt, "url": url},
             )
         else:
-            if resp.status_code == 200:
-                if http_meta is not None:
-                    http_meta["attempts"] = attempt
-                    http_meta["last_status"] = 200
-                try:
-                    return cast(Dict[str, Any], resp.json())
-                except json.JSONDecodeError as exc:  # pragma: no cover
-                    raise ParseError(f"Invalid JSON from provider: {exc}") from exc
-            if resp.status_code == 429:
-                # Rate limit; raise after retries exhausted
-                last_err = RateLimitError("HTTP 429 Too Many Requests")
-                LOG.warning(
-                    f"http_get 429 ratelimited (attempt={attempt})",
-                    extra={"attempt": attempt, "url": url, "status": resp.status_code},
-                )
-                if http_meta is not None:  # pragma: no branch
-                    http_meta["last_status"] = 429
-            elif 500 <= resp.status_code < 600:
-                last_err = ServerError(f"HTTP {resp.status_code}")
-                LOG.warning(
-                    f"http_get 5xx (status={resp.status_code}, attempt={attempt})",
-                    extra={"attempt": attempt, "url": url, "status": resp.status_code},
-                )
-                if http_meta is not None:  # pragma: no branch
-                    http_meta["last_status"] = resp.status_code
-            else:
-                # Unhandled status — do not retry unless 4xx/5xx categories above
-                if http_meta is not None:  # pragma: no branch
-                    http_meta["last_status"] = resp.status_code
+            payload = _accept_response(
+                resp,
+                cfg=cfg,
+                url=url,
+                cache=cache,
+                entry=entry,
+                attempt=attempt,
+                http_meta=http_meta,
+            )
+            if payload is not None:
+                return payload
+            err = _retryable_error(resp.status_code, attempt, url, http_meta)
+            if err is None:
                 resp.raise_for_status()
+            else:
+                last_err = err
 
         if attempt < cfg.max_retries:  # pragma: no branch
-            sleep_s = cfg.backoff_base * (cfg.backoff_factor ** (attempt - 1))
-            sleep_s += random.uniform(*cfg.jitter)
-            if http_meta is not None:  # pragma: no branch
-                http_meta["retries"] = int(http_meta.get("retries", 0)) + 1
-                prev = float(http_meta.get("sleep_total_s", 0.0))
-                http_meta["sleep_total_s"] = round(prev + float(sleep_s), 3)
-            time.sleep(sleep_s)
+            time.sleep(_backoff_s(cfg, attempt, http_meta))
+        else:
+            break
+
+    if last_err is None:
+        last_err = NetworkError("Unspecified network error")
+    raise last_err
+
+
+def async_client(cfg: HttpConfig | None = None) -> httpx.AsyncClient:
+    """Create a pooled keep-alive ``httpx.AsyncClient`` sized by ``HttpConfig``.
+
+    Share one client across many ``fetch_daily_async`` calls on the same event loop.
+    """
+    import httpx  # lazy import to keep the async transport optional
+
+    cfg = cfg or HttpConfig()
+    limits = httpx.Limits(
+        max_connections=max(1, cfg.pool_size),
+        max_keepalive_connections=max(1, cfg.pool_size) if cfg.keep_alive else 0,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=cfg.timeout,
+        headers={"User-Agent": _user_agent(), "Accept": "application/json"},
+    )
+
+
+async def _http_get_json_async(
+    url: str,
+    *,
+    cfg: HttpConfig,
+    client: httpx.AsyncClient,
+    throttle_wait: Optional[Callable[[], Awaitable[None]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Async counterpart of ``_http_get_json`` (same retries, backoff and meta)."""
+    import httpx  # lazy import to keep the async transport optional
+
+    last_err: Exception | None = None
+    http_meta = _init_http_meta(meta)
+    validators: Dict[str, str] = {}
+    cache, entry, cached = _cache_lookup(cfg, url, validators, http_meta)
+    if cached is not None:
+        return cached
+    for attempt in range(1, cfg.max_retries + 1):
+        if throttle_wait is not None:
+            await throttle_wait()
+            _count_throttle(http_meta)
+        try:
+            resp = await client.get(url, headers=validators, timeout=cfg.timeout)
+        except httpx.TransportError as exc:
+            last_err = exc
+            LOG.warning(
+                f"http_get timeout/connection (attempt={attempt})",
+                extra={"attempt": attempt, "url": url},
+            )
+        else:
+            payload = _accept_response(
+                resp,
+                cfg=cfg,
+                url=url,
+                cache=cache,
+                entry=entry,
+                attempt=attempt,
+                http_meta=http_meta,
+            )
+            if payload is not None:
+                return payload
+            err = _retryable_error(resp.status_code, attempt, url, http_meta)
+            if err is None:
+                resp.raise_for_status()
+            else:
+                last_err = err
+
+        if attempt < cfg.max_retries:
+            await asyncio.sleep(_backoff_s(cfg, attempt, http_meta))
         else:
             break
 
@@ -125,19 +392,9 @@ def _http_get_json(
     raise last_err
 
 
-def _choose_range(start: date, end: date) -> str:
-    span_days = (end - start).days
-    if span_days <= 31:
-        return "1mo"
-    if span_days <= 93:
-        return "3mo"
-    if span_days <= 186:
-        return "6mo"
-    if span_days <= 366:
-        return "1y"
-    if span_days <= 5 * 366:
-        return "5y"
-    return "max"
+def _choose_range(start: date, today: date) -> str:
+    # ranges count back from today, so the lookback to `start` (not the span) picks one
+    return choose_range(start, today)
 
 
 def _build_url(symbol: str, rng: str) -> str:
@@ -145,7 +402,10 @@ def _build_url(symbol: str, rng: str) -> str:
     return base % (symbol, rng)
 
 
-def _normalize_to_ohlcv(symbol: str, payload: Dict[str, Any]) -> pd.DataFrame:
+_PRICE_COLS = ("open", "high", "low", "close")
+
+
+def _historical_series(payload: Dict[str, Any]) -> List[Any]:
     if not isinstance(payload, dict) or "results" not in payload:
         raise ParseError("Unexpected payload structure: missing 'results'")
     results = payload.get("results")
@@ -157,64 +417,160 @@ def _normalize_to_ohlcv(symbol: str, payload: Dict[str, Any]) -> pd.DataFrame:
         raise ParseError("Missing 'historicalDataPrice'")
     if not isinstance(series, list):
         raise ParseError("'historicalDataPrice' not a list")
+    return series
+
+
+def _series_columns(series: List[Any]) -> Dict[str, List[Any]]:
+    """Pull the ``historicalDataPrice`` fields into per-column lists (non-dict rows -> None)."""
+    recs = (
+        series
+        if all(isinstance(r, dict) for r in series)
+        else [r if isinstance(r, dict) else {} for r in series]
+    )
+    return {f: [r.get(f) for r in recs] for f in ("date", *_PRICE_COLS, "volume")}
+
+
+def _coerce_column(values: Any) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bulk numeric coercion: returns (float64 values, missing mask, unparseable mask)."""
+    try:
+        # fast path: numbers, numeric strings and None (-> NaN) convert in one C loop
+        num = np.asarray(values, dtype="float64")
+        missing = np.isnan(num)
+        return num, missing, np.zeros_like(missing)
+    except (TypeError, ValueError):
+        pass
+    raw = pd.Series(values, dtype=object)
+    num = pd.to_numeric(raw, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    missing = raw.isna().to_numpy()
+    return num, missing, np.isnan(num) & ~missing
+
+
+def _ohlcv_from_columns(
+    symbol: str, cols: Dict[str, Any], series: Optional[List[Any]] = None
+) -> pd.DataFrame:
+    """Columnar normalization of raw provider columns into the OHLCV schema.
+
+    Rows with a missing/unparseable ``date`` or an unparseable value are skipped as malformed
+    (one warning each); rows with missing/negative values are dropped as invalid.
+    """
+    ts, ts_missing, ts_bad = _coerce_column(cols["date"])
+    malformed = ts_missing | ts_bad
+    prices: Dict[str, np.ndarray] = {}
+    for col in _PRICE_COLS:
+        prices[col], _missing, bad = _coerce_column(cols[col])
+        malformed |= bad
+    volume, vol_missing, vol_bad = _coerce_column(cols["volume"])
+    malformed |= vol_bad
+    volume[vol_missing] = -1  # missing volume is invalid, not malformed
+
+    if malformed.any():
+        for i in np.flatnonzero(malformed):
+            rec = series[i] if series is not None else {k: v[i] for k, v in cols.items()}
+            LOG.warning(
+                "skip malformed row",
+                extra={"error": "missing or unparseable field", "rec": rec},
+            )
+
+    keep = ~malformed
+    valid = keep & (volume >= 0)
+    for col in _PRICE_COLS:
+        valid &= prices[col] >= 0  # NaN compares False
+    removed = int(keep.sum() - valid.sum())
+    if removed:
+        LOG.info("removed invalid rows", extra={"removed": removed})
+
+    # Order by date and dedupe (keep last occurrence), all on arrays
+    secs = np.trunc(ts[valid]).astype("int64")
+    order = np.argsort(secs, kind="stable")
+    secs = secs[order]
+    last = np.ones(len(secs), dtype=bool)
+    last[:-1] = secs[1:] != secs[:-1]
+    idx = np.flatnonzero(valid)[order][last]
+
+    n = int(len(idx))
+    return pd.DataFrame(
+        {
+            "date": pd.to_datetime(secs[last], unit="s", utc=True),
+            "symbol": pd.array([str(symbol)] * n, dtype="string"),
+            **{col: prices[col][idx] for col in _PRICE_COLS},
+            "volume": np.trunc(volume[idx]).astype("int64"),
+        }
+    )
+
+
+def _normalize_to_ohlcv(symbol: str, payload: Dict[str, Any]) -> pd.DataFrame:
+    series = _historical_series(payload)
+    return _ohlcv_from_columns(symbol, _series_columns(series), series)
+
+
+def _empty_ohlcv(symbol: str) -> pd.DataFrame:
+    return _ohlcv_from_columns(symbol, {f: [] for f in ("date", *_PRICE_COLS, "volume")})
 
-    rows: List[Dict[str, Any]] = []
-    for rec in series:
-        try:
-            ts = int(rec["date"])  # epoch seconds (UTC)
-            o = float(rec["open"]) if rec.get("open") is not None else math.nan
-            h = float(rec["high"]) if rec.get("high") is not None else math.nan
-            low_val = float(rec["low"]) if rec.get("low") is not None else math.nan
-            c = float(rec["close"]) if rec.get("close") is not None else math.nan
-            v_raw = rec.get("volume")
-            v = int(v_raw) if v_raw is not None else -1
-        except (KeyError, ValueError, TypeError) as exc:
-            LOG.warning("skip malformed row", extra={"error": str(exc), "rec": rec})
-            continue
-        rows.append(
-            {
-                "date": pd.to_datetime(ts, unit="s", utc=True),
-                "symbol": str(symbol),
-                "open": o,
-                "high": h,
-                "low": low_val,
-                "close": c,
-                "volume": v,
-            }
-        )
 
-    df = pd.DataFrame.from_records(
-        rows, columns=["date", "symbol", "open", "high", "low", "close", "volume"]
+def _validate_request(symbol: str, start: date, end: date) -> None:
+    if not symbol or not symbol.strip():
+        raise ValueError("symbol must be non-empty")
+    if end < start:
+        raise ValueError("end date must be >= start date")
+
+
+def _filter_window(df: pd.DataFrame, start: date, end: date) -> pd.DataFrame:
+    # filter date range (inclusive)
+    mask = (df["date"] >= pd.Timestamp(start, tz="UTC")) & (
+        df["date"] <= pd.Timestamp(end, tz="UTC") + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
     )
+    return df[mask].reset_index(drop=True)
 
-    # Coerce dtypes
-    if not df.empty:
-        df["date"] = pd.to_datetime(df["date"], utc=True)
-        df["symbol"] = df["symbol"].astype("string")
-        for col in ["open", "high", "low", "close"]:
-            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
-        df["volume"] = pd.to_numeric(df["volume"], errors="coerce").astype("Int64")
-
-        # Drop invalid rows (NaN or negatives)
-        before = len(df)
-        df = df.dropna(subset=["open", "high", "low", "close", "volume", "date", "symbol"])
-        df = df[(df[["open", "high", "low", "close"]] >= 0).all(axis=1)]
-        df = df[df["volume"] >= 0]
-        removed = before - len(df)
-        if removed:
-            LOG.info("removed invalid rows", extra={"removed": removed})
-
-        df = (
-            df.sort_values("date")
-            .drop_duplicates(subset=["symbol", "date"], keep="last")
-            .reset_index(drop=True)
+
+def _plan(
+    symbol: str,
+    start: date,
+    end: date,
+    *,
+    prefer_max: bool,
+    store: FirstDateStore,
+    today: date,
+) -> Optional[str]:
+    if prefer_max:
+        return "max"
+    rng = plan_range(start, end, today=today, earliest=store.get(symbol))
+    if rng is None:
+        LOG.info(
+            "no sessions to fetch; skipping request",
+            extra={"symbol": symbol, "start": str(start), "end": str(end)},
         )
+    return rng
 
-        # Ensure exact dtypes: volume as int64 (not nullable) if possible
-        if not df["volume"].isna().any():  # pragma: no branch
-            df["volume"] = df["volume"].astype("int64")
 
-    return df
+def _window(
+    symbol: str,
+    payload: Dict[str, Any],
+    rng: str,
+    start: date,
+    end: date,
+    *,
+    store: FirstDateStore,
+    today: date,
+) -> Tuple[pd.DataFrame, bool]:
+    """Bars of ``payload`` within ``[start, end]`` and whether a ``range=max`` retry can help.
+
+    Learns the symbol's first date from ``range=max`` responses only (a smaller range can
+    only suggest it). A retry is only worth it when the window lies before the first bar
+    *and* that bar sits at the range's lower bound (i.e., the range, not the listing date,
+    cut the history).
+    """
+    df = _normalize_to_ohlcv(symbol, payload)
+    if df.empty:
+        return df, False
+    first = df["date"].iloc[0].date()
+    complete = history_starts_at(rng, first, today=today)
+    if rng == "max":
+        store.record(symbol, first)
+    df = _filter_window(df, start, end)
+    retry = df.empty and end < first and not complete
+    if retry:
+        LOG.info("window before range start; retry with range=max", extra={"symbol": symbol})
+    return df, retry
 
 
 def fetch_daily(
@@ -226,43 +582,99 @@ def fetch_daily(
     prefer_max: bool = False,
     throttle_wait: Optional[Callable[[], None]] = None,
     meta: Optional[Dict[str, Any]] = None,
+    today: date | None = None,
 ) -> pd.DataFrame:
     """Fetch daily OHLCV for a B3 symbol in [start, end].
 
     Returns a DataFrame with columns: date (UTC), symbol, open, high, low, close, volume.
     The provider is brapi.dev; data is filtered client-side to [start, end].
+
+    The ``range`` is planned from the lookback to ``start`` (relative to ``today``) and the
+    symbol's learned first date (persisted under ``HttpConfig.cache_dir`` when set). Windows
+    without sessions or before the first date are answered empty without a request, and the
+    ``range=max`` retry only happens when the first response was cut by its range.
     """
 
-    if not symbol or not symbol.strip():
-        raise ValueError("symbol must be non-empty")
-    if end < start:
-        raise ValueError("end date must be >= start date")
+    _validate_request(symbol, start, end)
 
     cfg = http or HttpConfig()
-    rng = "max" if prefer_max else _choose_range(start, end)
-    url = _build_url(symbol, rng)
-    payload = _http_get_json(url, cfg=cfg, throttle_wait=throttle_wait, meta=meta)
-    df = _normalize_to_ohlcv(symbol, payload)
-
-    # filter date range (inclusive)
-    if not df.empty:
-        mask = (df["date"] >= pd.Timestamp(start, tz="UTC")) & (
-            df["date"]
-            <= pd.Timestamp(end, tz="UTC") + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+    today = today or date.today()
+    store = get_first_dates(cfg.cache_dir)
+    rng = _plan(symbol, start, end, prefer_max=prefer_max, store=store, today=today)
+    if rng is None:
+        df = _empty_ohlcv(symbol)
+    else:
+        payload = _http_get_json(
+            _build_url(symbol, rng), cfg=cfg, throttle_wait=throttle_wait, meta=meta
         )
-        df = df[mask].reset_index(drop=True)
-        # If filtering yields no rows and we didn't query max, retry with max to cover older ranges
-        if df.empty and rng != "max":
-            LOG.info("empty after filter; retry with range=max", extra={"symbol": symbol})
+        df, retry = _window(symbol, payload, rng, start, end, store=store, today=today)
+        if retry:
             payload = _http_get_json(
                 _build_url(symbol, "max"), cfg=cfg, throttle_wait=throttle_wait, meta=meta
             )
-            df = _normalize_to_ohlcv(symbol, payload)
-            mask = (df["date"] >= pd.Timestamp(start, tz="UTC")) & (
-                df["date"]
-                <= pd.Timestamp(end, tz="UTC") + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+            df, _retry = _window(symbol, payload, "max", start, end, store=store, today=today)
+            rng = "max"
+
+    if meta is not None:
+        meta["range_used"] = rng
+
+    return df
+
+
+async def fetch_daily_async(
+    symbol: str,
+    start: date,
+    end: date,
+    *,
+    http: HttpConfig | None = None,
+    prefer_max: bool = False,
+    throttle_wait: Optional[Callable[[], Awaitable[None]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    client: httpx.AsyncClient | None = None,
+    today: date | None = None,
+) -> pd.DataFrame:
+    """Async counterpart of :func:`fetch_daily` built on ``httpx.AsyncClient``.
+
+    Pass a shared ``client`` (see :func:`async_client`) to reuse connections across symbols;
+    otherwise a short-lived client is created for this call.
+    """
+
+    _validate_request(symbol, start, end)
+
+    cfg = http or HttpConfig()
+    if client is None:
+        async with async_client(cfg) as own_client:
+            return await fetch_daily_async(
+                symbol,
+                start,
+                end,
+                http=cfg,
+                prefer_max=prefer_max,
+                throttle_wait=throttle_wait,
+                meta=meta,
+                client=own_client,
+                today=today,
+            )
+
+    today = today or date.today()
+    store = get_first_dates(cfg.cache_dir)
+    rng = _plan(symbol, start, end, prefer_max=prefer_max, store=store, today=today)
+    if rng is None:
+        df = _empty_ohlcv(symbol)
+    else:
+        payload = await _http_get_json_async(
+            _build_url(symbol, rng), cfg=cfg, client=client, throttle_wait=throttle_wait, meta=meta
+        )
+        df, retry = _window(symbol, payload, rng, start, end, store=store, today=today)
+        if retry:
+            payload = await _http_get_json_async(
+                _build_url(symbol, "max"),
+                cfg=cfg,
+                client=client,
+                throttle_wait=throttle_wait,
+                meta=meta,
             )
-            df = df[mask].reset_index(drop=True)
+            df, _retry = _window(symbol, payload, "max", start, end, store=store, today=today)
             rng = "max"
 
     if meta is not None:
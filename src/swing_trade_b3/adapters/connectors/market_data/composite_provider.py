@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import logging
 from datetime import date
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 import pandas as pd
 
 from . import b3_adapter as b3
 from . import yfinance_adapter as yf
+from .range_planner import has_sessions
 
 
 LOG = logging.getLogger(__name__)
@@ -38,6 +39,8 @@ def fetch_daily(
             if meta is not None:  # pragma: no branch
                 meta.setdefault("provider", "brapi")
             return df
+        if not has_sessions(start, end):  # no provider has bars for a weekend
+            return df
         primary_ok = True
     except Exception as exc:  # pragma: no cover - defensive
         LOG.warning("primary provider failed; considering fallback", extra={"error": str(exc)})
@@ -53,3 +56,50 @@ def fetch_daily(
         if not primary_ok:
             raise
         return pd.DataFrame(columns=["date", "symbol", "open", "high", "low", "close", "volume"])
+
+
+async def fetch_daily_async(
+    symbol: str,
+    start: date,
+    end: date,
+    *,
+    http: Any | None = None,
+    prefer_max: bool = False,
+    throttle_wait: Optional[Callable[[], Awaitable[None]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+    client: Any | None = None,
+) -> pd.DataFrame:
+    """Async fetch of daily OHLCV with fallback: brapi -> yfinance."""
+    try:
+        df = await b3.fetch_daily_async(
+            symbol,
+            start,
+            end,
+            http=http,
+            prefer_max=prefer_max,
+            throttle_wait=throttle_wait,
+            meta=meta,
+            client=client,
+        )
+        if not df.empty:
+            if meta is not None:  # pragma: no branch
+                meta.setdefault("provider", "brapi")
+            return df
+        if not has_sessions(start, end):
+            return df
+        primary_ok = True
+    except Exception as exc:
+        LOG.warning("primary provider failed; considering fallback", extra={"error": str(exc)})
+        primary_ok = False
+
+    try:
+        df_yf = await yf.fetch_daily_async(
+            symbol, start, end, throttle_wait=throttle_wait, meta=meta
+        )
+        if meta is not None:
+            meta["provider"] = "yfinance"
+        return df_yf
+    except Exception:
+        if not primary_ok:
+            raise
+        return pd.DataFrame(columns=["date", "symbol", "open", "high", "low", "close", "volume"])
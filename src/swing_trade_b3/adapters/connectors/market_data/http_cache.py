@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+LOG = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    url: str
+    body: bytes
+    stored_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, ttl_s: float, now: float) -> bool:
+        return now - self.stored_at < ttl_s
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional-request headers for revalidating this entry (may be empty)."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class HttpCache:
+    """On-disk HTTP response cache keyed by URL, with TTL and size-bounded LRU eviction.
+
+    Each entry is a body file (``<sha256>.body``) plus a small JSON sidecar
+    (``<sha256>.json``) holding the URL, store time and ``ETag``/``Last-Modified``
+    validators. The sidecar mtime is the LRU clock (touched on every hit). Files are written
+    to a tmp name and swapped with ``os.replace`` so concurrent processes never read a
+    partial entry; a thread lock serializes writers within the process.
+    """
+
+    directory: Path
+    ttl_s: float = 3600.0
+    max_bytes: int = 256 * 1024 * 1024
+    clock: Callable[[], float] = time.time
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.body", self.directory / f"{key}.json"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Stored entry for ``url`` (fresh or stale), or ``None``; touches its LRU clock."""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            body = body_path.read_bytes()
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or meta.get("size") != len(body):
+            return None
+        return CacheEntry(
+            url=url,
+            body=body,
+            stored_at=float(meta["stored_at"]),
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether ``entry`` can be served without revalidation under this cache's TTL."""
+        return entry.is_fresh(self.ttl_s, self.clock())
+
+    def put(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CacheEntry:
+        entry = CacheEntry(url, body, self.clock(), etag, last_modified)
+        self._write(entry)
+        return entry
+
+    def refresh(self, entry: CacheEntry) -> CacheEntry:
+        """Restart the TTL of an entry the server confirmed unchanged (HTTP 304)."""
+        renewed = CacheEntry(entry.url, entry.body, self.clock(), entry.etag, entry.last_modified)
+        self._write(renewed, body_changed=False)
+        return renewed
+
+    def _write(self, entry: CacheEntry, *, body_changed: bool = True) -> None:
+        body_path, meta_path = self._paths(entry.url)
+        meta = {
+            "url": entry.url,
+            "stored_at": entry.stored_at,
+            "size": len(entry.body),
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if body_changed:
+                tmp_body = body_path.with_name(body_path.name + suffix)
+                tmp_body.write_bytes(entry.body)
+                os.replace(tmp_body, body_path)
+            tmp_meta = meta_path.with_name(meta_path.name + suffix)
+            tmp_meta.write_text(json.dumps(meta), encoding="utf-8")
+            os.replace(tmp_meta, meta_path)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the bodies fit in ``max_bytes``."""
+        entries = []
+        total = 0
+        for meta_path in self.directory.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                size = body_path.stat().st_size
+                used = meta_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((used, size, meta_path, body_path))
+            total += size
+        for _used, size, meta_path, body_path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            meta_path.unlink(missing_ok=True)
+            body_path.unlink(missing_ok=True)
+            total -= size
+            LOG.info("http cache evicted", extra={"path": str(body_path), "bytes": size})
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in list(self.directory.glob("*.body")) + list(self.directory.glob("*.json")):
+                path.unlink(missing_ok=True)
+
+
+_CACHES: Dict[tuple[str, float, int], HttpCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(directory: str | Path, ttl_s: float, max_bytes: int) -> HttpCache:
+    """Process-wide cache instance per (directory, ttl, size) so writers share one lock."""
+    key = (str(Path(directory).resolve()), float(ttl_s), int(max_bytes))
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = HttpCache(Path(directory), ttl_s=ttl_s, max_bytes=max_bytes)
+            _CACHES[key] = cache
+    return cache
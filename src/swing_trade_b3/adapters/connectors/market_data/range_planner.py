@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+
+from swing_trade_b3.services.calendar import session_count
+
+LOG = logging.getLogger(__name__)
+
+# History each brapi ``range`` returns, in calendar months back from today (smallest first)
+RANGE_LOOKBACK_MONTHS: Dict[str, int] = {
+    "1mo": 1,
+    "3mo": 3,
+    "6mo": 6,
+    "1y": 12,
+    "5y": 60,
+}
+# A first bar within this many sessions of a range's lower bound means the range cut the
+# history (counted in sessions, so weekends, Carnival and the year-end closure don't count)
+RANGE_EDGE_SLACK_SESSIONS = 5
+# Kept in its own directory: HttpConfig.cache_dir also holds the HTTP cache's *.json sidecars
+FIRST_DATES_DIRNAME = "range_planner"
+FIRST_DATES_FILENAME = "first_dates.json"
+
+
+def _months_back(day: date, months: int) -> date:
+    year, month = divmod(day.year * 12 + day.month - 1 - months, 12)
+    month += 1
+    return date(year, month, min(day.day, monthrange(year, month)[1]))
+
+
+def choose_range(start: date, today: date) -> str:
+    """Smallest ``range`` whose history (counted back from ``today``) reaches ``start``."""
+    for rng, months in RANGE_LOOKBACK_MONTHS.items():
+        if start >= _months_back(today, months):
+            return rng
+    return "max"
+
+
+def range_floor(rng: str, today: date) -> Optional[date]:
+    """Oldest date a ``range`` can return (``None`` for ``max``)."""
+    months = RANGE_LOOKBACK_MONTHS.get(rng)
+    return None if months is None else _months_back(today, months)
+
+
+def has_sessions(start: date, end: date) -> bool:
+    """Whether ``[start, end]`` holds at least one B3 session."""
+    return bool(session_count(start, end) > 0)
+
+
+def plan_range(
+    start: date, end: date, *, today: date, earliest: Optional[date] = None
+) -> Optional[str]:
+    """Range to request for ``[start, end]``, or ``None`` when no request can return bars.
+
+    Windows without B3 sessions (weekends, holidays) and windows ending before the symbol's
+    first known bar are skipped; a window starting before the first bar only needs history
+    back to it.
+    """
+    if not has_sessions(start, end):
+        return None
+    if earliest is not None:
+        if end < earliest:
+            return None
+        start = max(start, earliest)
+    return choose_range(start, today)
+
+
+def history_starts_at(rng: str, first: date, *, today: date) -> bool:
+    """Whether a response's first bar is the start of the symbol's history.
+
+    True for ``max``, and for smaller ranges whose first bar comes more than
+    ``RANGE_EDGE_SLACK_SESSIONS`` B3 sessions after the range's lower bound (the provider
+    had nothing older to return).
+    """
+    floor = range_floor(rng, today)
+    if floor is None:
+        return True
+    return bool(session_count(floor, first - timedelta(days=1)) > RANGE_EDGE_SLACK_SESSIONS)
+
+
+@dataclass
+class FirstDateStore:
+    """Earliest available date per symbol, learned from provider responses.
+
+    Persisted as JSON at ``path`` when set (atomic tmp + ``os.replace`` writes), otherwise
+    kept in memory for the process lifetime.
+    """
+
+    path: Optional[Path] = None
+    _dates: Dict[str, date] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._dates = self._read()
+
+    def _read(self) -> Dict[str, date]:
+        if self.path is None:
+            return {}
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            return {sym: date.fromisoformat(d) for sym, d in raw.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, AttributeError):
+            LOG.warning("ignoring unreadable first-date store", extra={"path": str(self.path)})
+            return {}
+
+    def get(self, symbol: str) -> Optional[date]:
+        with self._lock:
+            return self._dates.get(symbol)
+
+    def record(self, symbol: str, first: date) -> None:
+        """Remember ``first`` as the symbol's earliest date (keeps the oldest seen)."""
+        with self._lock:
+            known = self._dates.get(symbol)
+            if known is not None and known <= first:
+                return
+            self._dates[symbol] = first
+            if self.path is None:
+                return
+            # merge what other processes stored since we loaded, keeping the oldest date
+            merged = self._read()
+            for sym, d in self._dates.items():
+                merged[sym] = min(d, merged.get(sym, d))
+            self._dates = merged
+            payload = {sym: d.isoformat() for sym, d in sorted(merged.items())}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+_STORES: Dict[Optional[str], FirstDateStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_first_dates(directory: str | Path | None = None) -> FirstDateStore:
+    """Process-wide store persisted under ``directory`` (in-memory only when ``None``), in a
+    ``range_planner`` subdirectory so clearing an HTTP cache there leaves it alone."""
+    key = None if directory is None else str(Path(directory).resolve())
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            path = (
+                None
+                if directory is None
+                else Path(directory) / FIRST_DATES_DIRNAME / FIRST_DATES_FILENAME
+            )
+            store = FirstDateStore(path)
+            _STORES[key] = store
+    return store
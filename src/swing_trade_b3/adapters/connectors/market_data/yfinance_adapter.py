@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import date
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 import pandas as pd
 
@@ -74,8 +75,7 @@ def fetch_daily(
         .reset_index(drop=True)
     )
 
-    # Coerce dtypes and sanitize
-    out["date"] = pd.to_datetime(out["date"], utc=True)
+    # Coerce dtypes and sanitize (date is already UTC from the assign above)
     out["symbol"] = out["symbol"].astype("string")
     for c in ["open", "high", "low", "close"]:
         out[c] = pd.to_numeric(out[c], errors="coerce").astype("float64")
@@ -90,3 +90,20 @@ def fetch_daily(
         out["volume"] = out["volume"].astype("int64")
 
     return out[["date", "symbol", "open", "high", "low", "close", "volume"]]
+
+
+async def fetch_daily_async(
+    symbol: str,
+    start: date,
+    end: date,
+    *,
+    throttle_wait: Optional[Callable[[], Awaitable[None]]] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """Async counterpart of :func:`fetch_daily`.
+
+    yfinance has no async API, so the blocking download runs in a worker thread.
+    """
+    if throttle_wait is not None:
+        await throttle_wait()
+    return await asyncio.to_thread(fetch_daily, symbol, start, end, meta=meta)
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import os
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from swing_trade_b3.services.signals import STD_COLS, clean_and_validate, to_compact
+
+
+LOG = logging.getLogger(__name__)
+
+DATASET_BUCKETS = 16
+# ~1 trading year per symbol per row group keeps (symbol, date) statistics selective
+DATASET_ROW_GROUP_SIZE = 4096
+
+
+def symbol_bucket(symbol: str, buckets: int = DATASET_BUCKETS) -> int:
+    """Stable hash bucket of a ticker (crc32), used as the ``bucket=`` partition."""
+    return zlib.crc32(symbol.encode("utf-8")) % buckets
+
+
+def _partition_path(base: Path, year: int, bucket: int) -> Path:
+    return base / f"year={year}" / f"bucket={bucket:02d}" / "data.parquet"
+
+
+def save_dataset(
+    df: pd.DataFrame,
+    base_dir: str | Path = "data/dataset",
+    *,
+    buckets: int = DATASET_BUCKETS,
+    compression: Optional[str] = "snappy",
+) -> list[Path]:
+    """Upsert OHLCV rows (any number of symbols) into the consolidated Hive-partitioned dataset.
+
+    Layout: ``{base_dir}/year=YYYY/bucket=BB/data.parquet``. Each file holds the symbols of
+    one hash bucket for one year, sorted by (symbol, date) so row-group statistics allow
+    predicate pushdown. Returns the rewritten partition files.
+    """
+    dfc = clean_and_validate(df)
+    if dfc.empty:
+        return []
+
+    base = Path(base_dir)
+    years = dfc["date"].dt.year
+    # one crc32 per ticker, not per row
+    bucket_of = {s: symbol_bucket(str(s), buckets) for s in dfc["symbol"].unique()}
+    bucket_ids = dfc["symbol"].map(bucket_of)
+    written: list[Path] = []
+    for (year, bucket), part in dfc.groupby([years, bucket_ids]):
+        path = _partition_path(base, int(year), int(bucket))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            existing = pd.read_parquet(path)
+            part = pd.concat([existing, part], ignore_index=True)
+        merged = (
+            part.drop_duplicates(subset=["symbol", "date"], keep="last")
+            .sort_values(["symbol", "date"])
+            .reset_index(drop=True)
+        )
+        tmp = path.with_name(".data.parquet.tmp")  # dot-prefixed: ignored by dataset discovery
+        merged.to_parquet(
+            tmp,
+            index=False,
+            compression=compression if compression and compression.lower() != "none" else None,
+            row_group_size=DATASET_ROW_GROUP_SIZE,
+        )
+        os.replace(tmp, path)
+        written.append(path)
+        LOG.info(
+            "saved dataset partition",
+            extra={
+                "year": int(year),
+                "bucket": int(bucket),
+                "rows": len(merged),
+                "path": str(path),
+            },
+        )
+    return written
+
+
+def _utc(value: date | pd.Timestamp) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_convert("UTC") if ts.tz is not None else ts.tz_localize("UTC")
+
+
+def dataset_filter(
+    *,
+    symbols: Optional[Iterable[str]] = None,
+    start: Optional[date | pd.Timestamp] = None,
+    end: Optional[date | pd.Timestamp] = None,
+    buckets: int = DATASET_BUCKETS,
+) -> Optional[ds.Expression]:
+    """Build the pushdown filter: partition pruning on year/bucket plus row-group predicates."""
+    ts_type = pa.timestamp("ns", tz="UTC")
+    conds: list[ds.Expression] = []
+    if symbols is not None:
+        syms = sorted({str(s) for s in symbols})
+        conds.append(ds.field("bucket").isin(sorted({symbol_bucket(s, buckets) for s in syms})))
+        conds.append(ds.field("symbol").isin(syms))
+    if start is not None:
+        s = _utc(start)
+        conds.append(ds.field("year") >= s.year)
+        conds.append(ds.field("date") >= pa.scalar(s, type=ts_type))
+    if end is not None:
+        e = _utc(end)
+        conds.append(ds.field("year") <= e.year)
+        conds.append(ds.field("date") <= pa.scalar(e, type=ts_type))
+    if not conds:
+        return None
+    expr = conds[0]
+    for cond in conds[1:]:
+        expr = expr & cond
+    return expr
+
+
+def load_dataset(
+    base_dir: str | Path = "data/dataset",
+    *,
+    symbols: Optional[Iterable[str]] = None,
+    start: Optional[date | pd.Timestamp] = None,
+    end: Optional[date | pd.Timestamp] = None,
+    columns: Optional[list[str]] = None,
+    buckets: int = DATASET_BUCKETS,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """Scan the consolidated dataset with symbol/date filters pushed down to pyarrow.
+
+    Only partitions of the requested years/buckets are opened, and row groups whose
+    statistics fall outside the filter are skipped. Returns rows sorted by (symbol, date);
+    ``compact=True`` returns the compact in-memory schema (see ``to_compact``).
+    """
+    cols = list(columns) if columns is not None else list(STD_COLS)
+    df = _scan(
+        Path(base_dir), cols, dataset_filter(symbols=symbols, start=start, end=end, buckets=buckets)
+    )
+    return to_compact(df) if compact else df
+
+
+def _scan(base: Path, cols: list[str], flt: Optional[ds.Expression]) -> pd.DataFrame:
+    if not base.exists():
+        return pd.DataFrame(columns=cols)
+
+    dataset = ds.dataset(base, format="parquet", partitioning="hive")
+    if not dataset.files:
+        return pd.DataFrame(columns=cols)
+
+    table = dataset.to_table(columns=cols, filter=flt)
+    df = table.to_pandas()
+    if "symbol" in df.columns:
+        df["symbol"] = df["symbol"].astype("string")
+    order = [c for c in ("symbol", "date") if c in df.columns]
+    if order:
+        df = df.sort_values(order, kind="stable")
+    return df.reset_index(drop=True)[cols]
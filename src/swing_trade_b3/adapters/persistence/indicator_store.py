@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from swing_trade_b3.adapters.persistence.mmap_cache import parts_fingerprint
+from swing_trade_b3.adapters.persistence.repositories import load_processed, processed_parts
+from swing_trade_b3.services.indicator_state import IndicatorState
+
+LOG = logging.getLogger(__name__)
+
+INDICATOR_STATE_SUFFIX = ".indicators.json"
+
+
+def indicator_state_path(symbol: str, base_dir: str | Path = "data/processed") -> Path:
+    """Sidecar next to ``{symbol}.parquet`` (never matched by the processed-part globs)."""
+    return Path(base_dir) / f"{symbol}{INDICATOR_STATE_SUFFIX}"
+
+
+def load_indicator_state(
+    symbol: str, base_dir: str | Path = "data/processed"
+) -> Optional[IndicatorState]:
+    """Stored state of a symbol; ``None`` when missing or unreadable (rebuilt by the caller)."""
+    path = indicator_state_path(symbol, base_dir)
+    try:
+        return IndicatorState.from_dict(json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, TypeError, KeyError):
+        LOG.warning("ignoring unreadable indicator state", extra={"path": str(path)})
+        return None
+
+
+def save_indicator_state(
+    symbol: str, state: IndicatorState, base_dir: str | Path = "data/processed"
+) -> Path:
+    """Write the state atomically (per-process tmp file + ``os.replace``)."""
+    path = indicator_state_path(symbol, base_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state.to_dict()), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def _new_bars(
+    symbol: str, base: Path, stored: Optional[str], current: Optional[str]
+) -> Optional[pd.DataFrame]:
+    """Bars added since the parts fingerprinted as ``stored`` (``None``: not resumable).
+
+    Tails only ever extend the fingerprint, so when the current one starts with the stored
+    one the folded parts are untouched and only the newer tail files are read.
+    """
+    if stored is None or current is None:
+        return None
+    if current == stored:
+        return pd.DataFrame(columns=["date", "high", "low", "close"])
+    if not current.startswith(stored + ";"):
+        return None
+    parts = processed_parts(symbol, base)[stored.count(";") + 1 :]
+    frames = [pd.read_parquet(p, columns=["date", "high", "low", "close"]) for p in parts]
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def update_indicator_state(
+    symbol: str,
+    base_dir: str | Path = "data/processed",
+    *,
+    rsi_period: int = 14,
+    macd_spans: tuple[int, int, int] = (12, 26, 9),
+    atr_period: int = 14,
+) -> tuple[IndicatorState, str]:
+    """Bring a symbol's stored indicator state up to its last processed bar and persist it.
+
+    The state records the fingerprint of the processed Parquet parts it has folded (see
+    :func:`parts_fingerprint`, footers only). When the current parts merely add tail files
+    (days appended by ``save_processed``), only those files are read and folded, so a daily
+    run costs O(new bars). Any other change (a merged or compacted base: a removed,
+    backfilled or corrected bar anywhere in the history), other parameters, or a missing
+    state rebuild it from the whole processed dataset; data without processed markers
+    (CSV) cannot be fingerprinted and is rebuilt on every call. Returns the state and one
+    of ``created``, ``updated``, ``unchanged`` or ``rebuilt``.
+    """
+    base = Path(base_dir)
+    fresh = IndicatorState.create(
+        rsi_period=rsi_period, macd_spans=macd_spans, atr_period=atr_period
+    )
+    current = parts_fingerprint(processed_parts(symbol, base))
+    state = load_indicator_state(symbol, base)
+    bars = None
+    if state is not None and state.params() == fresh.params():
+        bars = _new_bars(symbol, base, state.history_fingerprint, current)
+    if state is None or bars is None:
+        status = "created" if state is None else "rebuilt"
+        state, bars = fresh, load_processed(symbol, base)
+    elif bars.empty:
+        return state, "unchanged"
+    else:
+        status = "updated"
+    new = state.advance(bars)
+    state.history_fingerprint = current
+    save_indicator_state(symbol, state, base)
+    LOG.info(
+        "updated indicator state",
+        extra={"symbol": symbol, "status": status, "bars": len(new)},
+    )
+    return state, status
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from swing_trade_b3.adapters.persistence.repositories import (
+    load_processed,
+    processed_marker,
+    processed_parts,
+)
+from swing_trade_b3.services.signals import to_compact
+
+
+LOG = logging.getLogger(__name__)
+
+CACHE_DIRNAME = "cache"
+# Schema metadata key holding the processed-parts fingerprint the cache was built from
+CACHE_FINGERPRINT_KEY = b"swing_trade_b3.fingerprint"
+
+
+def cache_path(symbol: str, base_dir: str | Path = "data/processed") -> Path:
+    return Path(base_dir) / CACHE_DIRNAME / f"{symbol}.arrow"
+
+
+def processed_fingerprint(symbol: str, base_dir: str | Path = "data/processed") -> Optional[str]:
+    """Content fingerprint of a symbol's processed Parquet parts, from footers only.
+
+    ``None`` when there is nothing to cache or some part lacks a valid processed marker
+    (unmarked data cannot be tracked, so it is never cached).
+    """
+    return parts_fingerprint(processed_parts(symbol, base_dir))
+
+
+def parts_fingerprint(parts: list[Path]) -> Optional[str]:
+    """Fingerprint (``rows:hash`` per part, ``;``-joined) of the given processed parts.
+
+    Appending a tail only extends it, so a stored fingerprint that prefixes the current one
+    at a ``;`` means the parts it covered are untouched. ``None`` as in
+    :func:`processed_fingerprint`.
+    """
+    markers = [processed_marker(p) for p in parts]
+    if not parts or any(m is None for m in markers):
+        return None
+    return ";".join(f"{m['rows']}:{m['hash']}" for m in markers if m is not None)
+
+
+def build_cache(symbol: str, base_dir: str | Path = "data/processed") -> Optional[Path]:
+    """(Re)write the uncompressed Arrow IPC cache of a symbol from its processed dataset.
+
+    Returns the cache path, or ``None`` when the processed data is not cacheable.
+    """
+    fingerprint = processed_fingerprint(symbol, base_dir)
+    if fingerprint is None:
+        return None
+    df = load_processed(symbol, base_dir)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), CACHE_FINGERPRINT_KEY: fingerprint.encode()}
+    )
+    path = cache_path(symbol, base_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # per-process tmp name: concurrent rebuilds never clobber each other's partial file, and
+    # os.replace swaps the inode so tables still mapping the old file stay valid
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, path)
+    LOG.info("built columnar cache", extra={"symbol": symbol, "rows": len(df), "path": str(path)})
+    return path
+
+
+def _open_mapped(path: Path) -> pa.Table:
+    with pa.memory_map(str(path), "r") as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def open_cached(symbol: str, base_dir: str | Path = "data/processed") -> Optional[pa.Table]:
+    """Memory-mapped Arrow table of a symbol, rebuilding the cache when it is stale.
+
+    Column buffers point into the mapped file, so processes opening the same symbol share
+    the OS page cache instead of decompressing private copies. The cache is only served
+    while its fingerprint matches the current processed parts (i.e. after every
+    ``save_processed`` write the next open rebuilds it). ``None`` when not cacheable.
+    """
+    fingerprint = processed_fingerprint(symbol, base_dir)
+    if fingerprint is None:
+        return None
+    path = cache_path(symbol, base_dir)
+    if path.exists():
+        try:
+            table = _open_mapped(path)
+        except (OSError, pa.ArrowInvalid):
+            table = None
+        if (
+            table is not None
+            and (table.schema.metadata or {}).get(CACHE_FINGERPRINT_KEY) == fingerprint.encode()
+        ):
+            return table
+    if build_cache(symbol, base_dir) is None:  # pragma: no cover - raced with a rewrite
+        return None
+    return _open_mapped(path)
+
+
+def load_cached(
+    symbol: str,
+    base_dir: str | Path = "data/processed",
+    *,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """Processed OHLCV of a symbol through the memory-mapped cache.
+
+    Numeric and date columns are converted without copying out of the mapping where
+    pyarrow allows it (``split_blocks``); falls back to :func:`load_processed` for data
+    that cannot be cached (CSV or unmarked Parquet). ``compact=True`` returns the compact
+    in-memory schema (a converted copy, see ``to_compact``).
+    """
+    table = open_cached(symbol, base_dir)
+    if table is None:
+        df = load_processed(symbol, base_dir)
+        df = df[columns] if columns is not None else df
+    else:
+        if columns is not None:
+            table = table.select(columns)
+        df = table.to_pandas(split_blocks=True)
+    return to_compact(df) if compact else df
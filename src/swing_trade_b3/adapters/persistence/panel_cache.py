@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from swing_trade_b3.adapters.persistence.mmap_cache import CACHE_DIRNAME, parts_fingerprint
+from swing_trade_b3.adapters.persistence.repositories import load_processed, processed_parts
+from swing_trade_b3.services.calendar import sessions
+from swing_trade_b3.services.price_panel import PANEL_FIELDS, PricePanel
+
+LOG = logging.getLogger(__name__)
+
+PANEL_DIRNAME = "panel"
+PANEL_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+# Dates per values file (~1 year of sessions): appended days only rewrite the files they touch
+PANEL_CHUNK_DATES = 256
+
+
+def panel_cache_dir(base_dir: str | Path = "data/processed") -> Path:
+    return Path(base_dir) / CACHE_DIRNAME / PANEL_DIRNAME
+
+
+def _chunk_bounds(n_dates: int) -> List[Tuple[int, int]]:
+    """``[lo, hi)`` date positions of each values file."""
+    return [
+        (lo, min(lo + PANEL_CHUNK_DATES, n_dates)) for lo in range(0, n_dates, PANEL_CHUNK_DATES)
+    ]
+
+
+def _load_cache(
+    directory: Path, fields: Tuple[str, ...]
+) -> Tuple[Dict[str, Any], List[np.ndarray]]:
+    """Manifest and memory-mapped values chunks; an empty manifest when missing or unusable."""
+    empty: Dict[str, Any] = {"dates": [], "symbols": [], "fingerprints": {}, "values": []}
+    try:
+        manifest = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return empty, []
+    except (OSError, ValueError):
+        LOG.warning("ignoring unreadable panel cache", extra={"path": str(directory)})
+        return empty, []
+    if (
+        manifest.get("version") != PANEL_VERSION
+        or manifest.get("chunk_dates") != PANEL_CHUNK_DATES
+        or tuple(manifest.get("fields", ())) != fields
+    ):
+        return empty, []
+    try:
+        chunks = [np.load(directory / name, mmap_mode="r") for name in manifest["values"]]
+    except (OSError, ValueError):
+        LOG.warning("ignoring unreadable panel cache", extra={"path": str(directory)})
+        return empty, []
+    shapes = [
+        (len(fields), len(manifest["symbols"]), hi - lo)
+        for lo, hi in _chunk_bounds(len(manifest["dates"]))
+    ]
+    if [c.shape for c in chunks] != shapes:
+        return empty, []
+    return manifest, chunks
+
+
+def _save_cache(
+    directory: Path,
+    fields: Tuple[str, ...],
+    dates: np.ndarray,
+    symbols: List[str],
+    fingerprints: Dict[str, Optional[str]],
+    files: List[Optional[str]],
+    blocks: Dict[int, np.ndarray],
+) -> None:
+    """Write the changed chunks (``blocks``, by position) to new values files, then swap the
+    manifest to them (both atomically); ``files`` names the chunks kept as they are. Values
+    files the previous manifest no longer shares are removed."""
+    directory.mkdir(parents=True, exist_ok=True)
+    previous: List[str] = []
+    try:
+        stored = json.loads((directory / MANIFEST_NAME).read_text(encoding="utf-8"))["values"]
+        previous = [stored] if isinstance(stored, str) else list(stored)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    names = list(files)
+    for c, block in blocks.items():
+        name = f"values-{uuid.uuid4().hex[:12]}.npy"
+        tmp = directory / f".{name}.{os.getpid()}.tmp"
+        with tmp.open("wb") as fh:
+            np.save(fh, block)
+        os.replace(tmp, directory / name)
+        names[c] = name
+    manifest = {
+        "version": PANEL_VERSION,
+        "fields": list(fields),
+        "chunk_dates": PANEL_CHUNK_DATES,
+        "values": names,
+        "dates": dates.tolist(),
+        "symbols": symbols,
+        "fingerprints": fingerprints,
+    }
+    tmp = directory / f".{MANIFEST_NAME}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(tmp, directory / MANIFEST_NAME)
+    for name in set(previous) - set(names):
+        (directory / name).unlink(missing_ok=True)
+
+
+# A symbol's rows to write: (UTC ns stamps, one float64 array per field)
+_Rows = Tuple[np.ndarray, List[np.ndarray]]
+
+
+def _frame_rows(df: pd.DataFrame, fields: Tuple[str, ...]) -> _Rows:
+    dates = pd.DatetimeIndex(df["date"])
+    dates = dates.tz_localize("UTC") if dates.tz is None else dates.tz_convert("UTC")
+    return dates.as_unit("ns").asi8, [df[f].to_numpy(dtype="float64") for f in fields]
+
+
+def _parquet_rows(parts: List[Path], fields: Tuple[str, ...]) -> _Rows:
+    # ParquetFile skips the dataset discovery of read_table (most of the cost of a 1-row tail)
+    table = pa.concat_tables([pq.ParquetFile(p).read(columns=["date", *fields]) for p in parts])
+    stamps = table.column("date").cast(pa.timestamp("ns", tz="UTC")).to_numpy()
+    columns = [table.column(f).to_numpy().astype("float64", copy=False) for f in fields]
+    return stamps.view("int64"), columns
+
+
+def _read_new_rows(
+    symbol: str,
+    base: Path,
+    parts: List[Path],
+    fields: Tuple[str, ...],
+    known: bool,
+    cached: Optional[str],
+    current: Optional[str],
+) -> Tuple[str, Optional[_Rows]]:
+    """Status of a symbol and the rows to write into its column (``None``: nothing to do).
+
+    ``cached``/``current`` are the fingerprints of the cached and the current parts.
+    """
+    if known and current is not None and current == cached:
+        return "unchanged", None
+    if known and current is not None and cached is not None and current.startswith(cached + ";"):
+        # only tail files were added since the cache was built: read just those
+        return "appended", _parquet_rows(parts[cached.count(";") + 1 :], fields)
+    df = load_processed(symbol, base)
+    if df.empty:
+        return "missing", None
+    return ("rebuilt" if known else "created"), _frame_rows(df, fields)
+
+
+def _write_updates(
+    targets: List[Tuple[np.ndarray, int, int]],
+    symbols: List[str],
+    dates: np.ndarray,
+    updates: Dict[str, Tuple[bool, _Rows]],
+) -> None:
+    """Write each symbol's rows into the ``(values, lo, hi)`` slices of the date axis."""
+    for sym, (reset, (ts, columns)) in updates.items():
+        j = symbols.index(sym)
+        at = np.searchsorted(dates, ts)  # ascending: one symbol's bars in date order
+        for values, lo, hi in targets:
+            if reset:
+                values[:, j, :] = np.nan
+            a, b = np.searchsorted(at, [lo, hi])
+            for k, column in enumerate(columns):
+                values[k, j, at[a:b] - lo] = column[a:b]
+
+
+def update_wide_panel(
+    symbols: Iterable[str],
+    base_dir: str | Path = "data/processed",
+    *,
+    fields: Sequence[str] = PANEL_FIELDS,
+) -> Tuple[PricePanel, Dict[str, str]]:
+    """Dates × symbols panel of ``symbols`` from the on-disk cache, refreshed as needed.
+
+    The cache (``{base_dir}/cache/panel``) holds one float64 matrix per field for every
+    symbol requested so far, on a date axis made of the B3 sessions between the first and
+    last cached bar (plus any bar dated off-calendar), NaN where a symbol has no bar. The
+    matrices are split along the dates into files of ``PANEL_CHUNK_DATES`` dates, so while
+    the cached symbol set is unchanged and dates only grow at the end, a refresh rewrites
+    just the files holding new cells (typically the last one) instead of the whole history.
+    Each symbol is checked against the fingerprint of its processed Parquet parts (footers
+    only): unchanged symbols are not read, symbols that only gained tail files (days
+    appended by ``save_processed``) read just those files, and rewritten symbols are
+    reloaded. Data without processed markers (CSV) cannot be fingerprinted and is reloaded
+    on every call. Returns the panel (symbols in request order, the full cached date axis)
+    and a status per symbol: ``created``, ``appended``, ``rebuilt``, ``unchanged`` or
+    ``missing`` (no processed data; left out of the panel).
+    """
+    base, fields = Path(base_dir), tuple(fields)
+    wanted = list(dict.fromkeys(symbols))
+    directory = panel_cache_dir(base)
+    manifest, chunks = _load_cache(directory, fields)
+    fingerprints: Dict[str, Optional[str]] = dict(manifest["fingerprints"])
+    statuses: Dict[str, str] = {}
+    updates: Dict[str, Tuple[bool, _Rows]] = {}  # symbol -> (reset column, rows)
+    known = set(manifest["symbols"])
+    for sym in wanted:
+        parts = processed_parts(sym, base)
+        current = parts_fingerprint(parts)
+        status, rows = _read_new_rows(
+            sym, base, parts, fields, sym in known, fingerprints.get(sym), current
+        )
+        statuses[sym] = status
+        if rows is not None:
+            updates[sym] = (status != "appended", rows)
+            fingerprints[sym] = current
+
+    old_symbols: List[str] = list(manifest["symbols"])
+    missing = {s for s, status in statuses.items() if status == "missing"}
+    new_symbols = sorted((set(old_symbols) | set(updates)) - missing)
+    old_dates = np.asarray(manifest["dates"], dtype="int64")
+    new_dates = old_dates
+    if updates:
+        stamps = np.concatenate([rows[0] for _reset, rows in updates.values()])
+        new_dates = np.union1d(old_dates, stamps)
+        calendar = sessions(
+            pd.Timestamp(new_dates[0], tz="UTC"), pd.Timestamp(new_dates[-1], tz="UTC")
+        )
+        new_dates = np.union1d(new_dates, calendar.asi8)
+
+    bounds = _chunk_bounds(len(new_dates))
+    if updates or missing & set(old_symbols):
+        shape = (len(fields), len(new_symbols))
+        files: List[Optional[str]] = [None] * len(bounds)
+        blocks: Dict[int, np.ndarray] = {}
+        if new_symbols == old_symbols and np.array_equal(new_dates[: len(old_dates)], old_dates):
+            # same layout: cached chunks stay in place, only those with new cells are rewritten
+            files[: len(chunks)] = manifest["values"]
+            touched = {c for c, (_lo, hi) in enumerate(bounds) if hi > len(old_dates)}
+            for reset, (ts, _columns) in updates.values():
+                if reset:
+                    touched = set(range(len(bounds)))
+                    break
+                touched.update(np.searchsorted(new_dates, ts) // PANEL_CHUNK_DATES)
+            for c in sorted(touched):
+                lo, hi = bounds[c]
+                blocks[c] = np.full((*shape, hi - lo), np.nan)
+                if c < len(chunks):
+                    blocks[c][:, :, : chunks[c].shape[2]] = chunks[c]
+            _write_updates(
+                [(blocks[c], *bounds[c]) for c in blocks], new_symbols, new_dates, updates
+            )
+        else:
+            values = np.full((*shape, len(new_dates)), np.nan)
+            keep = [i for i, s in enumerate(old_symbols) if s in new_symbols]
+            cols = np.searchsorted(new_symbols, [old_symbols[i] for i in keep])
+            rows_at = np.searchsorted(new_dates, old_dates)
+            for (lo, hi), chunk in zip(_chunk_bounds(len(old_dates)), chunks):
+                values[:, cols[:, None], rows_at[None, lo:hi]] = chunk[:, keep, :]
+            _write_updates([(values, 0, len(new_dates))], new_symbols, new_dates, updates)
+            blocks = {c: values[:, :, lo:hi] for c, (lo, hi) in enumerate(bounds)}
+        kept = {s: fingerprints.get(s) for s in new_symbols}
+        _save_cache(directory, fields, new_dates, new_symbols, kept, files, blocks)
+        chunks = [blocks[c] if c in blocks else chunks[c] for c in range(len(bounds))]
+        LOG.info(
+            "refreshed panel cache",
+            extra={
+                "symbols": len(new_symbols),
+                "dates": len(new_dates),
+                "updated": len(updates),
+                "rewritten": len(blocks),
+            },
+        )
+
+    present = [s for s in wanted if s not in missing]
+    cols = np.searchsorted(new_symbols, present) if present else np.empty(0, dtype="int64")
+    values = np.empty((len(fields), len(cols), len(new_dates)))
+    for (lo, hi), chunk in zip(bounds, chunks):
+        values[:, :, lo:hi] = chunk[:, cols, :]
+    dates = pd.DatetimeIndex(new_dates.view("datetime64[ns]"), name="date").tz_localize("UTC")
+    return PricePanel(dates, present, fields, values), statuses
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import json
 import logging
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
-from swing_trade_b3.services.signals import STD_COLS, clean_and_validate
+from swing_trade_b3.services.signals import (
+    SCHEMA_VERSION,
+    STD_COLS,
+    clean_and_validate,
+    content_hash,
+    to_compact,
+)
 
 
 LOG = logging.getLogger(__name__)
@@ -16,6 +26,66 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+RAW_COMPACT_THRESHOLD = 16
+_PARTITION_RE = re.compile(r"^(\d{4})(?:\.delta-(\d+))?\.(csv|parquet)$")
+
+
+def _partition_key(path: Path) -> tuple[int, int, str]:
+    """Sort key (year, delta seq, name): base partitions first, then deltas in write order."""
+    m = _PARTITION_RE.match(path.name)
+    if m is None:
+        return (-1, 0, path.name)
+    return (int(m.group(1)), int(m.group(2) or 0), path.name)
+
+
+def _delta_files(base: Path, year: int, ext: str) -> list[Path]:
+    return sorted(base.glob(f"{year}.delta-*.{ext}"), key=_partition_key)
+
+
+def _read_partition(path: Path) -> pd.DataFrame:
+    try:
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_csv(path, parse_dates=["date"])
+    except Exception:  # pragma: no cover - defensive
+        return pd.DataFrame(columns=STD_COLS)
+
+
+def _write_partition(df: pd.DataFrame, path: Path, compression: Optional[str]) -> None:
+    if path.suffix == ".parquet":
+        to_kwargs: dict = {"index": False}
+        if compression and compression.lower() != "none":
+            to_kwargs["compression"] = compression
+        df.to_parquet(path, **to_kwargs)
+    else:
+        df.to_csv(path, index=False)
+
+
+def _merge_rows(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate in write order, keep the last row per (symbol, date), sort by date."""
+    frames = [f for f in frames if not f.empty] or frames[-1:]
+    merged = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    return (
+        merged.drop_duplicates(subset=["symbol", "date"], keep="last")
+        .sort_values("date")
+        .reset_index(drop=True)
+    )
+
+
+def _fold_partition(
+    path: Path, deltas: list[Path], extra: Optional[pd.DataFrame], compression: Optional[str]
+) -> pd.DataFrame:
+    """Rewrite the yearly partition from base + deltas (+ new rows) and drop the deltas."""
+    frames = [_read_partition(p) for p in ([path] if path.exists() else []) + deltas]
+    if extra is not None:
+        frames.append(extra)
+    merged = _merge_rows(frames)
+    _write_partition(merged, path, compression)
+    for delta in deltas:
+        delta.unlink(missing_ok=True)
+    return merged
+
+
 def save_raw(
     symbol: str,
     df: pd.DataFrame,
@@ -23,11 +93,16 @@ def save_raw(
     *,
     fmt: str = "csv",  # 'csv' or 'parquet'
     compression: Optional[str] = None,  # for parquet only
+    append: bool = False,
+    compact_threshold: int = RAW_COMPACT_THRESHOLD,
 ) -> list[Path]:
     """Persist raw OHLCV data partitioned by year: data/raw/{symbol}/YYYY.(csv|parquet).
 
     - Merges with existing files if present and deduplicates by (symbol, date).
     - Maintains ascending order by date.
+    - ``append=True``: new rows for an existing year go to a small delta file
+      (``YYYY.delta-NNNNNN.ext``) instead of rewriting the partition; once the year reaches
+      ``compact_threshold`` deltas they are folded back into ``YYYY.ext``.
     Returns list of written file paths.
     """
     if df.empty:
@@ -47,47 +122,21 @@ def save_raw(
     df["date"] = pd.to_datetime(df["date"], utc=True)
     df["year"] = df["date"].dt.year
 
+    ext = "parquet" if fmt == "parquet" else "csv"
     written: list[Path] = []
     for year, part in df.groupby("year"):
         part = part.drop(columns=["year"]).copy()
-
-        if fmt == "parquet":
-            path = base / f"{int(year)}.parquet"
-            if path.exists():
-                try:
-                    existing = pd.read_parquet(path)
-                except Exception:  # pragma: no cover - defensive
-                    existing = pd.DataFrame(columns=cols)
-                merged = part if existing.empty else pd.concat([existing, part], ignore_index=True)
-            else:
-                merged = part
-            merged = (
-                merged.drop_duplicates(subset=["symbol", "date"], keep="last")
-                .sort_values("date")
-                .reset_index(drop=True)
-            )
-            to_kwargs: dict = {"index": False}
-            if compression and compression.lower() != "none":
-                to_kwargs["compression"] = compression
-            merged.to_parquet(path, **to_kwargs)
-            size_bytes = path.stat().st_size if path.exists() else None
+        path = base / f"{int(year)}.{ext}"
+        deltas = _delta_files(base, int(year), ext)
+
+        if append and path.exists() and len(deltas) + 1 < compact_threshold:
+            seq = _partition_key(deltas[-1])[1] + 1 if deltas else 1
+            path = base / f"{int(year)}.delta-{seq:06d}.{ext}"
+            merged = _merge_rows([part])
+            _write_partition(merged, path, compression)
         else:
-            path = base / f"{int(year)}.csv"
-            if path.exists():
-                try:
-                    existing = pd.read_csv(path, parse_dates=["date"])
-                except Exception:  # pragma: no cover - defensive
-                    existing = pd.DataFrame(columns=cols)
-                merged = part if existing.empty else pd.concat([existing, part], ignore_index=True)
-            else:
-                merged = part
-            merged = (
-                merged.drop_duplicates(subset=["symbol", "date"], keep="last")
-                .sort_values("date")
-                .reset_index(drop=True)
-            )
-            merged.to_csv(path, index=False)
-            size_bytes = path.stat().st_size if path.exists() else None
+            merged = _fold_partition(path, deltas, part, compression)
+        size_bytes = path.stat().st_size if path.exists() else None
 
         written.append(path)
         LOG.info(
@@ -104,71 +153,347 @@ def save_raw(
     return written
 
 
+def compact_raw(
+    symbol: str,
+    base_dir: str | Path = "data/raw",
+    *,
+    compression: Optional[str] = None,
+) -> list[Path]:
+    """Fold every pending delta file of a symbol into its yearly partition.
+
+    Returns the rewritten partition paths (empty when there is nothing to compact).
+    """
+    base = Path(base_dir) / symbol
+    if not base.exists():
+        return []
+    pending: dict[Path, list[Path]] = {}
+    for delta in sorted(base.glob("*.delta-*.*"), key=_partition_key):
+        m = _PARTITION_RE.match(delta.name)
+        if m is not None:
+            pending.setdefault(base / f"{m.group(1)}.{m.group(3)}", []).append(delta)
+    for path, deltas in pending.items():
+        merged = _fold_partition(path, deltas, None, compression)
+        LOG.info(
+            "compacted raw partition",
+            extra={"symbol": symbol, "path": str(path), "deltas": len(deltas), "rows": len(merged)},
+        )
+    return list(pending)
+
+
+def _read_raw_file(
+    path: Path,
+    columns: list[str],
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+    project: bool,
+) -> pd.DataFrame:
+    if path.suffix == ".csv":
+        if project:
+            return pd.read_csv(path, parse_dates=["date"], usecols=columns)
+        return pd.read_csv(path, parse_dates=["date"])
+    kwargs: dict = {}
+    if project:
+        kwargs["columns"] = columns
+    filters = ([("date", ">=", start)] if start is not None else []) + (
+        [("date", "<=", end)] if end is not None else []
+    )
+    if filters:
+        try:
+            return pd.read_parquet(path, filters=filters, **kwargs)
+        except Exception:  # pushdown is an optimization; rows are filtered again below
+            LOG.debug("raw parquet filter pushdown failed", extra={"path": str(path)})
+    return pd.read_parquet(path, **kwargs)
+
+
 def load_raw(
     symbol: str,
     base_dir: str | Path = "data/raw",
     *,
     start: Optional[pd.Timestamp] = None,
     end: Optional[pd.Timestamp] = None,
+    columns: Optional[list[str]] = None,
+    compact: bool = False,
 ) -> pd.DataFrame:
     """Load raw OHLCV partitions for a symbol from data/raw and optionally filter by date.
 
     Supports CSV and Parquet files under data/raw/{symbol}/. Ensures STD_COLS and UTC timezone.
+    Yearly partitions outside [start, end] are skipped by file name, date filters are pushed
+    down to the Parquet reader and ``columns`` projects the result (subset of STD_COLS).
+    ``compact=True`` returns the compact in-memory schema (see :func:`to_compact`).
     """
+    df = _load_raw(symbol, base_dir, start=start, end=end, columns=columns)
+    return to_compact(df) if compact else df
+
+
+def _load_raw(
+    symbol: str,
+    base_dir: str | Path,
+    *,
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+    columns: Optional[list[str]],
+) -> pd.DataFrame:
+    out_cols = list(columns) if columns is not None else list(STD_COLS)
+    unknown = [c for c in out_cols if c not in STD_COLS]
+    if unknown:
+        raise ValueError(f"unknown raw columns: {unknown}")
+
     root = Path(base_dir) / symbol
     if not root.exists():
-        return pd.DataFrame(columns=STD_COLS)
-
-    files = list(root.glob("*.csv")) + list(root.glob("*.parquet"))
+        return pd.DataFrame(columns=out_cols)
+
+    s = _to_utc(start) if start is not None else None
+    e = _to_utc(end) if end is not None else None
+
+    # base partitions before their deltas so later writes win on dedupe
+    files = sorted(list(root.glob("*.csv")) + list(root.glob("*.parquet")), key=_partition_key)
+    # yearly partitions (and their deltas) only hold rows of that year
+    files = [
+        p
+        for p in files
+        if _partition_key(p)[0] < 0
+        or (
+            (s is None or _partition_key(p)[0] >= s.year)
+            and (e is None or _partition_key(p)[0] <= e.year)
+        )
+    ]
     if not files:
-        return pd.DataFrame(columns=STD_COLS)
+        return pd.DataFrame(columns=out_cols)
+    has_deltas = any(_partition_key(p)[1] for p in files)
+
+    # columns needed to filter/dedupe, on top of the projection
+    need = set(out_cols) | ({"date"} if s is not None or e is not None or has_deltas else set())
+    if has_deltas:
+        need.add("symbol")
+    read_cols = [c for c in STD_COLS if c in need]
+    project = columns is not None
 
     frames: list[pd.DataFrame] = []
     for path in files:
         try:
-            if path.suffix == ".csv":
-                df = pd.read_csv(path, parse_dates=["date"])
-            else:
-                df = pd.read_parquet(path)
+            df = _read_raw_file(path, read_cols, s, e, project)
         except Exception as exc:  # pragma: no cover - defensive
             LOG.warning(
                 "processing: skip unreadable raw", extra={"path": str(path), "error": str(exc)}
             )
             continue
         # normalize columns order
-        missing = [c for c in STD_COLS if c not in df.columns]
+        missing = [c for c in read_cols if c not in df.columns]
         if missing:
             LOG.warning(
                 "processing: raw file missing columns",
                 extra={"path": str(path), "missing": missing},
             )
             continue
-        df = df[STD_COLS].copy()
+        df = df[read_cols].copy()
         frames.append(df)
 
     if not frames:
-        return pd.DataFrame(columns=STD_COLS)
+        return pd.DataFrame(columns=out_cols)
 
     all_df = pd.concat(frames, ignore_index=True)
     # timezone/typing normalization
-    all_df["date"] = pd.to_datetime(all_df["date"], utc=True)
-    # optional filtering
-    if start is not None:
-        s = (
-            pd.Timestamp(start).tz_convert("UTC")
-            if getattr(start, "tz", None) is not None
-            else pd.Timestamp(start, tz="UTC")
+    if "date" in all_df.columns:
+        all_df["date"] = pd.to_datetime(all_df["date"], utc=True)
+    if has_deltas:
+        all_df = (
+            all_df.drop_duplicates(subset=["symbol", "date"], keep="last")
+            .sort_values("date")
+            .reset_index(drop=True)
         )
+    # optional filtering
+    if s is not None:
         all_df = all_df[all_df["date"] >= s]
-    if end is not None:
-        e = (
-            pd.Timestamp(end).tz_convert("UTC")
-            if getattr(end, "tz", None) is not None
-            else pd.Timestamp(end, tz="UTC")
-        )
+    if e is not None:
         all_df = all_df[all_df["date"] <= e]
 
-    return all_df.reset_index(drop=True)
+    return all_df[out_cols].reset_index(drop=True)
+
+
+def _to_utc(ts: object) -> pd.Timestamp:
+    t = pd.Timestamp(ts)
+    return t.tz_convert("UTC") if t.tz is not None else t.tz_localize("UTC")
+
+
+def _last_date_parquet(path: Path) -> Optional[pd.Timestamp]:
+    """Max ``date`` from Parquet row-group statistics (falls back to reading the column)."""
+    meta = pq.ParquetFile(path).metadata
+    names = meta.schema.names
+    if "date" not in names:
+        return None
+    idx = names.index("date")
+    maxima = []
+    for rg in range(meta.num_row_groups):
+        stats = meta.row_group(rg).column(idx).statistics
+        if stats is None or not stats.has_min_max:
+            col = pd.read_parquet(path, columns=["date"])["date"]
+            return _to_utc(col.max()) if not col.empty else None
+        maxima.append(_to_utc(stats.max))
+    return max(maxima) if maxima else None
+
+
+def _last_date_csv(path: Path, tail_bytes: int = 4096) -> Optional[pd.Timestamp]:
+    """Parse ``date`` from the last line of a date-sorted CSV partition (reads only the tail)."""
+    with open(path, "rb") as fh:
+        header = fh.readline().decode("utf-8").strip().split(",")
+        if "date" not in header:
+            return None
+        fh.seek(0, 2)
+        size = fh.tell()
+        fh.seek(max(0, size - tail_bytes))
+        lines = [ln for ln in fh.read().decode("utf-8", errors="ignore").splitlines() if ln]
+    if len(lines) < 2 and size <= tail_bytes:
+        return None  # header only
+    return _to_utc(lines[-1].split(",")[header.index("date")])
+
+
+def last_raw_date(symbol: str, base_dir: str | Path = "data/raw") -> Optional[pd.Timestamp]:
+    """Return the most recent stored date (UTC) for a symbol, or None when nothing is stored.
+
+    Only the newest year (base partition plus deltas) is inspected, and without loading it:
+    Parquet via row-group statistics, CSV via its last line (partitions are kept sorted).
+    """
+    root = Path(base_dir) / symbol
+    if not root.exists():
+        return None
+    by_year: dict[int, list[Path]] = {}
+    for path in list(root.glob("*.csv")) + list(root.glob("*.parquet")):
+        year = _partition_key(path)[0]
+        if year >= 0:
+            by_year.setdefault(year, []).append(path)
+
+    for year in sorted(by_year, reverse=True):
+        found: list[pd.Timestamp] = []
+        for path in by_year[year]:
+            try:
+                last = _last_date_csv(path) if path.suffix == ".csv" else _last_date_parquet(path)
+            except Exception as exc:  # pragma: no cover - defensive
+                LOG.warning(
+                    "skip unreadable raw partition", extra={"path": str(path), "error": str(exc)}
+                )
+                continue
+            if last is not None:
+                found.append(last)
+        if found:
+            return max(found)
+    return None
+
+
+# Parquet key-value metadata marking a file as already in processed (clean) form
+PROCESSED_MARKER_KEY = b"swing_trade_b3.processed"
+PROCESSED_COMPACT_THRESHOLD = 16
+_TAIL_RE = re.compile(r"\.tail-(\d+)\.parquet$")
+
+
+def processed_marker(path: str | Path) -> Optional[dict[str, Any]]:
+    """Read the processed-form marker from a Parquet footer (no data pages are read).
+
+    Returns ``{"schema_version", "rows", "hash", "first", "last"}`` when the marker exists,
+    matches the current ``SCHEMA_VERSION`` and its row count agrees with the file;
+    otherwise ``None``. ``first``/``last`` are the ``[symbol, iso date]`` boundary keys.
+    """
+    try:
+        meta = pq.read_metadata(path)
+        marker = json.loads((meta.metadata or {})[PROCESSED_MARKER_KEY])
+    except Exception:
+        return None
+    if marker.get("schema_version") != SCHEMA_VERSION or marker.get("rows") != meta.num_rows:
+        return None
+    return dict(marker)
+
+
+def _boundary_key(df: pd.DataFrame, pos: int) -> list[str]:
+    return [str(df["symbol"].iat[pos]), df["date"].iat[pos].isoformat()]
+
+
+def _write_processed_parquet(
+    df: pd.DataFrame, path: Path, compression: Optional[str], digest: str
+) -> None:
+    _stage_processed_parquet(df, path, compression, digest).replace(path)
+
+
+def _stage_processed_parquet(
+    df: pd.DataFrame, path: Path, compression: Optional[str], digest: str
+) -> Path:
+    """Write ``df`` with its processed marker to a tmp file next to ``path``; returns it."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    marker = {
+        "schema_version": SCHEMA_VERSION,
+        "rows": len(df),
+        "hash": digest,
+        "first": _boundary_key(df, 0) if len(df) else None,
+        "last": _boundary_key(df, -1) if len(df) else None,
+    }
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), PROCESSED_MARKER_KEY: json.dumps(marker).encode()}
+    )
+    tmp = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, tmp, compression=compression or "none")
+    return tmp
+
+
+def processed_parts(symbol: str, base_dir: str | Path = "data/processed") -> list[Path]:
+    """A symbol's processed Parquet files: the base (when it exists) then its tails in
+    append order. Their markers (:func:`processed_marker`) describe each part."""
+    out_dir = Path(base_dir)
+    base = out_dir / f"{symbol}.parquet"
+    tails = sorted(
+        out_dir.glob(f"{symbol}.tail-*.parquet"),
+        key=lambda p: int(m.group(1)) if (m := _TAIL_RE.search(p.name)) else 0,
+    )
+    return ([base] if base.exists() else []) + tails
+
+
+def _stored_prefix(dfc: pd.DataFrame, markers: list[dict[str, Any]]) -> Optional[int]:
+    """Row count of the stored parts when ``dfc`` starts with exactly their content
+    (compared per part by content hash); ``None`` otherwise."""
+    stored = sum(int(m["rows"]) for m in markers)
+    if stored > len(dfc):
+        return None
+    offset = 0
+    for marker in markers:
+        rows = int(marker["rows"])
+        if content_hash(dfc.iloc[offset : offset + rows]) != marker["hash"]:
+            return None
+        offset += rows
+    return stored
+
+
+def _extends_tail(dfc: pd.DataFrame, markers: list[dict[str, Any]]) -> bool:
+    """Whether every new row sorts strictly after the stored (symbol, date) tail."""
+    last = markers[-1].get("last") if markers else None
+    if last is None or dfc.empty:
+        return False
+    first = _boundary_key(dfc, 0)
+    return (first[0], pd.Timestamp(first[1])) > (last[0], pd.Timestamp(last[1]))
+
+
+def load_processed(
+    symbol: str, base_dir: str | Path = "data/processed", *, compact: bool = False
+) -> pd.DataFrame:
+    """Load a symbol's processed dataset (Parquet preferred, CSV fallback).
+
+    Parquet base + tail files carrying valid processed markers are concatenated as read
+    (tails only ever extend the sorted tail); anything else goes through
+    :func:`clean_and_validate`. Missing files yield an empty, typed frame.
+    ``compact=True`` returns the compact in-memory schema (see :func:`to_compact`).
+    """
+    df = _load_processed(symbol, Path(base_dir))
+    return to_compact(df) if compact else df
+
+
+def _load_processed(symbol: str, base: Path) -> pd.DataFrame:
+    parts = processed_parts(symbol, base)
+    if parts:
+        frames = [pd.read_parquet(p) for p in parts]
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        if all(processed_marker(p) is not None for p in parts):
+            return df
+        return clean_and_validate(df)
+    csv_path = base / f"{symbol}.csv"
+    if csv_path.exists():
+        return clean_and_validate(pd.read_csv(csv_path, parse_dates=["date"]))
+    return clean_and_validate(pd.DataFrame(columns=STD_COLS))
 
 
 def save_processed(
@@ -178,40 +503,76 @@ def save_processed(
     *,
     fmt: str = "parquet",
     compression: Optional[str] = "snappy",
+    compact_threshold: int = PROCESSED_COMPACT_THRESHOLD,
 ) -> Path:
     """Persist processed dataset for a symbol.
 
     Default: Parquet with snappy compression at data/processed/{symbol}.parquet.
-    Idempotent merge with dedupe and ordering.
+    Idempotent merge with dedupe and ordering. Parquet output carries a processed marker
+    (schema version, content hash, first/last keys), read from file footers only:
+
+    - content equal to what is stored: nothing is read or rewritten;
+    - rows strictly after the stored tail, alone or after the whole stored content (e.g.
+      the full cleaned raw history plus new days): only the new rows are written, as
+      ``{symbol}.tail-NNNNNN.parquet``; at ``compact_threshold`` tails everything is
+      folded back into the base;
+    - anything overlapping history: full merge rewriting the base and dropping the tails
+      (removed before the new base replaces the old one).
     """
     out_dir = Path(base_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Ensure cleaned schema
+    # Ensure cleaned schema (already-clean frames skip the cleaning kernel)
     dfc = clean_and_validate(df)
 
     if fmt == "parquet":
         path = out_dir / f"{symbol}.parquet"
-        if path.exists():
-            try:
-                existing = pd.read_parquet(path)
-            except Exception:  # pragma: no cover
-                existing = pd.DataFrame(columns=STD_COLS)
-            merged = pd.concat([existing, dfc], ignore_index=True)
+        compression = compression if compression and compression.lower() != "none" else None
+        parts = processed_parts(symbol, out_dir)
+        markers = [processed_marker(p) for p in parts]
+        trusted = [m for m in markers if m is not None]
+        tails = parts[1:] if path.exists() else parts
+        mode = "full"
+        new_rows = dfc
+        if parts and len(trusted) == len(parts):
+            stored = _stored_prefix(dfc, trusted)
+            if stored == len(dfc):
+                LOG.info(
+                    "processed dataset unchanged",
+                    extra={"symbol": symbol, "rows": int(len(dfc)), "path": str(path)},
+                )
+                return path
+            if stored:  # an empty stored base is simply rewritten
+                new_rows = dfc.iloc[stored:].reset_index(drop=True)
+            appends = bool(stored) or _extends_tail(dfc, trusted)
+            if appends and len(tails) + 1 < compact_threshold:
+                mode = "tail"
+        if mode == "tail":
+            match = _TAIL_RE.search(tails[-1].name) if tails else None
+            seq = int(match.group(1)) + 1 if match else 1
+            merged = new_rows
+            _write_processed_parquet(
+                new_rows,
+                out_dir / f"{symbol}.tail-{seq:06d}.parquet",
+                compression,
+                content_hash(new_rows),
+            )
         else:
-            merged = dfc
-
-        merged = (
-            merged.sort_values(["symbol", "date"])
-            .drop_duplicates(subset=["symbol", "date"], keep="last")
-            .reset_index(drop=True)
-        )
-
-        to_kwargs: dict = {"index": False}
-        if compression and compression.lower() != "none":  # pragma: no branch
-            to_kwargs["compression"] = compression
-        merged.to_parquet(path, **to_kwargs)
+            frames: list[pd.DataFrame] = []
+            for part in parts:
+                try:
+                    frames.append(pd.read_parquet(part))
+                except Exception:  # pragma: no cover
+                    pass
+            merged = clean_and_validate(pd.concat([*frames, dfc], ignore_index=True))
+            staged = _stage_processed_parquet(merged, path, compression, content_hash(merged))
+            # drop the tails before swapping in the new base: an interruption in between
+            # leaves the old base alone, never a merged base plus its tails (duplicates)
+            for tail in tails:
+                tail.unlink(missing_ok=True)
+            staged.replace(path)
     else:
+        mode = "full"
         path = out_dir / f"{symbol}.csv"
         if path.exists():
             try:
@@ -234,6 +595,7 @@ def save_processed(
             "symbol": symbol,
             "rows": int(len(dfc)),
             "rows_merged": int(len(merged)),
+            "mode": mode,
             "path": str(path),
         },
     )
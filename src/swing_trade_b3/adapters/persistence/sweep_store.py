@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pandas as pd
+
+LOG = logging.getLogger(__name__)
+
+
+class SweepStore:
+    """Append-only JSON Lines table of sweep results (one evaluation per line).
+
+    Each line holds ``key``, ``symbol``, ``data`` (data version), ``evaluator``, ``params``
+    and ``metrics`` as produced by ``services.sweep.run_sweep``. Rows are flushed per batch, so after an interruption the
+    file holds every finished batch; a partially written last line is ignored on read and
+    the evaluation is simply redone.
+    """
+
+    def __init__(self, path: str | Path = "data/sweeps/sweep.jsonl") -> None:
+        self.path = Path(path)
+
+    def _rows(self) -> Iterator[Dict[str, Any]]:
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return
+        for lineno, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                LOG.warning(
+                    "ignoring unreadable sweep row", extra={"path": str(self.path), "line": lineno}
+                )
+
+    def done(self) -> set[str]:
+        """Keys of the evaluations already stored."""
+        return {row["key"] for row in self._rows()}
+
+    def append(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = "".join(json.dumps(row, sort_keys=True) + "\n" for row in rows)
+        with self.path.open("a", encoding="utf-8") as fh:
+            if fh.tell() and not self._ends_with_newline():
+                fh.write("\n")  # close a truncated line left by an interruption
+            fh.write(payload)
+            fh.flush()
+
+    def _ends_with_newline(self) -> bool:
+        with self.path.open("rb") as fh:
+            fh.seek(-1, 2)
+            return fh.read(1) == b"\n"
+
+    def load(self) -> pd.DataFrame:
+        """Flat table: ``key``, ``symbol``, ``param.<name>`` and metric columns.
+
+        The last row wins for a repeated symbol, evaluator and parameter set, so results
+        computed on older data (another ``data`` version) are superseded by newer ones.
+        """
+        latest: Dict[str, Dict[str, Any]] = {}
+        for row in self._rows():
+            slot = json.dumps(
+                [row["symbol"], row.get("evaluator"), row["params"]], sort_keys=True, default=str
+            )
+            latest.pop(slot, None)  # re-insert: keep the order of the latest rows
+            latest[slot] = {
+                "key": row["key"],
+                "symbol": row["symbol"],
+                **{f"param.{k}": v for k, v in row["params"].items()},
+                **row["metrics"],
+            }
+        if not latest:
+            return pd.DataFrame(columns=["key", "symbol"])
+        return pd.DataFrame(list(latest.values()))
@@ -12,6 +12,11 @@ class DataProviderPort(Protocol):
     def fetch_daily(self, symbol: str, start: date, end: date) -> pd.DataFrame: ...
 
 
+@runtime_checkable
+class AsyncDataProviderPort(Protocol):
+    async def fetch_daily(self, symbol: str, start: date, end: date) -> pd.DataFrame: ...
+
+
 @runtime_checkable
 class RepositoryPort(Protocol):
     def save_raw(self, symbol: str, df: pd.DataFrame) -> None: ...
@@ -0,0 +1,233 @@
+"""Vectorized long-only backtest over the processed OHLCV schema (``STD_COLS``).
+
+Signals come from ``Strategy.generate`` as a frame with ``date``, ``symbol`` and ``action``
+(``"buy"``/``"sell"``, as in :class:`~swing_trade_b3.domain.ports.Signal`). A ``buy`` on a
+bar targets a full position and a ``sell`` targets flat; the target holds until the next
+signal of the symbol. Orders fill at the *next* bar's open (no look-ahead), so a bar's
+return is the overnight gap on the position carried in times the intraday move on the
+position held, less ``fee_rate`` per side traded.
+
+Every step (signal alignment, holding, fills, per-symbol returns, trades) runs as array
+operations over all symbols at once, over the segment layout of
+:mod:`swing_trade_b3.services.layout`. The portfolio gives each symbol of the universe an
+equal share of equity, rebalanced daily; the share of a symbol out of position is cash
+earning nothing (``allocation="active"`` instead splits equity across the symbols in
+position on each date, always fully invested).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.domain.ports import Strategy
+from swing_trade_b3.services.layout import Layout, prev_bar
+
+ACTIONS: Dict[str, float] = {"buy": 1.0, "sell": 0.0}
+ALLOCATIONS = ("universe", "active")
+TRADE_COLUMNS = ["symbol", "entry_date", "entry_price", "exit_date", "exit_price", "return", "open"]
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """Outputs of :func:`run_backtest`.
+
+    - ``positions``: one row per price bar (aligned to the input index) with ``date``,
+      ``symbol``, ``position`` (0/1 held during the bar), ``fill_price`` (open when the
+      position changed on the bar, else NaN) and ``return`` (the symbol's bar return);
+    - ``trades``: one row per round trip (chronological by entry) with ``symbol``, ``entry_date``, ``entry_price``,
+      ``exit_date``, ``exit_price``, ``return`` (net of fees) and ``open`` (still held at
+      the last bar, marked at its close);
+    - ``equity`` / ``drawdown``: portfolio curves indexed by date;
+    - ``metrics``: ``total_return``, ``max_drawdown``, ``hit_rate`` (share of closed trades
+      with a positive return; NaN without closed trades), ``trades`` and ``exposure``
+      (share of symbol-bars in position).
+    """
+
+    positions: pd.DataFrame
+    trades: pd.DataFrame
+    equity: pd.Series
+    drawdown: pd.Series
+    metrics: Dict[str, float]
+
+
+def _utc_ns(values: Any) -> pd.DatetimeIndex:
+    """UTC nanosecond dates (compact frames store seconds)."""
+    return pd.DatetimeIndex(pd.to_datetime(values, utc=True)).as_unit("ns")
+
+
+def _targets(
+    prices: pd.DataFrame, dates: pd.DatetimeIndex, signals: pd.DataFrame, layout: Layout
+) -> np.ndarray:
+    """Target position set by the signals on each (ordered) bar; NaN where none."""
+    target = np.full(len(prices), np.nan)
+    if signals.empty:
+        return target
+    actions = signals["action"].map(ACTIONS)
+    if actions.isna().any():
+        unknown = sorted(set(signals.loc[actions.isna(), "action"].astype(str)))
+        raise ValueError(f"unknown signal action(s): {unknown}")
+    sig = pd.DataFrame(
+        {
+            "symbol": np.asarray(signals["symbol"], dtype=object),
+            "date": _utc_ns(signals["date"]),
+            "target": actions.to_numpy(dtype="float64"),
+        }
+    ).drop_duplicates(["symbol", "date"], keep="last")
+    bars = pd.MultiIndex.from_arrays([np.asarray(prices["symbol"], dtype=object), dates])
+    rows = bars.get_indexer(pd.MultiIndex.from_arrays([sig["symbol"], sig["date"]]))
+    hit = rows >= 0  # signals on dates without a bar are ignored
+    rows = rows[hit]
+    if layout.order is not None:
+        inverse = np.empty_like(layout.order)
+        inverse[layout.order] = np.arange(len(layout.order))
+        rows = inverse[rows]
+    target[rows] = sig["target"].to_numpy()[hit]
+    return target
+
+
+def _hold(target: np.ndarray, layout: Layout) -> np.ndarray:
+    """Forward-fill targets within each symbol (flat before its first signal)."""
+    rows = np.arange(len(target))
+    last = np.maximum.accumulate(np.where(np.isnan(target), -1, rows))
+    same_symbol = last >= layout.first[layout.run]
+    return np.where(same_symbol, target[np.maximum(last, 0)], 0.0)
+
+
+def _trades(
+    layout: Layout,
+    pos: np.ndarray,
+    prev_pos: np.ndarray,
+    gross: np.ndarray,
+    arrays: Dict[str, Any],
+) -> pd.DataFrame:
+    n = len(pos)
+    entries = np.flatnonzero((pos > 0) & (prev_pos == 0))
+    last = np.append(layout.first[1:] - 1, n - 1)
+    # exit bars (flat after holding) and last bars still held; entries and ends alternate
+    ends = np.union1d(np.flatnonzero((pos == 0) & (prev_pos > 0)), last[pos[last] > 0])
+    log_growth = np.zeros(n + 1)
+    with np.errstate(divide="ignore"):
+        np.cumsum(np.log(gross), out=log_growth[1:])
+    still_open = pos[ends] > 0
+    dates = arrays["date"]
+    columns = [
+        arrays["symbol"][entries],
+        dates[entries],
+        arrays["open"][entries],
+        dates[ends],
+        np.where(still_open, arrays["close"][ends], arrays["open"][ends]),
+        np.expm1(log_growth[ends + 1] - log_growth[entries]),
+        still_open,
+    ]
+    trades = pd.DataFrame(dict(zip(TRADE_COLUMNS, columns)))
+    return trades.sort_values(["entry_date", "symbol"], kind="stable", ignore_index=True)
+
+
+def _empty_result(prices: pd.DataFrame) -> BacktestResult:
+    dates = pd.DatetimeIndex([], dtype="datetime64[ns, UTC]", name="date")
+    positions = prices[["date", "symbol"]].assign(position=0.0, fill_price=np.nan)
+    return BacktestResult(
+        positions=positions.assign(**{"return": 0.0}),
+        trades=pd.DataFrame(columns=TRADE_COLUMNS),
+        equity=pd.Series([], index=dates, name="equity", dtype="float64"),
+        drawdown=pd.Series([], index=dates, name="drawdown", dtype="float64"),
+        metrics={
+            "total_return": 0.0,
+            "max_drawdown": 0.0,
+            "hit_rate": float("nan"),
+            "trades": 0,
+            "exposure": 0.0,
+        },
+    )
+
+
+def run_backtest(
+    prices: pd.DataFrame,
+    signals: pd.DataFrame,
+    *,
+    fee_rate: float = 0.0,
+    initial_capital: float = 1.0,
+    allocation: str = "universe",
+) -> BacktestResult:
+    """Backtest ``signals`` against ``prices`` for all symbols at once.
+
+    ``prices`` is a long-format processed frame (e.g. ``load_dataset`` or concatenated
+    ``load_processed`` frames; compact frames are accepted) with unique ``(symbol, date)``.
+    ``signals`` needs ``date``, ``symbol`` and ``action`` columns; signals on dates without
+    a bar of the symbol are ignored and, for repeated ``(symbol, date)``, the last wins.
+    ``fee_rate`` is charged on each fill (entry and exit) as a fraction of the traded value.
+    ``allocation``: ``"universe"`` (each symbol of ``prices`` gets ``1 / n`` of equity, idle
+    shares held as cash at 0%) or ``"active"`` (equity split across the symbols in position
+    on each date). Raises ``ValueError`` for actions other than ``buy``/``sell`` and for an
+    unknown ``allocation``.
+    """
+    if allocation not in ALLOCATIONS:
+        raise ValueError(f"allocation must be one of {ALLOCATIONS}, got {allocation!r}")
+    if prices.empty:
+        return _empty_result(prices)
+    layout = Layout.of(prices)
+    dates = _utc_ns(prices["date"])
+    open_, close = layout.column(prices, "open"), layout.column(prices, "close")
+    pos = prev_bar(_hold(_targets(prices, dates, signals, layout), layout), layout)
+    pos[layout.first] = 0.0
+    prev_pos = prev_bar(pos, layout)
+    prev_pos[layout.first] = 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap = np.where(prev_pos > 0, open_ / prev_bar(close, layout), 1.0)
+        intraday = np.where(pos > 0, close / open_, 1.0)
+    traded = pos != prev_pos
+    gross = gap * intraday * np.where(traded, 1.0 - fee_rate, 1.0)
+    returns = gross - 1.0
+
+    if layout.order is not None:
+        dates = dates.take(layout.order)
+    ts = dates.asi8
+    days, day_of_row = np.unique(ts, return_inverse=True)
+    active = ((pos > 0) | (prev_pos > 0)).astype("float64")
+    day_sum = np.bincount(day_of_row, weights=returns * active, minlength=len(days))
+    if allocation == "universe":
+        day_returns = day_sum / len(layout.first)
+    else:
+        day_count = np.bincount(day_of_row, weights=active, minlength=len(days))
+        day_returns = np.divide(day_sum, day_count, out=np.zeros(len(days)), where=day_count > 0)
+    equity_values = initial_capital * np.cumprod(1.0 + day_returns)
+    drawdown_values = equity_values / np.maximum.accumulate(equity_values) - 1.0
+
+    symbols = np.asarray(prices["symbol"], dtype=object)
+    arrays: Dict[str, Any] = {
+        "symbol": symbols if layout.order is None else symbols.take(layout.order),
+        "date": dates,
+        "open": open_,
+        "close": close,
+    }
+    trades = _trades(layout, pos, prev_pos, gross, arrays)
+    closed = trades.loc[~trades["open"], "return"]
+    index = pd.DatetimeIndex(days.view("datetime64[ns]"), name="date").tz_localize("UTC")
+    equity = pd.Series(equity_values, index=index, name="equity")
+    drawdown = pd.Series(drawdown_values, index=index, name="drawdown")
+    positions = pd.DataFrame(
+        {
+            "date": prices["date"],
+            "symbol": prices["symbol"],
+            "position": layout.series(pos, "position"),
+            "fill_price": layout.series(np.where(traded, open_, np.nan), "fill_price"),
+            "return": layout.series(returns, "return"),
+        }
+    )
+    metrics = {
+        "total_return": float(equity_values[-1] / initial_capital - 1.0),
+        "max_drawdown": float(drawdown_values.min()),
+        "hit_rate": float((closed > 0).mean()) if len(closed) else float("nan"),
+        "trades": len(trades),
+        "exposure": float(pos.mean()),
+    }
+    return BacktestResult(positions, trades, equity, drawdown, metrics)
+
+
+def backtest_strategy(strategy: Strategy, prices: pd.DataFrame, **kwargs: Any) -> BacktestResult:
+    """``run_backtest(prices, strategy.generate(prices), **kwargs)``."""
+    return run_backtest(prices, strategy.generate(prices), **kwargs)
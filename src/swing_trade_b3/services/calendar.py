@@ -0,0 +1,138 @@
+"""B3 trading calendar: holiday tables and vectorized session lookups.
+
+Sessions are weekdays that are not B3 holidays. Holidays are generated by rule for
+``FIRST_YEAR..LAST_YEAR`` once at import and held in a ``numpy.busdaycalendar``, so every
+lookup is a single vectorized ``numpy.busday_*`` call. Dates outside that span fall back to
+plain weekdays.
+
+Every function accepts a scalar (``date``, ``datetime``, ``pd.Timestamp``, ISO string) or an
+array-like of them (``Series``, ``DatetimeIndex``, ``ndarray``). Scalars return scalars
+(``date``/``int``/``bool``); array-likes return ``numpy`` arrays (``datetime64[D]`` for
+dates). Timezone-aware values use their own wall-clock date.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+FIRST_YEAR = 1990
+LAST_YEAR = 2100
+
+# Fixed-date closures: national holidays plus B3's Christmas Eve (the last weekday of the year
+# is closed too, see ``b3_holidays``)
+_FIXED = ((1, 1), (4, 21), (5, 1), (9, 7), (10, 12), (11, 2), (11, 15), (12, 24), (12, 25))
+# Sao Paulo holidays (city anniversary, 1932 revolution, Black Consciousness) closed B3 until
+# 2021; Nov 20 is a national holiday again from 2024
+_SAO_PAULO = ((1, 25), (7, 9), (11, 20))
+_SAO_PAULO_UNTIL = 2021
+_NATIONAL_NOV_20_FROM = 2024
+# Carnival Monday/Tuesday, Good Friday and Corpus Christi, in days from Easter Sunday
+_EASTER_OFFSETS = (-48, -47, -2, 60)
+
+
+def easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    ell = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * ell) // 451
+    month, day = divmod(h + ell - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def b3_holidays(year: int) -> list[date]:
+    """Weekday and weekend dates B3 is closed in ``year``, sorted."""
+    days = {date(year, m, d) for m, d in _FIXED}
+    if year <= _SAO_PAULO_UNTIL:
+        days.update(date(year, m, d) for m, d in _SAO_PAULO)
+    if year >= _NATIONAL_NOV_20_FROM:
+        days.add(date(year, 11, 20))
+    sunday = easter(year)
+    days.update(sunday + timedelta(days=off) for off in _EASTER_OFFSETS)
+    last = date(year, 12, 31)
+    while last.weekday() >= 5:
+        last -= timedelta(days=1)
+    days.add(last)
+    return sorted(days)
+
+
+HOLIDAYS: np.ndarray = np.array(
+    [d for y in range(FIRST_YEAR, LAST_YEAR + 1) for d in b3_holidays(y)], dtype="datetime64[D]"
+)
+CALENDAR = np.busdaycalendar(weekmask="1111100", holidays=HOLIDAYS)
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+def _is_scalar(value: Any) -> bool:
+    return bool(np.ndim(value) == 0)
+
+
+def _as_days(value: Any) -> Any:
+    """``datetime64[D]`` scalar or array of the calendar dates in ``value``."""
+    if _is_scalar(value):
+        return np.datetime64(pd.Timestamp(value).date(), "D")
+    idx = pd.DatetimeIndex(pd.to_datetime(value))
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    return idx.to_numpy(dtype="datetime64[D]")
+
+
+def _out(result: Any, scalar: bool) -> Any:
+    """Plain Python scalar (``date``/``int``/``bool``) or ``numpy`` array."""
+    if not scalar:
+        return np.asarray(result)
+    value = np.asarray(result)[()]
+    return value.astype(date) if isinstance(value, np.datetime64) else value.item()
+
+
+def is_session(dates: Any) -> Any:
+    """Whether each date is a B3 session."""
+    return _out(np.is_busday(_as_days(dates), busdaycal=CALENDAR), _is_scalar(dates))
+
+
+def next_session(dates: Any) -> Any:
+    """First session strictly after each date."""
+    days = _as_days(dates)
+    return _out(np.busday_offset(days, 1, roll="backward", busdaycal=CALENDAR), _is_scalar(dates))
+
+
+def previous_session(dates: Any) -> Any:
+    """Last session strictly before each date."""
+    days = _as_days(dates)
+    return _out(np.busday_offset(days, -1, roll="forward", busdaycal=CALENDAR), _is_scalar(dates))
+
+
+def session_count(start: Any, end: Any) -> Any:
+    """Number of sessions in ``[start, end]`` (both inclusive; 0 when ``end < start``)."""
+    lo, hi = _as_days(start), _as_days(end)
+    count = np.maximum(np.busday_count(lo, hi + _ONE_DAY, busdaycal=CALENDAR), 0)
+    return _out(count, _is_scalar(start) and _is_scalar(end))
+
+
+def sessions(start: Any, end: Any) -> pd.DatetimeIndex:
+    """Sessions in ``[start, end]`` as UTC midnights (the bar ``date`` convention)."""
+    lo, hi = _as_days(start), _as_days(end)
+    days = np.arange(lo, hi + _ONE_DAY, dtype="datetime64[D]")
+    days = days[np.is_busday(days, busdaycal=CALENDAR)]
+    return pd.DatetimeIndex(days.astype("datetime64[ns]"), name="date").tz_localize("UTC")
+
+
+def missing_sessions(dates: Any, start: Any = None, end: Any = None) -> pd.DatetimeIndex:
+    """Sessions in ``[start, end]`` (default: first..last of ``dates``) with no date in ``dates``.
+
+    Data gaps, as opposed to holidays and weekends, which are never reported.
+    """
+    have = np.unique(_as_days(dates))
+    if not len(have) and (start is None or end is None):
+        return pd.DatetimeIndex([], dtype="datetime64[ns, UTC]", name="date")
+    expected = sessions(have[0] if start is None else start, have[-1] if end is None else end)
+    present = np.isin(expected.tz_localize(None).to_numpy(dtype="datetime64[D]"), have)
+    return expected[~present]
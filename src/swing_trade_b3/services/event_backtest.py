@@ -0,0 +1,358 @@
+"""Event-driven backtest for path-dependent strategies (stops, take-profits, sizing).
+
+Bars of the processed schema are replayed in ``(date, symbol)`` order and handed one at a
+time to a :class:`BarStrategy`, which trades through a :class:`SimulatedBroker`. The broker
+implements :class:`~swing_trade_b3.domain.ports.OrderExecutorPort` (``place_order``), so
+the same strategy code can later run against a paper-trading executor.
+
+Per-bar overhead is kept low:
+
+- the price columns are converted to Python lists once and the :class:`Bar` handed to the
+  strategy is a single ``slots`` record updated in place (do not keep references to it);
+- orders (and their fills) live in a preallocated NumPy structured array (``ORDER_DTYPE``,
+  grown by doubling), positions in ``slots`` records indexed by symbol code;
+- working orders are kept per symbol, so a bar without orders costs no order-book work.
+
+Fills: orders placed on a bar are eligible from the symbol's *next* bar. Market orders fill
+at its open; stop orders trigger when the bar trades through the stop and fill at the
+stop (or the open, on a gap past it); limit orders fill at the limit (or a better open).
+``fee_rate`` is charged on each fill's traded value. Sells beyond the position open a
+short. Two working orders of a symbol can be linked one-cancels-other (``oco``): when one
+fills, the other is cancelled before the rest of the bar is matched (e.g. the stop and the
+take-profit of a bracket on a bar wide enough to reach both).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol
+
+import numpy as np
+import pandas as pd
+
+SIDES: Dict[str, int] = {"buy": 1, "sell": -1}
+MARKET, STOP, LIMIT = 0, 1, 2
+WORKING, FILLED, CANCELLED = 0, 1, 2
+ORDER_DTYPE = np.dtype(
+    [
+        ("symbol", "i4"),  # symbol code
+        ("side", "i1"),  # +1 buy, -1 sell
+        ("kind", "i1"),  # MARKET / STOP / LIMIT
+        ("status", "i1"),  # WORKING / FILLED / CANCELLED
+        ("qty", "i8"),
+        ("price", "f8"),  # stop or limit price (NaN for market)
+        ("placed", "i8"),  # bar time (ns since epoch, UTC) when placed
+        ("filled", "i8"),  # bar time of the fill (0 while not filled)
+        ("fill_price", "f8"),
+        ("fee", "f8"),
+        ("closed", "i8"),  # quantity of an existing position the fill closed
+        ("pnl", "f8"),  # P&L realized on the closed quantity, net of the fill's fee
+    ]
+)
+_KINDS = np.array(["market", "stop", "limit"], dtype=object)
+_STATUSES = np.array(["working", "filled", "cancelled"], dtype=object)
+
+
+@dataclass(slots=True)
+class Bar:
+    """Current bar (reused between calls; copy the fields you need to keep)."""
+
+    symbol: str = ""
+    time: int = 0  # ns since epoch, UTC
+    open: float = math.nan
+    high: float = math.nan
+    low: float = math.nan
+    close: float = math.nan
+    volume: int = 0
+
+    @property
+    def date(self) -> pd.Timestamp:
+        return pd.Timestamp(self.time, tz="UTC")
+
+
+@dataclass(slots=True)
+class Position:
+    """Signed quantity, average entry price and realized P&L of one symbol."""
+
+    qty: int = 0
+    avg_price: float = 0.0
+    realized: float = 0.0
+
+
+class BarStrategy(Protocol):
+    def on_bar(self, bar: Bar, broker: SimulatedBroker) -> None: ...
+
+
+class SimulatedBroker:
+    """Order book, positions and cash of a simulation (an ``OrderExecutorPort``)."""
+
+    def __init__(
+        self,
+        symbols: List[str],
+        *,
+        cash: float = 100_000.0,
+        fee_rate: float = 0.0,
+        capacity: int = 1024,
+    ) -> None:
+        self.symbols = list(symbols)
+        self.codes = {sym: code for code, sym in enumerate(self.symbols)}
+        self.cash = float(cash)
+        self.fee_rate = fee_rate
+        self.orders = np.zeros(max(capacity, 1), dtype=ORDER_DTYPE)
+        self.count = 0
+        self.positions = [Position() for _ in self.symbols]
+        self.marks = [math.nan] * len(self.symbols)  # last price each position is valued at
+        self.market_value = 0.0
+        self.now = 0
+        self._working: List[List[int]] = [[] for _ in self.symbols]
+        self._oco: Dict[int, int] = {}  # order index -> its one-cancels-other sibling
+
+    @property
+    def equity(self) -> float:
+        return self.cash + self.market_value
+
+    def position(self, symbol: str) -> Position:
+        return self.positions[self.codes[symbol]]
+
+    def place_order(
+        self,
+        symbol: str,
+        qty: int,
+        side: str,
+        *,
+        stop: Optional[float] = None,
+        limit: Optional[float] = None,
+        oco: Optional[str] = None,
+    ) -> str:
+        """Queue an order (market unless ``stop`` or ``limit`` is given); returns its id.
+
+        ``oco``: id of a working order of the same symbol to link one-cancels-other with.
+        """
+        code = self.codes.get(symbol)
+        if code is None:
+            raise ValueError(f"unknown symbol: {symbol}")
+        if side not in SIDES:
+            raise ValueError(f"side must be 'buy' or 'sell', got {side!r}")
+        if qty <= 0:
+            raise ValueError("qty must be > 0")
+        if stop is not None and limit is not None:
+            raise ValueError("use either stop or limit, not both")
+        kind, price = MARKET, math.nan
+        if stop is not None:
+            kind, price = STOP, stop
+        elif limit is not None:
+            kind, price = LIMIT, limit
+        sibling = None
+        if oco is not None:
+            sibling = int(oco)
+            if (
+                not 0 <= sibling < self.count
+                or self.orders["status"][sibling] != WORKING
+                or self.orders["symbol"][sibling] != code
+                or sibling in self._oco
+            ):
+                raise ValueError(f"oco must be an unlinked working order of {symbol}")
+        if self.count == len(self.orders):
+            self.orders = np.resize(self.orders, 2 * len(self.orders))
+        idx = self.count
+        self.orders[idx] = (code, SIDES[side], kind, WORKING, qty, price, self.now, 0, 0, 0, 0, 0)
+        self.count += 1
+        self._working[code].append(idx)
+        if sibling is not None:
+            self._oco[idx], self._oco[sibling] = sibling, idx
+        return str(idx)
+
+    def cancel_order(self, order_id: str) -> bool:
+        """Cancel a working order; ``False`` when it already filled or was cancelled."""
+        idx = int(order_id)
+        if not 0 <= idx < self.count or self.orders["status"][idx] != WORKING:
+            return False
+        self.orders["status"][idx] = CANCELLED
+        self._working[int(self.orders["symbol"][idx])].remove(idx)
+        sibling = self._oco.pop(idx, None)
+        if sibling is not None:  # the sibling stays working, unlinked
+            del self._oco[sibling]
+        return True
+
+    def _fill(self, idx: int, code: int, price: float) -> None:
+        # one read and one write of the whole record (field-wise access costs ~1us each)
+        sym, side, kind, _status, size, limit, placed, *_ = self.orders[idx].item()
+        qty = size * side
+        pos = self.positions[code]
+        fee = abs(qty) * price * self.fee_rate
+        pnl, closing = 0.0, 0
+        if pos.qty == 0 or (pos.qty > 0) == (qty > 0):
+            pos.avg_price = (pos.avg_price * pos.qty + price * qty) / (pos.qty + qty)
+        else:
+            closing = min(abs(qty), abs(pos.qty))
+            pnl = closing * (price - pos.avg_price) * (1 if pos.qty > 0 else -1)
+            pos.realized += pnl
+            if abs(qty) > abs(pos.qty):
+                pos.avg_price = price  # flipped through zero
+            elif abs(qty) == abs(pos.qty):
+                pos.avg_price = 0.0
+        pos.qty += qty
+        self.cash -= qty * price + fee
+        self.market_value += qty * self.marks[code]
+        self.orders[idx] = (
+            sym,
+            side,
+            kind,
+            FILLED,
+            size,
+            limit,
+            placed,
+            self.now,
+            price,
+            fee,
+            closing,
+            pnl - fee,
+        )
+
+    def _fill_price(self, idx: int, bar: Bar) -> float:
+        """Price the bar fills a working order at (NaN when it does not reach it)."""
+        _sym, side, kind, _status, _qty, trigger, placed, *_ = self.orders[idx].item()
+        if placed >= bar.time:  # placed on this bar's date: not eligible yet
+            return math.nan
+        if kind == MARKET:
+            return bar.open
+        price = float(trigger)
+        if (kind == STOP) == (side > 0):  # buy stop / sell limit: at or above
+            return max(bar.open, price) if bar.high >= price else math.nan
+        return min(bar.open, price) if bar.low <= price else math.nan  # sell stop / buy limit
+
+    def _match(self, code: int, bar: Bar) -> None:
+        """Fill the symbol's eligible working orders that the bar reaches, in order placed;
+        a fill cancels its one-cancels-other sibling."""
+        still: List[int] = []
+        cancelled: List[int] = []
+        for idx in self._working[code]:
+            if idx in cancelled:
+                continue
+            fill = self._fill_price(idx, bar)
+            if math.isnan(fill):
+                still.append(idx)
+                continue
+            self._fill(idx, code, fill)
+            sibling = self._oco.pop(idx, None)
+            if sibling is not None:
+                del self._oco[sibling]
+                self.orders["status"][sibling] = CANCELLED
+                cancelled.append(sibling)
+        self._working[code] = [i for i in still if i not in cancelled] if cancelled else still
+
+    def step(self, code: int, bar: Bar) -> None:
+        """Advance the book to ``bar``: mark at the open, fill orders, mark at the close."""
+        self.now = bar.time
+        pos = self.positions[code]
+        if pos.qty:
+            self.market_value += pos.qty * (bar.open - self.marks[code])
+        if self._working[code]:
+            self.marks[code] = bar.open  # fills are valued from the open
+            self._match(code, bar)
+        if pos.qty:
+            self.market_value += pos.qty * (bar.close - bar.open)
+        self.marks[code] = bar.close
+
+    def order_frame(self) -> pd.DataFrame:
+        """Orders placed so far (fills included) as a DataFrame."""
+        rec = self.orders[: self.count]
+        filled = rec["status"] == FILLED
+        return pd.DataFrame(
+            {
+                "order_id": np.arange(self.count).astype(str),
+                "symbol": np.asarray(self.symbols, dtype=object)[rec["symbol"]],
+                "side": np.where(rec["side"] > 0, "buy", "sell"),
+                "kind": _KINDS[rec["kind"]],
+                "status": _STATUSES[rec["status"]],
+                "qty": rec["qty"],
+                "price": rec["price"],
+                "placed": pd.to_datetime(rec["placed"], utc=True),
+                "filled": pd.DatetimeIndex(pd.to_datetime(rec["filled"], utc=True)).where(filled),
+                "fill_price": np.where(filled, rec["fill_price"], np.nan),
+                "fee": rec["fee"],
+                "closed": rec["closed"],
+                "pnl": rec["pnl"],
+            }
+        )
+
+
+@dataclass(frozen=True)
+class EventBacktestResult:
+    """Orders (with fills), final positions, daily equity/drawdown and summary metrics.
+
+    ``metrics``: ``total_return``, ``max_drawdown``, ``hit_rate`` (share of closing fills
+    with a positive P&L net of fees; NaN without closing fills), ``orders`` and ``fills``.
+    """
+
+    orders: pd.DataFrame
+    positions: pd.DataFrame
+    equity: pd.Series
+    drawdown: pd.Series
+    metrics: Dict[str, float]
+
+
+def run_event_backtest(
+    prices: pd.DataFrame,
+    strategy: BarStrategy,
+    *,
+    cash: float = 100_000.0,
+    fee_rate: float = 0.0,
+    capacity: int = 1024,
+) -> EventBacktestResult:
+    """Replay ``prices`` (processed long format, any order) bar by bar through ``strategy``.
+
+    For each bar the broker fills the symbol's eligible orders, marks positions to the
+    close, then calls ``strategy.on_bar(bar, broker)``; equity is sampled after the last
+    bar of each date.
+    """
+    codes, uniques = pd.factorize(prices["symbol"], sort=True)
+    broker = SimulatedBroker(
+        [str(s) for s in uniques], cash=cash, fee_rate=fee_rate, capacity=capacity
+    )
+    ts = pd.DatetimeIndex(pd.to_datetime(prices["date"], utc=True)).as_unit("ns").asi8
+    order = np.lexsort((codes, ts))
+    ts = ts[order]
+    last_of_day = np.append(ts[1:] != ts[:-1], True) if len(ts) else np.zeros(0, dtype=bool)
+    equity = np.empty(int(last_of_day.sum()))
+    columns = [
+        np.asarray(prices[c], dtype="float64")[order].tolist()
+        for c in ("open", "high", "low", "close")
+    ]
+    volume = np.asarray(prices["volume"], dtype="int64")[order].tolist()
+    rows = zip(codes[order].tolist(), ts.tolist(), *columns, volume, last_of_day.tolist())
+    bar, names, day = Bar(), broker.symbols, 0
+    for code, t, o, h, lo, c, v, closes_day in rows:
+        bar.symbol, bar.time, bar.volume = names[code], t, v
+        bar.open, bar.high, bar.low, bar.close = o, h, lo, c
+        broker.step(code, bar)
+        strategy.on_bar(bar, broker)
+        if closes_day:
+            equity[day] = broker.equity
+            day += 1
+
+    index = pd.DatetimeIndex(np.unique(ts).view("datetime64[ns]"), name="date")
+    index = index.tz_localize("UTC")
+    curve = pd.Series(equity, index=index, name="equity")
+    drawdown = (curve / curve.cummax() - 1.0).rename("drawdown")
+    orders = broker.order_frame()
+    fills = orders[orders["status"] == "filled"]
+    closing = fills[fills["closed"] > 0]
+    positions = pd.DataFrame(
+        {
+            "symbol": broker.symbols,
+            "qty": [p.qty for p in broker.positions],
+            "avg_price": [p.avg_price for p in broker.positions],
+            "realized": [p.realized for p in broker.positions],
+            "mark": broker.marks,
+        }
+    )
+    metrics = {
+        "total_return": broker.equity / cash - 1.0,
+        "max_drawdown": float(drawdown.min()) if len(drawdown) else 0.0,
+        "hit_rate": float((closing["pnl"] > 0).mean()) if len(closing) else math.nan,
+        "orders": len(orders),
+        "fills": len(fills),
+    }
+    return EventBacktestResult(orders, positions, curve, drawdown, metrics)
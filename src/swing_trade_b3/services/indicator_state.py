@@ -0,0 +1,199 @@
+"""Incremental (streaming) indicator state for daily updates.
+
+Each state object folds one bar at a time in O(1) and reproduces the batch values of
+:mod:`swing_trade_b3.services.indicators` (same seeding and warm-up rules), so a daily
+update only touches the new bars instead of the whole history. States serialize to plain
+dicts (JSON-friendly) via ``to_dict``/``from_dict``.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+STATE_VERSION = 1
+STREAMING_COLUMNS = ["rsi", "macd", "macd_signal", "macd_hist", "atr"]
+
+
+@dataclass
+class EmaState:
+    """EMA with ``alpha = 2 / (span + 1)``, seeded with the first value."""
+
+    span: int
+    value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += 2.0 / (self.span + 1) * (x - self.value)
+        return self.value
+
+
+@dataclass
+class RsiState:
+    """Wilder RSI: smoothed gains/losses seeded at the first change; NaN for ``period`` bars."""
+
+    period: int = 14
+    bars: int = 0
+    prev_close: Optional[float] = None
+    avg_gain: Optional[float] = None
+    avg_loss: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        if self.prev_close is not None:
+            gain, loss = max(close - self.prev_close, 0.0), max(self.prev_close - close, 0.0)
+            if self.avg_gain is None or self.avg_loss is None:
+                self.avg_gain, self.avg_loss = gain, loss
+            else:
+                self.avg_gain += (gain - self.avg_gain) / self.period
+                self.avg_loss += (loss - self.avg_loss) / self.period
+        self.prev_close = close
+        self.bars += 1
+        return self.current()
+
+    def current(self) -> float:
+        if self.bars <= self.period or self.avg_gain is None or self.avg_loss is None:
+            return math.nan
+        total = self.avg_gain + self.avg_loss
+        return 100.0 * self.avg_gain / total if total > 0 else 50.0
+
+
+@dataclass
+class MacdState:
+    """MACD line, signal and histogram from three chained EMAs."""
+
+    fast: EmaState = field(default_factory=lambda: EmaState(12))
+    slow: EmaState = field(default_factory=lambda: EmaState(26))
+    signal: EmaState = field(default_factory=lambda: EmaState(9))
+
+    def update(self, close: float) -> tuple[float, float, float]:
+        line = self.fast.update(close) - self.slow.update(close)
+        self.signal.update(line)
+        return self.current()
+
+    def current(self) -> tuple[float, float, float]:
+        if self.fast.value is None or self.slow.value is None or self.signal.value is None:
+            return math.nan, math.nan, math.nan
+        line = self.fast.value - self.slow.value
+        return line, self.signal.value, line - self.signal.value
+
+
+@dataclass
+class AtrState:
+    """Wilder ATR seeded with the first true range; NaN for the first ``period - 1`` bars."""
+
+    period: int = 14
+    bars: int = 0
+    prev_close: Optional[float] = None
+    value: Optional[float] = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        if self.value is None:
+            self.value = true_range
+        else:
+            self.value += (true_range - self.value) / self.period
+        self.prev_close = close
+        self.bars += 1
+        return self.current()
+
+    def current(self) -> float:
+        if self.value is None or self.bars < self.period:
+            return math.nan
+        return self.value
+
+
+@dataclass
+class IndicatorState:
+    """RSI, MACD and ATR state of one symbol plus the last bar folded into it."""
+
+    rsi: RsiState = field(default_factory=RsiState)
+    macd: MacdState = field(default_factory=MacdState)
+    atr: AtrState = field(default_factory=AtrState)
+    last_date: Optional[pd.Timestamp] = None
+    last_close: Optional[float] = None
+    # opaque version of the history folded so far (the processed-parts fingerprint)
+    history_fingerprint: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        rsi_period: int = 14,
+        macd_spans: tuple[int, int, int] = (12, 26, 9),
+        atr_period: int = 14,
+    ) -> IndicatorState:
+        fast, slow, signal = macd_spans
+        return cls(
+            rsi=RsiState(rsi_period),
+            macd=MacdState(EmaState(fast), EmaState(slow), EmaState(signal)),
+            atr=AtrState(atr_period),
+        )
+
+    def params(self) -> Dict[str, Any]:
+        return {
+            "rsi_period": self.rsi.period,
+            "macd_spans": (self.macd.fast.span, self.macd.slow.span, self.macd.signal.span),
+            "atr_period": self.atr.period,
+        }
+
+    def update(self, date: pd.Timestamp, high: float, low: float, close: float) -> list[float]:
+        """Fold one bar (newer than ``last_date``); returns ``STREAMING_COLUMNS`` values."""
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(f"bar {date} is not newer than {self.last_date}")
+        rsi = self.rsi.update(close)
+        line, sig, hist = self.macd.update(close)
+        atr = self.atr.update(high, low, close)
+        self.last_date, self.last_close = date, close
+        return [rsi, line, sig, hist, atr]
+
+    def latest(self) -> Dict[str, float]:
+        """Indicator values at ``last_date`` (NaN while warming up), keyed by column."""
+        values = [self.rsi.current(), *self.macd.current(), self.atr.current()]
+        return dict(zip(STREAMING_COLUMNS, values))
+
+    def advance(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fold the bars of one symbol's frame dated after ``last_date`` (already-seen bars
+        are skipped) and return their indicator values, indexed like ``df``."""
+        dates = pd.to_datetime(df["date"], utc=True)
+        new = df[dates > self.last_date] if self.last_date is not None else df
+        rows = [
+            self.update(ts, h, lo, c)
+            for ts, h, lo, c in zip(
+                dates[new.index],
+                np.asarray(new["high"], dtype="float64").tolist(),
+                np.asarray(new["low"], dtype="float64").tolist(),
+                np.asarray(new["close"], dtype="float64").tolist(),
+            )
+        ]
+        return pd.DataFrame(rows, index=new.index, columns=STREAMING_COLUMNS, dtype="float64")
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = asdict(self)
+        payload["version"] = STATE_VERSION
+        payload["last_date"] = None if self.last_date is None else self.last_date.isoformat()
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> IndicatorState:
+        if payload.get("version") != STATE_VERSION:
+            raise ValueError(f"unsupported indicator state version: {payload.get('version')}")
+        macd = payload["macd"]
+        last_date = payload["last_date"]
+        return cls(
+            rsi=RsiState(**payload["rsi"]),
+            macd=MacdState(
+                EmaState(**macd["fast"]), EmaState(**macd["slow"]), EmaState(**macd["signal"])
+            ),
+            atr=AtrState(**payload["atr"]),
+            last_date=None if last_date is None else pd.Timestamp(last_date),
+            last_close=payload["last_close"],
+            history_fingerprint=payload.get("history_fingerprint"),
+        )
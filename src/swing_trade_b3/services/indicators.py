@@ -0,0 +1,180 @@
+"""Vectorized technical indicators over the processed OHLCV schema (``STD_COLS``).
+
+Every indicator is computed for all symbols of a long-format frame in one call, without
+per-bar Python loops:
+
+- exponential averages (EMA, Wilder smoothing) run as *one* recursive filter over the
+  concatenated series; the carry-over between symbols is removed analytically (see
+  :func:`_ema`);
+- rolling statistics run as one flat rolling window whose windows straddling two symbols
+  are masked out.
+
+Frames in the processed order (``symbol``, then ``date``) are used as-is; other orders are
+sorted internally and results come back aligned to the input index. Compact frames
+(float32 prices, categorical symbols) are accepted; outputs are float64. The first bars of
+each symbol that precede a full warm-up window are NaN.
+"""
+
+from __future__ import annotations
+
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.services.layout import Layout, prev_bar
+
+
+def _ema(x: np.ndarray, alpha: float, layout: Layout) -> np.ndarray:
+    """Per-symbol ``y[n] = (1 - alpha) * y[n-1] + alpha * x[n]``, seeded with the first bar.
+
+    Same values as pandas ``ewm(alpha=alpha, adjust=False)`` per symbol. One flat C-level
+    filter runs over the whole array with each symbol's first input scaled by ``1 / alpha``,
+    which makes every segment its true average plus the previous segment's last value
+    decayed by ``(1 - alpha) ** (pos + 1)``; that term is subtracted. The decay only
+    shrinks, so the correction is numerically stable.
+    """
+    if not len(x):
+        return x.copy()
+    scaled = x.copy()
+    scaled[layout.first[1:]] /= alpha
+    flat: np.ndarray = pd.Series(scaled).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    carry = np.zeros(len(layout.first))
+    carry[1:] = flat[layout.first[1:] - 1]
+    rows, decay = layout.decay(alpha)
+    flat[rows] -= carry[layout.run[rows]] * decay
+    return flat
+
+
+def _rolling(x: np.ndarray, layout: Layout, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Per-symbol rolling mean and population std (NaN until ``window`` bars exist).
+
+    Windows straddling two symbols are exactly the warm-up rows, which are masked. Each
+    symbol is scaled to its max first, so a previous symbol of very different magnitude
+    leaving the window does not leak rounding error into the running variance.
+    """
+    if not len(x):
+        return x.copy(), x.copy()
+    scale = np.maximum.reduceat(np.abs(x), layout.first)
+    scale[scale == 0] = 1.0
+    row_scale = scale[layout.run]
+    roll = pd.Series(x / row_scale).rolling(window)
+    mean = layout.warm_up(roll.mean().to_numpy() * row_scale, window - 1)
+    std = layout.warm_up(roll.std(ddof=0).to_numpy() * row_scale, window - 1)
+    return mean, std
+
+
+def _ema_values(close: np.ndarray, layout: Layout, span: int) -> np.ndarray:
+    return _ema(close, 2.0 / (span + 1), layout)
+
+
+def _rsi_values(close: np.ndarray, layout: Layout, period: int) -> np.ndarray:
+    delta = close - prev_bar(close, layout)
+    # averages start at the first price change: repeating it on the first bar seeds the
+    # filter with it and leaves the second bar's average unchanged
+    nxt = layout.first + 1
+    has_next = nxt < len(delta)
+    has_next[has_next] = layout.pos[nxt[has_next]] == 1
+    delta[layout.first] = 0.0
+    delta[layout.first[has_next]] = delta[nxt[has_next]]
+    gain = _ema(np.maximum(delta, 0.0), 1.0 / period, layout)
+    loss = _ema(np.maximum(-delta, 0.0), 1.0 / period, layout)
+    total = gain + loss
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = np.where(total > 0, 100.0 * gain / total, 50.0)
+    return layout.warm_up(rsi, period)
+
+
+def _macd_values(
+    close: np.ndarray, layout: Layout, fast: int, slow: int, signal: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    line = _ema_values(close, layout, fast) - _ema_values(close, layout, slow)
+    sig = _ema_values(line, layout, signal)
+    return line, sig, line - sig
+
+
+def _atr_values(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, layout: Layout, period: int
+) -> np.ndarray:
+    prev_close = prev_bar(close, layout)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return layout.warm_up(_ema(true_range, 1.0 / period, layout), period - 1)
+
+
+def ema(df: pd.DataFrame, span: int, column: str = "close") -> pd.Series:
+    """Per-symbol EMA of ``column`` (``alpha = 2 / (span + 1)``, seeded with the first bar)."""
+    layout = Layout.of(df)
+    return layout.series(_ema_values(layout.column(df, column), layout, span), f"ema_{span}")
+
+
+def rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    """Per-symbol Wilder RSI of ``close`` (0-100; 50 when prices did not move).
+
+    Wilder smoothing (``alpha = 1 / period``) of gains and losses, seeded at the first change;
+    NaN for the first ``period`` bars of each symbol.
+    """
+    layout = Layout.of(df)
+    return layout.series(_rsi_values(layout.column(df, "close"), layout, period), "rsi")
+
+
+def macd(df: pd.DataFrame, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    """Per-symbol MACD line (EMA fast - EMA slow), signal line and histogram."""
+    layout = Layout.of(df)
+    line, sig, hist = _macd_values(layout.column(df, "close"), layout, fast, slow, signal)
+    return pd.DataFrame(
+        {
+            "macd": layout.series(line, "macd"),
+            "macd_signal": layout.series(sig, "macd_signal"),
+            "macd_hist": layout.series(hist, "macd_hist"),
+        }
+    )
+
+
+def atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    """Per-symbol Average True Range (Wilder smoothing); NaN for the first ``period - 1`` bars."""
+    layout = Layout.of(df)
+    high, low, close = (layout.column(df, c) for c in ("high", "low", "close"))
+    return layout.series(_atr_values(high, low, close, layout, period), "atr")
+
+
+def bollinger(df: pd.DataFrame, window: int = 20, k: float = 2.0) -> pd.DataFrame:
+    """Per-symbol Bollinger Bands of ``close``: SMA ``window`` +/- ``k`` population stds."""
+    layout = Layout.of(df)
+    mid, std = _rolling(layout.column(df, "close"), layout, window)
+    return pd.DataFrame(
+        {
+            "bb_mid": layout.series(mid, "bb_mid"),
+            "bb_upper": layout.series(mid + k * std, "bb_upper"),
+            "bb_lower": layout.series(mid - k * std, "bb_lower"),
+        }
+    )
+
+
+def compute_indicators(
+    df: pd.DataFrame,
+    *,
+    rsi_period: int = 14,
+    macd_spans: tuple[int, int, int] = (12, 26, 9),
+    atr_period: int = 14,
+    bb_window: int = 20,
+    bb_k: float = 2.0,
+) -> pd.DataFrame:
+    """``df`` plus RSI, MACD, ATR and Bollinger columns, sharing one layout pass.
+
+    Added columns: ``rsi``, ``macd``, ``macd_signal``, ``macd_hist``, ``atr``, ``bb_mid``,
+    ``bb_upper``, ``bb_lower``.
+    """
+    layout = Layout.of(df)
+    high, low, close = (layout.column(df, c) for c in ("high", "low", "close"))
+    line, sig, hist = _macd_values(close, layout, *macd_spans)
+    mid, std = _rolling(close, layout, bb_window)
+    columns = {
+        "rsi": _rsi_values(close, layout, rsi_period),
+        "macd": line,
+        "macd_signal": sig,
+        "macd_hist": hist,
+        "atr": _atr_values(high, low, close, layout, atr_period),
+        "bb_mid": mid,
+        "bb_upper": mid + bb_k * std,
+        "bb_lower": mid - bb_k * std,
+    }
+    return df.assign(**{name: layout.series(v, name) for name, v in columns.items()})
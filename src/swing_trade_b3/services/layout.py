@@ -0,0 +1,92 @@
+"""Row layout of long-format frames: per-symbol segments in ``(symbol, date)`` order.
+
+Shared by the vectorized modules (``services.indicators``, ``services.backtest``) that run
+one flat NumPy computation over every symbol and need each symbol's segment boundaries.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def segment_starts(changed: np.ndarray) -> np.ndarray:
+    """First row of each run, given ``changed[i] = key[i + 1] != key[i]``."""
+    return np.flatnonzero(np.concatenate((np.ones(1, dtype=bool), changed)))
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Row order and per-symbol segments of a long-format frame."""
+
+    index: pd.Index
+    order: Optional[np.ndarray]  # permutation into (symbol, date) order; None if already so
+    first: np.ndarray  # row where each symbol's segment starts (ordered rows)
+    run: np.ndarray  # segment id of each ordered row
+    pos: np.ndarray  # 0-based position of each ordered row within its symbol
+    _decays: Dict[float, tuple[np.ndarray, np.ndarray]] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def of(cls, df: pd.DataFrame) -> Layout:
+        symbols = df["symbol"]
+        # categorical codes or a zero-copy object view; neighbours are compared, not hashed
+        keys = (
+            symbols.cat.codes.to_numpy()
+            if isinstance(symbols.dtype, pd.CategoricalDtype)
+            else np.asarray(symbols.array)
+        )
+        ts = pd.to_datetime(df["date"], utc=True).array.asi8
+        order: Optional[np.ndarray] = None
+        if not len(keys):
+            empty = np.zeros(0, dtype=np.intp)
+            return cls(df.index, None, empty, empty, empty)
+        changed = keys[1:] != keys[:-1]
+        first = segment_starts(changed)
+        grouped = len(pd.unique(keys[first])) == len(first)
+        if not (grouped and (changed | (ts[1:] > ts[:-1])).all()):
+            codes, _uniques = pd.factorize(symbols, sort=False)
+            order = np.lexsort((ts, codes))
+            codes = codes[order]
+            first = segment_starts(codes[1:] != codes[:-1])
+        starts = np.zeros(len(keys), dtype=np.intp)
+        starts[first[1:]] = 1
+        run = np.cumsum(starts)
+        return cls(df.index, order, first, run, np.arange(len(keys)) - first[run])
+
+    def column(self, df: pd.DataFrame, name: str) -> np.ndarray:
+        values: np.ndarray = np.asarray(df[name], dtype="float64")
+        return values if self.order is None else values.take(self.order)
+
+    def series(self, values: np.ndarray, name: str) -> pd.Series:
+        if self.order is not None:
+            out = np.empty_like(values)
+            out[self.order] = values
+            values = out
+        return pd.Series(values, index=self.index, name=name)
+
+    def warm_up(self, values: np.ndarray, bars: int) -> np.ndarray:
+        """NaN out the first ``bars`` rows of every symbol."""
+        return np.where(self.pos < bars, np.nan, values)
+
+    def decay(self, alpha: float) -> tuple[np.ndarray, np.ndarray]:
+        """Rows where ``(1 - alpha) ** (pos + 1)`` is still above 1e-20, and that factor.
+
+        Cached per alpha (RSI and ATR share Wilder's); deeper rows need no correction.
+        """
+        if alpha not in self._decays:
+            log_beta = np.log1p(-alpha)
+            depth = int(np.ceil(np.log(1e-20) / log_beta))
+            rows = np.flatnonzero(self.pos < depth)
+            self._decays[alpha] = rows, np.exp((self.pos[rows] + 1) * log_beta)
+        return self._decays[alpha]
+
+
+def prev_bar(x: np.ndarray, layout: Layout) -> np.ndarray:
+    """Previous bar of the same symbol (NaN on each symbol's first bar)."""
+    out = np.empty_like(x)
+    out[1:] = x[:-1]
+    out[layout.first] = np.nan
+    return out
@@ -0,0 +1,190 @@
+"""Dates × symbols price panel shared with worker processes through shared memory.
+
+A :class:`PricePanel` holds one float64 matrix per field (``open``, ``high``, ``low``,
+``close``, ``volume``; NaN where a symbol has no bar on a date), stored column-major so each
+symbol's history is one contiguous column. The parent builds it once from processed data
+and :meth:`PricePanel.publish` copies it into a single ``multiprocessing.shared_memory``
+segment; workers receive a small picklable :class:`PanelHandle` and :func:`attach_panel`
+maps the same pages without copying or unpickling any price data.
+
+The :class:`SharedPanel` returned by ``publish`` owns the segment: ``close()`` (or leaving
+its ``with`` block, or garbage collection/interpreter exit as a fallback) unlinks it.
+Workers should be processes started by the publisher *after* ``publish()`` (e.g. a
+``ProcessPoolExecutor`` created inside the ``with`` block): they inherit its resource
+tracker, so only the owner ever unlinks the segment. Processes started earlier have their
+own tracker, which would unlink it when they exit.
+"""
+
+from __future__ import annotations
+
+import weakref
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.services.signals import STD_COLS
+
+PANEL_FIELDS: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class PanelHandle:
+    """What a worker needs to attach a published panel (segment name and axes)."""
+
+    name: str
+    dates: np.ndarray  # int64 UTC nanoseconds
+    symbols: Tuple[str, ...]
+    fields: Tuple[str, ...]
+
+
+class PricePanel:
+    """One ``(dates, symbols)`` float64 matrix per field over a shared date axis."""
+
+    def __init__(
+        self,
+        dates: pd.DatetimeIndex,
+        symbols: Sequence[str],
+        fields: Sequence[str],
+        values: np.ndarray,
+        *,
+        buffer: Optional[shared_memory.SharedMemory] = None,
+    ) -> None:
+        # values: (fields, symbols, dates) C-order, so values[k].T is a column-major matrix
+        if values.shape != (len(fields), len(symbols), len(dates)):
+            raise ValueError("panel values do not match its axes")
+        self.dates = dates
+        self.symbols = list(symbols)
+        self.fields = tuple(fields)
+        self.values = values
+        self._column = {sym: j for j, sym in enumerate(self.symbols)}
+        self._buffer = buffer  # keeps an attached segment mapped while views exist
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fields: Sequence[str] = PANEL_FIELDS) -> PricePanel:
+        """Pivot a long-format processed frame (``STD_COLS``, unique ``(symbol, date)``)."""
+        ts = pd.DatetimeIndex(pd.to_datetime(df["date"], utc=True)).as_unit("ns").asi8
+        days, row = np.unique(ts, return_inverse=True)
+        col, symbols = pd.factorize(np.asarray(df["symbol"], dtype=object), sort=True)
+        values = np.full((len(fields), len(symbols), len(days)), np.nan)
+        for k, name in enumerate(fields):
+            values[k, col, row] = df[name].to_numpy(dtype="float64")
+        dates = pd.DatetimeIndex(days.view("datetime64[ns]"), name="date").tz_localize("UTC")
+        return cls(dates, [str(s) for s in symbols], fields, values)
+
+    @classmethod
+    def load(
+        cls,
+        symbols: Iterable[str],
+        loader: Callable[[str], pd.DataFrame],
+        fields: Sequence[str] = PANEL_FIELDS,
+    ) -> PricePanel:
+        """Panel of ``symbols`` read with ``loader`` (e.g. ``load_cached``); symbols without
+        data are left out."""
+        frames = [frame for frame in (loader(s) for s in symbols) if not frame.empty]
+        if not frames:
+            return cls.from_frame(pd.DataFrame(columns=STD_COLS), fields)
+        return cls.from_frame(pd.concat(frames, ignore_index=True), fields)
+
+    def field(self, name: str) -> pd.DataFrame:
+        """Wide ``dates × symbols`` frame of a field (a view, not a copy)."""
+        matrix = self.values[self.fields.index(name)].T
+        columns = pd.Index(self.symbols, name="symbol")
+        return pd.DataFrame(matrix, index=self.dates, columns=columns, copy=False)
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """Long-format processed frame of one symbol (its dates with a close); empty if the
+        symbol is not in the panel."""
+        j = self._column.get(symbol)
+        if j is None:
+            return pd.DataFrame(columns=STD_COLS)
+        columns = self.values[:, j, :]
+        present = ~np.isnan(columns[self.fields.index("close")])
+        data: Dict[str, object] = {
+            "date": self.dates[present],
+            "symbol": pd.array([symbol] * int(present.sum()), dtype="string"),
+        }
+        for k, name in enumerate(self.fields):
+            data[name] = columns[k][present]
+        df = pd.DataFrame(data)
+        if "volume" in df:
+            df["volume"] = df["volume"].astype("int64")
+        return df[[c for c in STD_COLS if c in df]].reset_index(drop=True)
+
+    def publish(self) -> SharedPanel:
+        """Copy the panel into a new shared-memory segment owned by the returned object."""
+        shm = shared_memory.SharedMemory(create=True, size=max(self.values.nbytes, 1))
+        try:
+            target = np.ndarray(self.values.shape, dtype=np.float64, buffer=shm.buf)
+            target[...] = self.values
+            del target  # no export may outlive the owner's close()
+        except BaseException:  # pragma: no cover - copy failures (e.g. out of memory)
+            _release(shm)
+            raise
+        handle = PanelHandle(shm.name, self.dates.asi8.copy(), tuple(self.symbols), self.fields)
+        return SharedPanel(handle, shm)
+
+
+def _release(shm: shared_memory.SharedMemory) -> None:
+    _ATTACHED.pop(shm.name, None)
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:  # pragma: no cover - already unlinked elsewhere
+        pass
+
+
+class SharedPanel:
+    """Owner of a published panel's segment; use as a context manager or call ``close()``."""
+
+    def __init__(self, handle: PanelHandle, shm: shared_memory.SharedMemory) -> None:
+        self.handle = handle
+        self._finalizer = weakref.finalize(self, _release, shm)
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        """Unmap and unlink the segment (idempotent). Attached views stay valid until their
+        processes drop them; new attaches fail."""
+        self._finalizer()
+
+    def __enter__(self) -> SharedPanel:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# Panels attached by this process, by segment name (one mapping per process)
+_ATTACHED: Dict[str, PricePanel] = {}
+
+
+def attach_panel(handle: PanelHandle) -> PricePanel:
+    """Map a published panel without copying (memoized per process)."""
+    panel = _ATTACHED.get(handle.name)
+    if panel is None:
+        shm = shared_memory.SharedMemory(name=handle.name)
+        shape = (len(handle.fields), len(handle.symbols), len(handle.dates))
+        values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        values.flags.writeable = False
+        dates = pd.DatetimeIndex(handle.dates.view("datetime64[ns]"), name="date")
+        panel = PricePanel(
+            dates.tz_localize("UTC"), handle.symbols, handle.fields, values, buffer=shm
+        )
+        _ATTACHED[handle.name] = panel
+    return panel
+
+
+@dataclass(frozen=True)
+class PanelLoader:
+    """Picklable ``symbol -> frame`` loader reading from a published panel (for
+    ``run_sweep`` and other process-pool callers)."""
+
+    handle: PanelHandle
+
+    def __call__(self, symbol: str) -> pd.DataFrame:
+        return attach_panel(self.handle).frame(symbol)
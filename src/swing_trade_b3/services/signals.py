@@ -1,8 +1,119 @@
 from __future__ import annotations
 
+import hashlib
+
+import numpy as np
 import pandas as pd
 
 STD_COLS = ["date", "symbol", "open", "high", "low", "close", "volume"]
+STD_DTYPES = {
+    "date": "datetime64[ns, UTC]",
+    "symbol": "string",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "int64",
+}
+_PRICE_COLS = ["open", "high", "low", "close"]
+# Bump when the processed contract (STD_COLS/STD_DTYPES or cleaning rules) changes
+SCHEMA_VERSION = 1
+# Opt-in in-memory representation for large screens; volume is int32 only when lossless
+COMPACT_DTYPES = {
+    "date": "datetime64[s, UTC]",
+    "symbol": "category",
+    "open": "float32",
+    "high": "float32",
+    "low": "float32",
+    "close": "float32",
+    "volume": "int32",
+}
+_FLOAT32_DIGITS = 7  # significant decimal digits a float32 round-trips
+
+
+def _numpy_kind(col: pd.Series) -> str:
+    """NumPy dtype kind of a column ('' for extension dtypes such as Int64/string)."""
+    return col.dtype.kind if isinstance(col.dtype, np.dtype) else ""
+
+
+def _widen_float32(values: np.ndarray) -> np.ndarray:
+    """float32 -> float64 recovering the decimal written (10.37f -> 10.37, not 10.3699999).
+
+    Rounds to the 7 significant digits a float32 can represent.
+    """
+    wide = values.astype("float64")
+    finite = np.isfinite(wide) & (wide != 0)
+    magnitude = np.floor(np.log10(np.abs(wide, where=finite, out=np.ones_like(wide))))
+    scale = 10.0 ** (_FLOAT32_DIGITS - 1 - magnitude)
+    return np.where(finite, np.round(wide * scale) / scale, wide)
+
+
+def _as_float(col: pd.Series) -> np.ndarray:
+    """float64 view of a column; unparseable/missing values become NaN."""
+    if col.dtype == np.float32:
+        return _widen_float32(np.asarray(col))
+    if _numpy_kind(col) in ("i", "u", "f"):
+        return np.asarray(col, dtype="float64")
+    return np.asarray(pd.to_numeric(col, errors="coerce"), dtype="float64")
+
+
+def _as_volume(col: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """int64 volume values plus their validity mask (present and non-negative)."""
+    if _numpy_kind(col) in ("i", "u"):
+        values = np.asarray(col, dtype="int64")
+        return values, values >= 0
+    as_float = _as_float(col)
+    valid = as_float >= 0  # NaN compares False
+    return np.where(valid, as_float, 0).astype("int64"), valid
+
+
+def _symbol_codes(col: pd.Series) -> tuple[np.ndarray, pd.Index]:
+    """Lexically ordered integer codes of the symbol column (-1 if missing) and their labels.
+
+    Hashes the raw values (cheaper than stringifying every row first) and only sorts the
+    small set of distinct symbols.
+    """
+    codes, uniques = pd.factorize(col)
+    labels = pd.Index(uniques).astype("string")
+    if not labels.is_unique:  # distinct raw values that stringify alike (e.g. 1 and "1")
+        codes, uniques = pd.factorize(col.astype("string"))
+        labels = pd.Index(uniques)
+    order = labels.argsort()
+    rank = np.empty(len(order), dtype=np.intp)
+    rank[order] = np.arange(len(order))
+    return np.where(codes >= 0, rank[codes], -1), labels[order]
+
+
+def is_clean(df: pd.DataFrame) -> bool:
+    """Whether ``df`` already satisfies the processed schema (cheap, copy-free checks).
+
+    Exact columns/dtypes, no nulls or negatives, and (symbol, date) strictly increasing.
+    """
+    if list(df.columns) != STD_COLS:
+        return False
+    if any(str(df[c].dtype) != dtype for c, dtype in STD_DTYPES.items()):
+        return False
+    if len(df) == 0:
+        return True
+    symbols = df["symbol"].array
+    if symbols.isna().any() or df["date"].isna().any():
+        return False
+    for col in _PRICE_COLS:
+        if not (df[col].to_numpy() >= 0).all():  # NaN compares False
+            return False
+    if (df["volume"].to_numpy() < 0).any():
+        return False
+    sym = symbols.to_numpy(dtype=object)
+    ts = df["date"].array.asi8
+    same = sym[1:] == sym[:-1]
+    ordered = (sym[1:] > sym[:-1]) | (same & (ts[1:] > ts[:-1]))
+    return bool(ordered.all())
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """Order-sensitive digest of the STD_COLS content of a clean frame."""
+    rows = pd.util.hash_pandas_object(df[STD_COLS], index=False).to_numpy()
+    return hashlib.blake2b(rows.tobytes(), digest_size=16).hexdigest()
 
 
 def clean_and_validate(df_raw: pd.DataFrame) -> pd.DataFrame:
@@ -10,49 +121,93 @@ def clean_and_validate(df_raw: pd.DataFrame) -> pd.DataFrame:
 
     Guarantees columns: date (UTC), symbol (string), open/high/low/close (float64), volume (int64),
     without nulls/negatives, deduped by (symbol,date), sorted by symbol,date (date strictly increasing per symbol).
+
+    Single pass: columns are coerced once to NumPy arrays, one validity mask is built and the
+    surviving rows are sorted/deduped with one stable lexsort and gathered with one ``take``.
+    Inputs that already satisfy the schema (see :func:`is_clean`) skip the kernel and are
+    returned as a new frame with a fresh RangeIndex.
+    On duplicated (symbol, date) the last occurrence in input order wins.
     """
     if df_raw.empty:
-        return pd.DataFrame(columns=STD_COLS).astype(
-            {
-                "date": "datetime64[ns, UTC]",
-                "symbol": "string",
-                "open": "float64",
-                "high": "float64",
-                "low": "float64",
-                "close": "float64",
-                "volume": "int64",
-            }
-        )
-
-    df = df_raw.copy()
+        return pd.DataFrame(columns=STD_COLS).astype(STD_DTYPES)
 
     # Ensure all required columns exist
     for col in STD_COLS:
-        if col not in df.columns:
+        if col not in df_raw.columns:
             raise ValueError(f"missing required column: {col}")
 
-    # Coerce types
-    df["date"] = pd.to_datetime(df["date"], utc=True)
-    df["symbol"] = df["symbol"].astype("string")
-    for col in ["open", "high", "low", "close"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
-    df["volume"] = pd.to_numeric(df["volume"], errors="coerce").astype("Int64")
+    if is_clean(df_raw):
+        return df_raw.reset_index(drop=True)  # a new frame, like the slow path
+
+    # Coerce types (one array per column, no intermediate frames)
+    dates = pd.to_datetime(df_raw["date"], utc=True).dt.as_unit("ns")
+    ts = dates.array.asi8
+    codes, symbols = _symbol_codes(df_raw["symbol"])
+    prices = {col: _as_float(df_raw[col]) for col in _PRICE_COLS}
+    volume, valid = _as_volume(df_raw["volume"])
 
     # Remove invalids (no logging in functional core)
-    df = df.dropna(subset=STD_COLS)
-    df = df[(df[["open", "high", "low", "close"]] >= 0).all(axis=1)]
-    df = df[df["volume"] >= 0]
-    # Intentionally no logging here (functional core): callers may observe sizes externally
-
-    # Order and dedupe by (symbol, date)
-    df = (
-        df.sort_values(["symbol", "date"])
-        .drop_duplicates(subset=["symbol", "date"], keep="last")
-        .reset_index(drop=True)
+    valid &= (codes >= 0) & dates.notna().to_numpy()
+    for col in _PRICE_COLS:
+        valid &= prices[col] >= 0  # NaN compares False
+
+    # Order and dedupe by (symbol, date); lexsort is stable so the last duplicate wins
+    rows = np.flatnonzero(valid)
+    rows = rows[np.lexsort((ts[rows], codes[rows]))]
+    row_codes, row_ts = codes[rows], ts[rows]
+    last = np.ones(len(rows), dtype=bool)
+    last[:-1] = (row_codes[1:] != row_codes[:-1]) | (row_ts[1:] != row_ts[:-1])
+    rows = rows[last]
+
+    return pd.DataFrame(
+        {
+            "date": pd.DatetimeIndex(ts[rows].view("M8[ns]")).tz_localize("UTC"),
+            "symbol": pd.array(symbols.take(codes[rows]), dtype="string"),
+            **{col: prices[col][rows] for col in _PRICE_COLS},
+            "volume": volume[rows],
+        }
     )
 
-    # Ensure non-nullable volume as int64
-    if not df.empty:  # pragma: no branch
-        df["volume"] = df["volume"].astype("int64")
 
-    return df[STD_COLS]
+def to_compact(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert OHLCV to the opt-in compact in-memory schema (``COMPACT_DTYPES``).
+
+    float32 prices, categorical symbol and second-resolution (``datetime64[s]``) UTC dates;
+    the time of day is kept, so compact frames merge with stored bars on the same stamps.
+    Volume becomes int32 only when every value fits, otherwise stays int64. Frames with
+    all ``STD_COLS`` are cleaned first; column subsets (projections) are only cast.
+    Prices keep ~7 significant digits; :func:`to_canonical` restores the canonical schema.
+    """
+    if all(col in df.columns for col in STD_COLS):
+        df = clean_and_validate(df)
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if col == "date":
+            values = pd.to_datetime(values, utc=True).dt.as_unit("s")
+        elif col == "symbol":
+            values = values.astype("category")
+        elif col in _PRICE_COLS:
+            values = values.astype("float32")
+        elif col == "volume":
+            fits = len(values) == 0 or values.max() <= np.iinfo(np.int32).max
+            values = values.astype("int32" if fits else "int64")
+        out[col] = values
+    return pd.DataFrame(out, index=df.index)
+
+
+def to_canonical(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert a compact frame (or any column subset of it) back to ``STD_DTYPES``."""
+    out = {}
+    for col in df.columns:
+        values = df[col]
+        if col == "date":
+            values = pd.to_datetime(values, utc=True).dt.as_unit("ns")
+        elif col == "symbol":
+            values = values.astype("string")
+        elif col in _PRICE_COLS:
+            values = pd.Series(_as_float(values), index=df.index)
+        elif col == "volume":
+            values = values.astype("int64")
+        out[col] = values
+    return pd.DataFrame(out, index=df.index)
@@ -0,0 +1,336 @@
+"""Parameter sweeps: grids/random samples evaluated per symbol across a process pool.
+
+Work is split into ``(symbol, chunk of parameter sets)`` tasks submitted symbol by symbol.
+Each worker process keeps the frames it loaded and an :class:`IndicatorCache` per symbol,
+so a symbol is read once per worker and parameter sets sharing indicator inputs (e.g. the
+same RSI period with different stops) reuse the computed series. Finished results go to a
+:class:`ResultSink` (see ``adapters.persistence.sweep_store``) as each task completes;
+parameter sets already in it are skipped, so an interrupted sweep resumes where it stopped.
+Results are keyed by symbol, data version (e.g. the processed fingerprint), evaluator and
+the parameter set completed with the evaluator's defaults, so new bars or a different
+evaluator are evaluated again instead of served from the sink.
+
+The bundled evaluator (:func:`evaluate_rsi_macd`) runs the RSI + MACD rule with optional
+stop-loss/take-profit brackets through the event-driven backtester.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import math
+import random
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Protocol, Sequence
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.services import indicators
+from swing_trade_b3.services.event_backtest import Bar, SimulatedBroker, run_event_backtest
+
+LOG = logging.getLogger(__name__)
+
+Params = Dict[str, Any]
+Loader = Callable[[str], pd.DataFrame]
+Evaluator = Callable[[pd.DataFrame, Params, "IndicatorCache"], Dict[str, float]]
+
+RSI_MACD_DEFAULTS: Params = {
+    "rsi_period": 14,
+    "rsi_exit": 70.0,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+    "stop_loss": 0.0,  # fraction below the entry price; 0 disables
+    "take_profit": 0.0,  # fraction above the entry price; 0 disables
+}
+
+
+def param_grid(axes: Mapping[str, Sequence[Any]]) -> List[Params]:
+    """Cartesian product of the axis values, as parameter dicts."""
+    names = sorted(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*(axes[n] for n in names))]
+
+
+def random_samples(space: Mapping[str, Any], n: int, *, seed: Optional[int] = None) -> List[Params]:
+    """``n`` random parameter sets from ``space``.
+
+    Each axis is a sequence (choose one value) or a ``(low, high)`` tuple (uniform draw;
+    integers when both bounds are ints).
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(n):
+        params: Params = {}
+        for name in sorted(space):
+            axis = space[name]
+            if isinstance(axis, tuple) and len(axis) == 2:
+                low, high = axis
+                both_int = isinstance(low, int) and isinstance(high, int)
+                params[name] = rng.randint(low, high) if both_int else rng.uniform(low, high)
+            else:
+                params[name] = rng.choice(list(axis))
+        samples.append(params)
+    return samples
+
+
+def result_key(
+    symbol: str,
+    params: Mapping[str, Any],
+    *,
+    data: Optional[str] = None,
+    evaluator: str = "",
+) -> str:
+    """Stable id of a (symbol, data version, evaluator, parameter set) evaluation.
+
+    ``params`` is hashed as given: complete it with the evaluator's defaults first (as
+    ``run_sweep`` does) so that omitting a parameter and passing its default agree.
+    """
+    blob = json.dumps(
+        [symbol, data, evaluator, dict(sorted(params.items()))], sort_keys=True, default=str
+    )
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def evaluator_name(evaluate: Callable[..., Any]) -> str:
+    """Module-qualified name of an evaluator (with the bound arguments of a ``partial``)."""
+    if isinstance(evaluate, partial):
+        bound = json.dumps([evaluate.args, evaluate.keywords], sort_keys=True, default=str)
+        return evaluator_name(evaluate.func) + bound
+    target = evaluate if hasattr(evaluate, "__qualname__") else type(evaluate)
+    return f"{target.__module__}.{getattr(target, '__qualname__')}"
+
+
+@dataclass
+class IndicatorCache:
+    """Indicator series of one symbol's frame, memoized by indicator and inputs."""
+
+    df: pd.DataFrame
+    _values: Dict[tuple[Any, ...], np.ndarray] = field(default_factory=dict, repr=False)
+    hits: int = 0
+
+    def get(self, key: tuple[Any, ...], compute: Callable[[], np.ndarray]) -> np.ndarray:
+        if key in self._values:
+            self.hits += 1
+        else:
+            self._values[key] = compute()
+        return self._values[key]
+
+    def rsi(self, period: int) -> np.ndarray:
+        return self.get(("rsi", period), lambda: indicators.rsi(self.df, period).to_numpy())
+
+    def macd_hist(self, fast: int, slow: int, signal: int) -> np.ndarray:
+        return self.get(
+            ("macd_hist", fast, slow, signal),
+            lambda: indicators.macd(self.df, fast, slow, signal)["macd_hist"].to_numpy(),
+        )
+
+
+class _RsiMacdRule:
+    """Single-symbol bar rule: enter when the MACD histogram turns positive with RSI below
+    ``rsi_exit``; exit when RSI reaches ``rsi_exit``, the histogram turns negative, or a
+    stop-loss/take-profit bracket placed after the entry fills.
+
+    The two bracket legs are linked one-cancels-other, and exits are sized to the current
+    long position (none when flat), so a bar reaching both legs never opens a short."""
+
+    def __init__(self, rsi: np.ndarray, hist: np.ndarray, params: Params) -> None:
+        self.rsi, self.hist = rsi.tolist(), hist.tolist()
+        self.rsi_exit = float(params["rsi_exit"])
+        self.stop_loss, self.take_profit = params["stop_loss"], params["take_profit"]
+        self.i = -1
+        self.brackets: List[str] = []
+
+    def _cancel_brackets(self, broker: SimulatedBroker) -> None:
+        for order_id in self.brackets:
+            broker.cancel_order(order_id)
+        self.brackets = []
+
+    def on_bar(self, bar: Bar, broker: SimulatedBroker) -> None:
+        self.i += 1
+        i = self.i
+        rsi, hist, prev = self.rsi[i], self.hist[i], self.hist[i - 1] if i else math.nan
+        qty = broker.position(bar.symbol).qty
+        if qty <= 0:
+            self._cancel_brackets(broker)  # the other leg of a filled bracket
+            if qty == 0 and prev <= 0 < hist and rsi < self.rsi_exit:
+                size = int(broker.cash // bar.close)
+                if size > 0:
+                    broker.place_order(bar.symbol, size, "buy")
+            return
+        if rsi >= self.rsi_exit or hist < 0 <= prev:
+            self._cancel_brackets(broker)
+            broker.place_order(bar.symbol, qty, "sell")
+            return
+        if not self.brackets:
+            entry = broker.position(bar.symbol).avg_price
+            if self.stop_loss > 0:
+                stop = entry * (1 - self.stop_loss)
+                self.brackets.append(broker.place_order(bar.symbol, qty, "sell", stop=stop))
+            if self.take_profit > 0:
+                limit = entry * (1 + self.take_profit)
+                sibling = self.brackets[0] if self.brackets else None
+                self.brackets.append(
+                    broker.place_order(bar.symbol, qty, "sell", limit=limit, oco=sibling)
+                )
+
+
+def evaluate_rsi_macd(
+    df: pd.DataFrame, params: Params, cache: IndicatorCache, *, cash: float = 100_000.0
+) -> Dict[str, float]:
+    """Backtest the RSI + MACD rule on one symbol (``params`` over ``RSI_MACD_DEFAULTS``)."""
+    unknown = set(params) - set(RSI_MACD_DEFAULTS)
+    if unknown:
+        raise ValueError(f"unknown parameter(s): {sorted(unknown)}")
+    p = {**RSI_MACD_DEFAULTS, **params}
+    rule = _RsiMacdRule(
+        cache.rsi(int(p["rsi_period"])),
+        cache.macd_hist(int(p["macd_fast"]), int(p["macd_slow"]), int(p["macd_signal"])),
+        p,
+    )
+    result = run_event_backtest(df, rule, cash=cash)
+    return {name: float(value) for name, value in result.metrics.items()}
+
+
+class ResultSink(Protocol):
+    def done(self) -> set[str]: ...
+    def append(self, rows: List[Dict[str, Any]]) -> None: ...
+
+
+# Per-process memo of loaded frames and their indicator caches (reset by each sweep)
+_FRAMES: Dict[str, IndicatorCache] = {}
+
+
+def _reset_worker() -> None:
+    _FRAMES.clear()
+
+
+def _evaluate_task(
+    loader: Loader, evaluate: Evaluator, symbol: str, param_sets: List[Params]
+) -> List[Dict[str, float]]:
+    cache = _FRAMES.get(symbol)
+    if cache is None:
+        df = loader(symbol)
+        if df.empty:
+            raise ValueError(f"no processed data for {symbol}")
+        cache = _FRAMES[symbol] = IndicatorCache(df)
+    return [evaluate(cache.df, params, cache) for params in param_sets]
+
+
+@dataclass(frozen=True)
+class SweepSummary:
+    evaluated: int
+    skipped: int
+    failures: Dict[str, str]
+
+
+def run_sweep(
+    symbols: Iterable[str],
+    param_sets: Sequence[Params],
+    sink: ResultSink,
+    *,
+    loader: Loader,
+    evaluate: Evaluator = evaluate_rsi_macd,
+    defaults: Mapping[str, Any] = RSI_MACD_DEFAULTS,
+    version: Optional[Callable[[str], Optional[str]]] = None,
+    workers: int = 1,
+    chunk_size: int = 16,
+) -> SweepSummary:
+    """Evaluate every (symbol, parameter set) not yet in ``sink`` and append the results.
+
+    Each parameter set is completed with ``defaults`` (pass the evaluator's own defaults,
+    or ``{}``, with a custom ``evaluate``). ``version(symbol)`` names the data a symbol is
+    evaluated on (e.g. ``processed_fingerprint``); results of another version are not
+    reused. ``loader`` and ``evaluate`` must be picklable (module-level functions or
+    ``functools.partial``) when ``workers > 1``. Results are appended per finished task, so
+    an interruption loses at most the tasks in flight. Failing symbols (loader/evaluator
+    errors) are reported in the summary and retried by the next run.
+    """
+    done = sink.done()
+    evaluator = evaluator_name(evaluate)
+    full_sets = [{**defaults, **params} for params in param_sets]
+    tasks = []
+    skipped = 0
+    for symbol in symbols:
+        data = version(symbol) if version is not None else None
+        keyed = [(result_key(symbol, p, data=data, evaluator=evaluator), p) for p in full_sets]
+        pending = [(key, p) for key, p in keyed if key not in done]
+        skipped += len(full_sets) - len(pending)
+        for start in range(0, len(pending), chunk_size):
+            tasks.append((symbol, data, pending[start : start + chunk_size]))
+    evaluated = 0
+    failures: Dict[str, str] = {}
+
+    def collect(
+        symbol: str,
+        data: Optional[str],
+        chunk: List[tuple[str, Params]],
+        outcome: Callable[[], List[Dict[str, float]]],
+    ) -> None:
+        nonlocal evaluated
+        try:
+            metrics = outcome()
+        except Exception as exc:
+            LOG.error("sweep task failed", extra={"symbol": symbol})
+            failures.setdefault(symbol, str(exc))
+            return
+        sink.append(
+            [
+                {
+                    "key": key,
+                    "symbol": symbol,
+                    "data": data,
+                    "evaluator": evaluator,
+                    "params": params,
+                    "metrics": values,
+                }
+                for (key, params), values in zip(chunk, metrics)
+            ]
+        )
+        evaluated += len(metrics)
+
+    _reset_worker()
+    try:
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)), initializer=_reset_worker
+            ) as pool:
+                futures = {
+                    pool.submit(_evaluate_task, loader, evaluate, sym, [p for _key, p in chunk]): (
+                        sym,
+                        data,
+                        chunk,
+                    )
+                    for sym, data, chunk in tasks
+                }
+                for future in as_completed(futures):
+                    collect(*futures[future], future.result)
+        else:
+            for sym, data, chunk in tasks:
+                params = [p for _key, p in chunk]
+                collect(sym, data, chunk, lambda: _evaluate_task(loader, evaluate, sym, params))
+    finally:
+        _reset_worker()
+    return SweepSummary(evaluated, skipped, failures)
+
+
+def rank(
+    results: pd.DataFrame, metric: str = "total_return", top: Optional[int] = None
+) -> pd.DataFrame:
+    """Parameter sets ordered by the mean of ``metric`` across symbols (best first).
+
+    ``results`` is the flat table of a results store (one column per parameter and per
+    metric, plus ``symbol``). Adds ``symbols`` (how many symbols each set was run on).
+    """
+    param_cols = [c for c in results.columns if c.startswith("param.")]
+    if results.empty:
+        return pd.DataFrame(columns=[*param_cols, metric, "symbols"])
+    grouped = results.groupby(param_cols, dropna=False, sort=False)
+    table = grouped[metric].mean().to_frame()
+    table["symbols"] = grouped["symbol"].nunique()
+    table = table.sort_values(metric, ascending=False, kind="stable").reset_index()
+    return table if top is None else table.head(top)
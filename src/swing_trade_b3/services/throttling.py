@@ -1,19 +1,29 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
-from dataclasses import dataclass
-from typing import Callable
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
 
 
 NowFn = Callable[[], float]
 SleepFn = Callable[[float], None]
+AsyncSleepFn = Callable[[float], Awaitable[None]]
 
 
 @dataclass
 class Throttler:
+    """Minimum-interval rate limiter (token bucket with capacity 1).
+
+    Safe to share across threads: each ``wait()`` reserves the next free slot under a lock
+    and sleeps outside of it, so concurrent callers are spaced by ``min_interval_s`` overall.
+    """
+
     min_interval_s: float
     now_fn: NowFn = time.monotonic
     sleep_fn: SleepFn = time.sleep
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if self.min_interval_s < 0:
@@ -22,9 +32,35 @@ class Throttler:
         self._next_ready = self.now_fn()
 
     def wait(self) -> None:
+        with self._lock:
+            now = self.now_fn()
+            slot = max(now, self._next_ready)
+            # Schedule next availability
+            self._next_ready = slot + self.min_interval_s
+        if slot > now:
+            self.sleep_fn(slot - now)
+
+
+@dataclass
+class AsyncThrottler:
+    """asyncio counterpart of :class:`Throttler` with the same slot semantics.
+
+    Slots are reserved before awaiting, so coroutines sharing one instance on an event loop
+    are spaced by ``min_interval_s`` overall.
+    """
+
+    min_interval_s: float
+    now_fn: NowFn = time.monotonic
+    sleep_fn: AsyncSleepFn = asyncio.sleep
+
+    def __post_init__(self) -> None:
+        if self.min_interval_s < 0:
+            raise ValueError("min_interval_s must be >= 0")
+        self._next_ready = self.now_fn()
+
+    async def wait(self) -> None:
         now = self.now_fn()
-        if now < self._next_ready:
-            self.sleep_fn(self._next_ready - now)
-            now = self._next_ready
-        # Schedule next availability
-        self._next_ready = now + self.min_interval_s
+        slot = max(now, self._next_ready)
+        self._next_ready = slot + self.min_interval_s
+        if slot > now:
+            await self.sleep_fn(slot - now)
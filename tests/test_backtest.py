@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import math
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swing_trade_b3.domain.ports import Strategy
+from swing_trade_b3.services import backtest as bt
+from swing_trade_b3.services.signals import to_compact
+from tests.test_indicators import make_bars
+
+
+def loop_backtest(
+    prices: pd.DataFrame,
+    signals: pd.DataFrame,
+    fee_rate: float = 0.0,
+    allocation: str = "universe",
+):
+    """Bar-by-bar reference: equity curve and trades (symbol, entry_date, exit_date, return)."""
+    targets = {
+        (sym, pd.Timestamp(day)): bt.ACTIONS[action]
+        for day, sym, action in signals[["date", "symbol", "action"]].itertuples(index=False)
+    }
+    day_returns = defaultdict(list)
+    trades = []
+    for sym, g in prices.sort_values(["symbol", "date"]).groupby("symbol", sort=False):
+        held = want = 0.0
+        prev_close = 0.0
+        entry = None
+        for row in g.itertuples():
+            growth = 1.0
+            if held:
+                growth *= row.open / prev_close
+            if want:
+                growth *= row.close / row.open
+            if want != held:
+                growth *= 1 - fee_rate
+            if held or want:
+                day_returns[row.date].append(growth - 1)
+            if want and not held:
+                entry = [row.date, 1.0]
+            if entry is not None:
+                entry[1] *= growth
+                if held and not want:
+                    trades.append((sym, entry[0], row.date, entry[1] - 1))
+                    entry = None
+            held, prev_close = want, row.close
+            want = targets.get((sym, row.date), want)
+        if entry is not None:
+            trades.append((sym, entry[0], g["date"].iloc[-1], entry[1] - 1))
+    days = sorted(prices["date"].unique())
+    n = prices["symbol"].nunique()
+    if allocation == "universe":
+        rets = [sum(day_returns[d]) / n for d in days]
+    else:
+        rets = [np.mean(day_returns[d]) if day_returns[d] else 0.0 for d in days]
+    return np.cumprod(1 + np.array(rets)), sorted(trades, key=lambda t: (t[1], t[0]))
+
+
+def random_signals(prices: pd.DataFrame, seed: int = 3, share: float = 0.1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    picked = prices[rng.random(len(prices)) < share]
+    return pd.DataFrame(
+        {
+            "date": picked["date"].to_numpy(),
+            "symbol": picked["symbol"].to_numpy(),
+            "action": rng.choice(["buy", "sell"], len(picked)),
+        }
+    )
+
+
+def test_fills_next_open_and_trade_returns():
+    days = pd.bdate_range("2024-01-01", periods=5, tz="UTC")
+    prices = pd.DataFrame(
+        {
+            "date": days,
+            "symbol": "AAA",
+            "open": [10.0, 11.0, 12.0, 13.0, 14.0],
+            "high": 20.0,
+            "low": 5.0,
+            "close": [10.5, 11.5, 12.5, 13.5, 14.5],
+            "volume": 1,
+        }
+    )
+    signals = pd.DataFrame({"date": [days[0], days[2]], "symbol": "AAA", "action": ["buy", "sell"]})
+    res = bt.run_backtest(prices, signals)
+    assert list(res.positions["position"]) == [0.0, 1.0, 1.0, 0.0, 0.0]
+    assert list(res.positions["fill_price"].fillna(0)) == [0.0, 11.0, 0.0, 13.0, 0.0]
+    trade = res.trades.iloc[0]
+    assert (trade["entry_price"], trade["exit_price"], trade["open"]) == (11.0, 13.0, False)
+    assert trade["return"] == pytest.approx(13.0 / 11.0 - 1)
+    assert res.equity.iloc[-1] == pytest.approx(13.0 / 11.0)
+    assert res.metrics["hit_rate"] == 1.0 and res.metrics["trades"] == 1
+    assert res.metrics["exposure"] == pytest.approx(0.4)
+
+    # with fees; a buy on the last-but-one bar stays open and is marked at the close
+    signals = pd.DataFrame({"date": [days[3]], "symbol": ["AAA"], "action": ["buy"]})
+    res = bt.run_backtest(prices, signals, fee_rate=0.01, initial_capital=100.0)
+    trade = res.trades.iloc[0]
+    assert trade["open"] and trade["exit_price"] == 14.5
+    assert trade["return"] == pytest.approx(14.5 / 14.0 * 0.99 - 1)
+    assert res.equity.iloc[-1] == pytest.approx(100 * 14.5 / 14.0 * 0.99)
+    assert math.isnan(res.metrics["hit_rate"])
+
+
+def test_matches_bar_by_bar_reference_across_symbols():
+    prices = make_bars({"AAA": 120, "BBB": 90, "CCC": 150})
+    prices["open"] = prices["close"].shift(fill_value=prices["close"].iloc[0]) * 1.001
+    signals = random_signals(prices)
+    expected_equity, expected_trades = loop_backtest(prices, signals, fee_rate=0.002)
+    active_equity, _trades = loop_backtest(prices, signals, fee_rate=0.002, allocation="active")
+
+    shuffled = prices.sample(frac=1.0, random_state=1)
+    for frame in (prices, shuffled, to_compact(prices)):
+        res = bt.run_backtest(frame, signals, fee_rate=0.002)
+        np.testing.assert_allclose(res.equity.to_numpy(), expected_equity, rtol=1e-6)
+        active = bt.run_backtest(frame, signals, fee_rate=0.002, allocation="active")
+        np.testing.assert_allclose(active.equity.to_numpy(), active_equity, rtol=1e-6)
+        got = list(
+            res.trades[["symbol", "entry_date", "exit_date", "return"]].itertuples(index=False)
+        )
+        assert [t[:3] for t in got] == [t[:3] for t in expected_trades]
+        returns = [t[3] for t in expected_trades]
+        # compact frames carry float32 prices (~7 significant digits)
+        np.testing.assert_allclose([t[3] for t in got], returns, rtol=1e-6, atol=1e-6)
+        drawdown = res.equity / res.equity.cummax() - 1
+        assert res.metrics["max_drawdown"] == pytest.approx(drawdown.min())
+        pd.testing.assert_index_equal(res.positions.index, frame.index)
+
+
+def test_idle_symbols_hold_cash_under_universe_allocation():
+    days = pd.bdate_range("2024-01-01", periods=3, tz="UTC")
+    prices = pd.DataFrame(
+        {
+            "date": days.append(days),
+            "symbol": ["AAA"] * 3 + ["BBB"] * 3,
+            "open": [10.0, 10.0, 10.0] + [5.0] * 3,
+            "high": 20.0,
+            "low": 1.0,
+            "close": [10.0, 12.0, 12.0] + [5.0] * 3,
+            "volume": 1,
+        }
+    )
+    signals = pd.DataFrame({"date": [days[0]], "symbol": ["AAA"], "action": ["buy"]})
+    # one symbol of two in position: +20% on half the capital, the other half is cash
+    res = bt.run_backtest(prices, signals)
+    assert res.equity.iloc[-1] == pytest.approx(1.1)
+    res = bt.run_backtest(prices, signals, allocation="active")
+    assert res.equity.iloc[-1] == pytest.approx(1.2)
+
+
+def test_signal_edge_cases():
+    prices = make_bars({"AAA": 10})
+    day = prices["date"].iloc[2]
+    # duplicates: last wins; unknown symbol and off-calendar dates are ignored
+    signals = pd.DataFrame(
+        {
+            "date": [day, day, day, day + pd.Timedelta(hours=1)],
+            "symbol": ["AAA", "AAA", "ZZZ", "AAA"],
+            "action": ["buy", "sell", "buy", "buy"],
+        }
+    )
+    res = bt.run_backtest(prices, signals)
+    assert res.metrics["trades"] == 0 and res.equity.eq(1.0).all()
+
+    res = bt.run_backtest(prices, signals.iloc[:0])
+    assert res.metrics["exposure"] == 0.0 and res.trades.empty
+
+    with pytest.raises(ValueError, match="hold"):
+        bt.run_backtest(prices, signals.assign(action="hold"))
+    with pytest.raises(ValueError, match="allocation"):
+        bt.run_backtest(prices, signals, allocation="kelly")
+
+    res = bt.run_backtest(prices.iloc[:0], signals)
+    assert res.positions.empty and res.equity.empty and res.metrics["trades"] == 0
+    assert list(res.trades.columns) == bt.TRADE_COLUMNS
+
+
+def test_backtest_strategy_uses_generated_signals():
+    class BuyFirstBar:
+        def generate(self, df: pd.DataFrame) -> pd.DataFrame:
+            first = df.groupby("symbol").head(1)
+            return first[["date", "symbol"]].assign(action="buy")
+
+    strategy = BuyFirstBar()
+    assert isinstance(strategy, Strategy)
+    prices = make_bars({"AAA": 30, "BBB": 30})
+    res = bt.backtest_strategy(strategy, prices, fee_rate=0.0)
+    assert res.trades["open"].all() and len(res.trades) == 2
+    assert res.metrics["exposure"] == pytest.approx(29 / 30)
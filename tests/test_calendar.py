@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.services import calendar as cal
+
+
+def test_b3_holidays_follow_the_exchange_rules():
+    assert cal.easter(2024) == date(2024, 3, 31) and cal.easter(2019) == date(2019, 4, 21)
+    h2024 = cal.b3_holidays(2024)
+    # Carnival, Good Friday, Corpus Christi, national Black Consciousness, Christmas Eve, Dec 31
+    for day in ("2024-02-12", "2024-02-13", "2024-03-29", "2024-05-30", "2024-11-20"):
+        assert date.fromisoformat(day) in h2024
+    assert {date(2024, 12, 24), date(2024, 12, 31)} <= set(h2024)
+    # Sao Paulo holidays closed B3 only until 2021
+    assert {date(2021, 1, 25), date(2021, 7, 9)} <= set(cal.b3_holidays(2021))
+    assert date(2023, 1, 25) not in cal.b3_holidays(2023)
+    assert date(2023, 11, 20) not in cal.b3_holidays(2023)
+    # the last weekday of the year closes even when Dec 31 falls on a weekend
+    assert date(2023, 12, 29) in cal.b3_holidays(2023)
+    assert cal.HOLIDAYS.dtype == np.dtype("datetime64[D]")
+    assert cal.session_count("2024-01-01", "2024-12-31") == 251
+
+
+def test_scalar_lookups_return_python_values():
+    assert cal.is_session(date(2024, 2, 14)) is True  # Ash Wednesday trades
+    assert cal.is_session("2024-02-13") is False
+    assert cal.next_session(date(2024, 2, 9)) == date(2024, 2, 14)
+    assert cal.next_session(pd.Timestamp("2024-02-10")) == date(2024, 2, 14)
+    assert cal.previous_session(datetime(2024, 2, 14, 18)) == date(2024, 2, 9)
+    assert cal.session_count(date(2024, 2, 9), date(2024, 2, 14)) == 2
+    assert cal.session_count(date(2024, 2, 14), date(2024, 2, 9)) == 0
+    # aware values use their own wall-clock date
+    assert cal.is_session(pd.Timestamp("2024-02-09 23:00", tz="America/Sao_Paulo")) is True
+
+
+def test_vectorized_lookups_and_sessions():
+    dates = pd.Series(pd.to_datetime(["2024-02-09", "2024-02-10", "2024-02-13"], utc=True))
+    assert cal.is_session(dates).tolist() == [True, False, False]
+    expected = np.array(["2024-02-14"] * 3, dtype="datetime64[D]")
+    assert (cal.next_session(dates) == expected).all()
+    assert cal.previous_session(dates.dt.date.tolist()).tolist() == [
+        date(2024, 2, 8),
+        date(2024, 2, 9),
+        date(2024, 2, 9),
+    ]
+    assert cal.session_count(dates, "2024-02-16").tolist() == [4, 3, 3]
+
+    days = cal.sessions("2024-02-08", date(2024, 2, 15))
+    assert str(days.tz) == "UTC" and days.name == "date"
+    assert [d.day for d in days] == [8, 9, 14, 15]
+    assert cal.sessions("2024-02-10", "2024-02-13").empty
+
+
+def test_missing_sessions_reports_gaps_not_holidays():
+    bars = pd.to_datetime(["2024-02-08", "2024-02-15", "2024-02-16"], utc=True)
+    assert [d.day for d in cal.missing_sessions(bars)] == [9, 14]
+    assert [d.day for d in cal.missing_sessions(bars, end="2024-02-19")] == [9, 14, 19]
+    assert cal.missing_sessions(bars, start="2024-02-15").empty
+    assert cal.missing_sessions([]).empty
+    assert len(cal.missing_sessions([], "2024-02-08", "2024-02-09")) == 2
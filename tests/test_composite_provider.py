@@ -79,3 +79,63 @@ def test_composite_provider_primary_empty_then_fallback(monkeypatch):
     monkeypatch.setattr(cp.yf, "fetch_daily", fallback_ok)
     out = cp.fetch_daily("SYM", date(2024, 1, 1), date(2024, 1, 2))
     assert len(out) == 1
+
+    # a window without sessions is not worth a fallback request
+    assert cp.fetch_daily("SYM", date(2024, 1, 6), date(2024, 1, 7)).empty
+
+
+def test_composite_provider_async_fallbacks(monkeypatch):
+    import asyncio
+
+    import pytest
+
+    row = {
+        "date": pd.Timestamp("2024-01-02", tz="UTC"),
+        "symbol": "SYM",
+        "open": 1.0,
+        "high": 1.2,
+        "low": 0.8,
+        "close": 1.1,
+        "volume": 5,
+    }
+
+    async def primary_ok(*a, **k):  # noqa: ANN001
+        return pd.DataFrame.from_records([row])
+
+    async def primary_empty(*a, **k):  # noqa: ANN001
+        return pd.DataFrame(columns=list(row))
+
+    async def primary_fail(*a, **k):  # noqa: ANN001
+        raise RuntimeError("boom")
+
+    async def fallback_ok(*a, **k):  # noqa: ANN001
+        return pd.DataFrame.from_records([row])
+
+    async def fallback_fail(*a, **k):  # noqa: ANN001
+        raise ImportError("no yfinance")
+
+    def run(meta=None):
+        return asyncio.run(
+            cp.fetch_daily_async("SYM", date(2024, 1, 1), date(2024, 1, 2), meta=meta)
+        )
+
+    monkeypatch.setattr(cp.b3, "fetch_daily_async", primary_ok)
+    meta: dict[str, Any] = {}
+    assert len(run(meta)) == 1 and meta["provider"] == "brapi"
+
+    monkeypatch.setattr(cp.b3, "fetch_daily_async", primary_empty)
+    monkeypatch.setattr(cp.yf, "fetch_daily_async", fallback_ok)
+    meta = {}
+    assert len(run(meta)) == 1 and meta["provider"] == "yfinance"
+
+    monkeypatch.setattr(cp.b3, "fetch_daily_async", primary_fail)
+    assert len(run()) == 1
+
+    monkeypatch.setattr(cp.yf, "fetch_daily_async", fallback_fail)
+    with pytest.raises(ImportError):
+        run()
+
+    monkeypatch.setattr(cp.b3, "fetch_daily_async", primary_empty)
+    assert run().empty
+    weekend = cp.fetch_daily_async("SYM", date(2024, 1, 6), date(2024, 1, 7))
+    assert asyncio.run(weekend).empty  # fallback (which raises here) is not attempted
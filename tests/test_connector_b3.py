@@ -1,8 +1,11 @@
+import json
 from datetime import date, timedelta
+from types import SimpleNamespace
 from typing import Any
 
 import pandas as pd
 import pytest
+from requests.adapters import HTTPAdapter
 
 from swing_trade_b3.adapters.connectors.market_data.b3_adapter import (
     HttpConfig,
@@ -19,15 +22,11 @@ from swing_trade_b3.adapters.connectors.market_data.b3_adapter import (
 
 def test_choose_range_thresholds():
     today = date.today()
-    # 1mo: span <= 31 days
+    # smallest range reaching back to start, in calendar months: 1, 3, 6, 12, 60
     assert _choose_range(today - timedelta(days=10), today) == "1mo"
-    # 3mo: <= 93
     assert _choose_range(today - timedelta(days=60), today) == "3mo"
-    # 6mo: <= 186
     assert _choose_range(today - timedelta(days=120), today) == "6mo"
-    # 1y: <= 366
     assert _choose_range(today - timedelta(days=300), today) == "1y"
-    # 5y: <= 5 * 366
     assert _choose_range(today - timedelta(days=1000), today) == "5y"
     # max otherwise
     assert _choose_range(today - timedelta(days=5 * 366 + 10), today) == "max"
@@ -88,15 +87,25 @@ class FakeResp:
         self.status_code = status
         self._data = data or {}
         self._err = err
+        self.headers: dict[str, str] = {}
 
-    def json(self):
-        return self._data
+    @property
+    def content(self):
+        return json.dumps(self._data).encode()
 
     def raise_for_status(self):
         if self._err:
             raise self._err
 
 
+def _patch_get(monkeypatch, fn):
+    # Route the pooled session's GET to a stub
+    monkeypatch.setattr(
+        "swing_trade_b3.adapters.connectors.market_data.b3_adapter._get_session",
+        lambda cfg: SimpleNamespace(get=fn),
+    )
+
+
 def test_http_get_json_success_and_errors(monkeypatch):
     calls = {"n": 0}
 
@@ -104,9 +113,7 @@ def test_http_get_json_success_and_errors(monkeypatch):
         calls["n"] += 1
         return FakeResp(200, {"ok": True})
 
-    monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter.requests.get", fake_get
-    )
+    _patch_get(monkeypatch, fake_get)
 
     meta: dict[str, Any] = {}
     out = _http_get_json(
@@ -117,8 +124,8 @@ def test_http_get_json_success_and_errors(monkeypatch):
     assert meta["http"]["throttle_calls"] >= 1
 
     # success path with throttle but without meta (exercise branches where http_meta is None)
-    monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter.requests.get",
+    _patch_get(
+        monkeypatch,
         lambda *a, **k: FakeResp(200, {"ok": True}),
     )
     out2 = _http_get_json("http://x", cfg=HttpConfig(max_retries=1), throttle_wait=lambda: None)
@@ -130,9 +137,7 @@ def test_http_get_json_success_and_errors(monkeypatch):
     def fake_get_429(url, headers=None, timeout=None):  # noqa: ARG001
         return seq.pop(0)
 
-    monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter.requests.get", fake_get_429
-    )
+    _patch_get(monkeypatch, fake_get_429)
     monkeypatch.setattr(
         "swing_trade_b3.adapters.connectors.market_data.b3_adapter.time.sleep", lambda s: None
     )
@@ -140,8 +145,8 @@ def test_http_get_json_success_and_errors(monkeypatch):
         _http_get_json("http://x", cfg=HttpConfig(max_retries=2), meta={})
 
     # 500 -> ServerError
-    monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter.requests.get",
+    _patch_get(
+        monkeypatch,
         lambda *a, **k: FakeResp(503),
     )
     with pytest.raises(ServerError):
@@ -152,8 +157,8 @@ def test_http_get_json_success_and_errors(monkeypatch):
 
     # 400 -> raise_for_status
     err = Exception("bad request")
-    monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter.requests.get",
+    _patch_get(
+        monkeypatch,
         lambda *a, **k: FakeResp(400, err=err),
     )
     with pytest.raises(Exception):
@@ -165,8 +170,8 @@ def test_http_get_json_success_and_errors(monkeypatch):
 
     import requests as _req
 
-    monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter.requests.get",
+    _patch_get(
+        monkeypatch,
         lambda *a, **k: (_ for _ in ()).throw(_req.Timeout("t")),
     )
     with pytest.raises(_req.Timeout):
@@ -179,63 +184,389 @@ def test_http_get_json_success_and_errors(monkeypatch):
         _http_get_json("http://x", cfg=HttpConfig(max_retries=0))
 
 
+def _bars(*days: str) -> dict:
+    ts = [int(pd.Timestamp(d, tz="UTC").timestamp()) for d in days]
+    row = {"open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
+    return {"results": [{"historicalDataPrice": [{"date": t, **row} for t in ts]}]}
+
+
+@pytest.fixture(autouse=True)
+def fresh_first_dates(monkeypatch):
+    from swing_trade_b3.adapters.connectors.market_data import range_planner
+
+    monkeypatch.setattr(range_planner, "_STORES", {})
+
+
 def test_fetch_daily_filters_and_retries(monkeypatch):
-    # First attempt returns out-of-range -> empty -> triggers range=max retry
+    today = date(2023, 1, 31)
+    urls: list[str] = []
+    responses: dict[str, dict] = {}
+
     def fake_http_get(url, cfg, throttle_wait=None, meta=None):  # noqa: ARG001
-        if "range=max" in url:
-            ts = int(pd.Timestamp("2023-01-02", tz="UTC").timestamp())
-            return {
-                "results": [
-                    {
-                        "historicalDataPrice": [
-                            {"date": ts, "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
-                        ]
-                    }
-                ]
-            }
-        # first call returns rows all OUTSIDE the [start,end] range → empty after filter
-        ts_old = int(pd.Timestamp("2000-01-01", tz="UTC").timestamp())
-        return {
-            "results": [
-                {
-                    "historicalDataPrice": [
-                        {"date": ts_old, "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
-                    ]
-                }
-            ]
-        }
+        urls.append(url.rsplit("range=", 1)[1])
+        return responses[urls[-1]]
 
     monkeypatch.setattr(
         "swing_trade_b3.adapters.connectors.market_data.b3_adapter._http_get_json",
         fake_http_get,
     )
-    start = date(2023, 1, 1)
+    start = date(2023, 1, 2)
     end = date(2023, 1, 3)
+
+    # the 1mo response starts at the range edge (after the window): only max can cover it
+    responses.update({"1mo": _bars("2023-01-05", "2023-01-06"), "max": _bars("2023-01-02")})
     meta: dict[str, Any] = {}
-    df = fetch_daily("PETR4", start, end, meta=meta)
-    assert not df.empty and meta["range_used"] == "max"
+    df = fetch_daily("PETR4", start, end, meta=meta, today=today)
+    assert len(df) == 1 and meta["range_used"] == "max" and urls == ["1mo", "max"]
+
+    # prefer_max skips planning and uses max directly
+    urls.clear()
+    assert not fetch_daily("PETR4", start, end, prefer_max=True, today=today).empty
+    assert urls == ["max"]
+
+    # the first bar sits well after the range edge: the symbol starts there, so no max
+    # retry; only a max response teaches the first date
+    urls.clear()
+    responses["1mo"] = _bars("2023-01-20", "2023-01-23")
+    assert fetch_daily("NEW3", start, end, meta=meta, today=today).empty
+    assert urls == ["1mo"] and meta["range_used"] == "1mo"
+    responses["max"] = _bars("2023-01-20", "2023-01-23")
+    assert fetch_daily("NEW3", start, end, prefer_max=True, today=today).empty
+    assert urls == ["1mo", "max"]
+    # the learned first date answers later windows before it without any request
+    assert fetch_daily("NEW3", start, end, meta=meta, today=today).empty
+    assert urls == ["1mo", "max"] and meta["range_used"] is None
+    # a window starting before the first date only needs history back to it
+    assert len(fetch_daily("NEW3", date(2015, 1, 1), end.replace(day=20), today=today)) == 1
+    assert urls == ["1mo", "max", "1mo"]
+
+    # weekend-only windows never reach the provider
+    out = fetch_daily("PETR4", date(2023, 1, 7), date(2023, 1, 8), meta=meta, today=today)
+    assert out.empty and list(out.columns) == list(df.columns) and meta["range_used"] is None
+    assert urls == ["1mo", "max", "1mo"]
+
+    # sessions missing inside the returned history (holiday): empty without a retry
+    responses["1mo"] = _bars("2023-01-02", "2023-01-04")
+    assert fetch_daily("HOL3", end, end, today=today).empty
+    assert urls == ["1mo", "max", "1mo", "1mo"]
+
+    # no rows at all: empty, nothing learned, no retry
+    responses["1mo"] = {"results": [{"historicalDataPrice": []}]}
+    assert fetch_daily("VOID3", start, end, meta=None, today=today).empty
+    assert urls == ["1mo", "max", "1mo", "1mo", "1mo"]
 
-    # prefer_max skips retry logic and uses max directly
-    monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter._http_get_json",
-        fake_http_get,
+    # invalid args
+    with pytest.raises(ValueError):
+        fetch_daily(" ", start, end)
+    with pytest.raises(ValueError):
+        fetch_daily("X", end, start)
+
+
+def test_pooled_session_is_reused_and_closed():
+    from swing_trade_b3.adapters.connectors.market_data import b3_adapter as b3
+
+    b3.close_sessions()
+    cfg = HttpConfig(pool_size=4)
+    s1 = b3._get_session(cfg)
+    assert b3._get_session(HttpConfig(pool_size=4, timeout=1.0)) is s1
+    adapter = s1.get_adapter("https://brapi.dev/api")
+    assert isinstance(adapter, HTTPAdapter)
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 4
+    assert s1.headers.get("Connection") != "close"
+
+    s2 = b3._get_session(HttpConfig(pool_size=4, keep_alive=False))
+    assert s2 is not s1 and s2.headers["Connection"] == "close"
+
+    b3.close_sessions()
+    assert b3._SESSIONS == {}
+    assert b3._get_session(cfg) is not s1
+    b3.close_sessions()
+
+
+def _payload(day: str) -> dict:
+    ts = int(pd.Timestamp(day, tz="UTC").timestamp())
+    return {
+        "results": [
+            {
+                "historicalDataPrice": [
+                    {"date": ts, "open": 1, "high": 1, "low": 1, "close": 1, "volume": 1}
+                ]
+            }
+        ]
+    }
+
+
+def test_http_get_json_async_retries_and_errors(monkeypatch):
+    import asyncio
+
+    import httpx
+
+    from swing_trade_b3.adapters.connectors.market_data import b3_adapter as b3
+
+    async def no_sleep(s):  # noqa: ARG001
+        return None
+
+    monkeypatch.setattr(b3.asyncio, "sleep", no_sleep)
+
+    def run(handler, cfg, **kwargs):
+        async def go():
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return await b3._http_get_json_async(
+                    "http://x/api", cfg=cfg, client=client, **kwargs
+                )
+
+        return asyncio.run(go())
+
+    # 429, 503, transport error (0), then 200 — with async throttle and meta
+    seq = [429, 503, 0, 200]
+
+    def flaky(request):
+        step = seq.pop(0)
+        if step == 0:
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(step, json={"ok": True})
+
+    throttled = {"n": 0}
+
+    async def throttle():
+        throttled["n"] += 1
+
+    meta: dict[str, Any] = {}
+    out = run(flaky, HttpConfig(max_retries=4), throttle_wait=throttle, meta=meta)
+    assert out == {"ok": True}
+    assert meta["http"]["attempts"] == 4 and meta["http"]["retries"] == 3
+    assert meta["http"]["throttle_calls"] == 4 == throttled["n"]
+
+    with pytest.raises(RateLimitError):
+        run(lambda r: httpx.Response(429), HttpConfig(max_retries=2))
+    with pytest.raises(httpx.HTTPStatusError):
+        run(lambda r: httpx.Response(404), HttpConfig(max_retries=2), meta={})
+
+    from swing_trade_b3.adapters.connectors.market_data.b3_adapter import NetworkError
+
+    with pytest.raises(NetworkError):
+        run(lambda r: httpx.Response(200), HttpConfig(max_retries=0))
+
+
+def test_fetch_daily_async_matches_sync_contract(monkeypatch):
+    import asyncio
+
+    import httpx
+
+    from swing_trade_b3.adapters.connectors.market_data import b3_adapter as b3
+
+    urls: list[str] = []
+
+    def handler(request):
+        urls.append(str(request.url))
+        if "range=max" in str(request.url):
+            return httpx.Response(200, json=_payload("2023-01-02"))
+        return httpx.Response(200, json=_payload("2023-01-05"))  # 1mo cut at its edge
+
+    real_client = b3.async_client
+
+    def mock_client(cfg=None):
+        client = real_client(cfg)
+        client._transport = httpx.MockTransport(handler)
+        return client
+
+    monkeypatch.setattr(b3, "async_client", mock_client)
+
+    meta: dict[str, Any] = {}
+    today = date(2023, 1, 31)
+    df = asyncio.run(
+        b3.fetch_daily_async("PETR4", date(2023, 1, 2), date(2023, 1, 3), meta=meta, today=today)
     )
-    df2 = fetch_daily("PETR4", start, end, prefer_max=True, meta=meta)
-    assert not df2.empty
+    assert len(df) == 1 and meta["range_used"] == "max"
+    assert [u.rsplit("range=", 1)[1] for u in urls] == ["1mo", "max"]
+
+    # learned from the max response: windows before the first bar skip the request
+    meta = {}
+    skipped = b3.fetch_daily_async("PETR4", date(2022, 12, 1), date(2022, 12, 2), meta=meta)
+    assert asyncio.run(skipped).empty and meta["range_used"] is None and len(urls) == 2
 
-    # df empty path (no rows at all)
-    def fake_http_empty(url, cfg, throttle_wait=None, meta=None):  # noqa: ARG001
-        return {"results": [{"historicalDataPrice": []}]}
+    async def shared():
+        async with b3.async_client(HttpConfig(pool_size=2, keep_alive=False)) as client:
+            return await b3.fetch_daily_async(
+                "PETR4", date(2023, 1, 1), date(2023, 1, 3), prefer_max=True, client=client
+            )
+
+    assert len(asyncio.run(shared())) == 1
+
+    def empty(request):  # noqa: ARG001
+        return httpx.Response(200, json={"results": [{"historicalDataPrice": []}]})
 
     monkeypatch.setattr(
-        "swing_trade_b3.adapters.connectors.market_data.b3_adapter._http_get_json",
-        fake_http_empty,
+        b3,
+        "async_client",
+        lambda cfg=None: httpx.AsyncClient(transport=httpx.MockTransport(empty)),
     )
-    out = fetch_daily("PETR4", start, end, meta=None)
-    assert out.empty
+    assert asyncio.run(b3.fetch_daily_async("PETR4", date(2023, 1, 1), date(2023, 1, 3))).empty
 
-    # invalid args
     with pytest.raises(ValueError):
-        fetch_daily(" ", start, end)
+        asyncio.run(b3.fetch_daily_async("X", date(2023, 1, 3), date(2023, 1, 1)))
+
+
+def test_normalize_to_ohlcv_columnar_edge_cases(caplog):
+    import logging
+
+    def rec(day, **over):
+        base: dict[str, Any] = {"date": int(pd.Timestamp(day, tz="UTC").timestamp())}
+        base.update({"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10})
+        base.update(over)
+        return base
+
+    series = [
+        rec("2024-01-03"),
+        rec("2024-01-02", close=1.0),
+        rec("2024-01-02", close=1.2),  # duplicate date: last one wins
+        "garbage",  # malformed: not an object
+        rec("2024-01-04", high="n/a"),  # malformed: unparseable price
+        rec("2024-01-05", volume=None),  # invalid: missing volume
+        rec("2024-01-08", low=-1),  # invalid: negative
+        rec("2024-01-09", date=None),  # malformed: no date
+        rec("2024-01-10", volume="7"),
+    ]
+    with caplog.at_level(logging.INFO):
+        df = _normalize_to_ohlcv("T3", {"results": [{"historicalDataPrice": series}]})
+
+    assert [str(d.date()) for d in df["date"]] == ["2024-01-02", "2024-01-03", "2024-01-10"]
+    assert df.loc[0, "close"] == 1.2 and df.loc[2, "volume"] == 7
+    assert df["symbol"].dtype == "string" and df["volume"].dtype == "int64"
+    assert str(df["date"].dt.tz) == "UTC"
+    skipped = [r for r in caplog.records if r.getMessage() == "skip malformed row"]
+    assert len(skipped) == 3
+    removed = [r for r in caplog.records if r.getMessage() == "removed invalid rows"]
+    assert removed and getattr(removed[0], "removed") == 2
+
+    empty = _normalize_to_ohlcv("T3", {"results": [{"historicalDataPrice": []}]})
+    assert empty.empty and list(empty.columns) == [
+        "date",
+        "symbol",
+        "open",
+        "high",
+        "low",
+        "close",
+        "volume",
+    ]
+    assert str(empty["date"].dtype) == "datetime64[ns, UTC]"
+
+
+def test_json_decoder_selection_and_fallback(monkeypatch):
+    import sys
+    from types import ModuleType
+
+    from swing_trade_b3.adapters.connectors.market_data import b3_adapter as b3
+
+    fake_orjson = ModuleType("orjson")
+    fake_orjson.loads = lambda b: {"via": "orjson"}  # type: ignore[attr-defined]
+    fake_simdjson = ModuleType("simdjson")
+    fake_simdjson.loads = lambda b: {"via": "simdjson"}  # type: ignore[attr-defined]
+
+    b3.get_json_decoder.cache_clear()
+    monkeypatch.setitem(sys.modules, "orjson", fake_orjson)
+    monkeypatch.setitem(sys.modules, "simdjson", fake_simdjson)
+    assert b3.get_json_decoder("auto")(b"{}") == {"via": "orjson"}
+    assert b3.get_json_decoder("simdjson")(b"{}") == {"via": "simdjson"}
+
+    # not installed -> auto skips them; explicit choice falls back to stdlib
+    b3.get_json_decoder.cache_clear()
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "simdjson", None)
+    assert b3.get_json_decoder("auto") is json.loads
+    assert b3.get_json_decoder("orjson") is json.loads
+    assert b3.get_json_decoder("simdjson") is json.loads
     with pytest.raises(ValueError):
-        fetch_daily("X", end, start)
+        b3.get_json_decoder("yaml")
+
+    cfg = HttpConfig(json_decoder="json")
+    assert b3._decode_json(b'{"a": 1}', cfg) == {"a": 1}
+    with pytest.raises(ParseError):
+        b3._decode_json(b"<html>", cfg)
+    b3.get_json_decoder.cache_clear()
+
+
+def test_http_get_json_disk_cache_ttl_and_revalidation(monkeypatch, tmp_path):
+    from swing_trade_b3.adapters.connectors.market_data import http_cache
+
+    clock = {"now": 1_000.0}
+    cache = http_cache.HttpCache(tmp_path, ttl_s=60, clock=lambda: clock["now"])
+    monkeypatch.setattr(
+        "swing_trade_b3.adapters.connectors.market_data.b3_adapter.get_cache",
+        lambda *a: cache,
+    )
+    cfg = HttpConfig(max_retries=1, cache_dir=str(tmp_path), cache_ttl_s=60)
+    sent: list[dict] = []
+    replies: list[FakeResp] = []
+
+    def fake_get(url, headers=None, timeout=None):  # noqa: ARG001
+        sent.append(dict(headers or {}))
+        resp = replies.pop(0)
+        resp.headers = {"ETag": '"v1"'} if resp.status_code == 200 else {}
+        return resp
+
+    _patch_get(monkeypatch, fake_get)
+
+    def get():
+        meta: dict[str, Any] = {}
+        return _http_get_json("http://x", cfg=cfg, meta=meta), meta["http"]
+
+    replies.append(FakeResp(200, {"v": 1}))
+    assert get() == ({"v": 1}, {**get_meta_base(), "cache": "miss"})
+    # within the TTL: served from disk without any request
+    assert get()[0] == {"v": 1} and len(sent) == 1
+    # stale: conditional request, 304 keeps the body and restarts the TTL
+    clock["now"] += 61
+    replies.append(FakeResp(304))
+    out, meta = get()
+    assert out == {"v": 1} and meta["cache"] == "revalidated"
+    assert sent[-1]["If-None-Match"] == '"v1"'
+    assert get()[1]["cache"] == "hit" and len(sent) == 2
+    # stale and changed upstream: the new body replaces the entry
+    clock["now"] += 61
+    replies.append(FakeResp(200, {"v": 2}))
+    assert get()[0] == {"v": 2} and get()[0] == {"v": 2} and len(sent) == 3
+
+
+def get_meta_base() -> dict[str, Any]:
+    return {
+        "attempts": 1,
+        "retries": 0,
+        "sleep_total_s": 0.0,
+        "last_status": 200,
+        "throttle_calls": 0,
+    }
+
+
+def test_http_get_json_async_uses_disk_cache(monkeypatch, tmp_path):
+    import asyncio
+
+    from dataclasses import replace
+
+    import httpx
+
+    from swing_trade_b3.adapters.connectors.market_data import b3_adapter as b3
+
+    cfg = HttpConfig(max_retries=1, cache_dir=str(tmp_path / "http"), cache_ttl_s=0)
+    seen: list[str | None] = []
+
+    def handler(request):
+        seen.append(request.headers.get("If-None-Match"))
+        if seen[-1] == '"a"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"n": len(seen)}, headers={"ETag": '"a"'})
+
+    async def go():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            first = await b3._http_get_json_async("http://x/q", cfg=cfg, client=client)
+            meta: dict[str, Any] = {}
+            second = await b3._http_get_json_async("http://x/q", cfg=cfg, client=client, meta=meta)
+            fresh = await b3._http_get_json_async(
+                "http://x/q", cfg=replace(cfg, cache_ttl_s=3600), client=client
+            )
+            return first, second, fresh, meta
+
+    first, second, fresh, meta = asyncio.run(go())
+    # ttl=0: always revalidated, and the 304 serves the stored body
+    assert first == second == fresh == {"n": 1} and seen == [None, '"a"']
+    assert meta["http"]["cache"] == "revalidated"
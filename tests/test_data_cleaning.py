@@ -68,3 +68,122 @@ def test_save_processed_idempotent(tmp_path: Path):
     # Sorted and unique by (symbol,date)
     assert back.sort_values(["symbol", "date"]).equals(back)
     assert back.drop_duplicates(["symbol", "date"]).shape[0] == back.shape[0]
+
+
+def test_clean_and_validate_fast_path_and_is_clean():
+    from swing_trade_b3.services.signals import STD_COLS, clean_and_validate, is_clean
+
+    clean = clean_and_validate(make_raw())
+    assert is_clean(clean) and is_clean(clean.iloc[:0])
+    # already-clean input skips the kernel but still comes back as a new, re-indexed frame
+    shifted = clean.set_axis([10, 20])
+    again = clean_and_validate(shifted)
+    assert again is not shifted and isinstance(again.index, pd.RangeIndex)
+    pd.testing.assert_frame_equal(again, clean)
+
+    assert not is_clean(clean[list(reversed(STD_COLS))])
+    assert not is_clean(clean.astype({"volume": "float64"}))
+    broken = {
+        "symbol": clean.assign(symbol=pd.array([None, "TEST3"], dtype="string")),
+        "date": clean.assign(date=clean["date"].where(pd.Series([False, True]))),
+        "price": clean.assign(low=[-1.0, 1.0]),
+        "volume": clean.assign(volume=[-1, 1]),
+        "order": clean.iloc[::-1].reset_index(drop=True),
+        "dup": pd.concat([clean.iloc[:1], clean.iloc[:1]], ignore_index=True),
+    }
+    for name, df in broken.items():
+        assert not is_clean(df), name
+
+
+def test_clean_and_validate_multi_symbol_last_duplicate_wins():
+    from swing_trade_b3.services.signals import clean_and_validate
+
+    raw = pd.DataFrame(
+        {
+            "date": ["2023-01-03", "2023-01-02", "2023-01-02", "2023-01-02", "2023-01-02"],
+            "symbol": ["B", "B", 1, "1", "B"],
+            "open": [1, 2, 3, 4, 5],
+            "high": [1, 2, 3, 4, 5],
+            "low": [1, 2, 3, 4, 5],
+            "close": [1.0, 2.0, 3.0, 4.0, 5.0],
+            "volume": [10.0, 20.0, 30.0, 40.0, float("nan")],
+        }
+    )
+    df = clean_and_validate(raw)
+    # 1 and "1" are the same ticker once stringified; NaN volume row of B is invalid
+    assert list(df["symbol"]) == ["1", "B", "B"]
+    assert list(df["close"]) == [4.0, 2.0, 1.0]
+    assert df["volume"].dtype == "int64" and list(df["volume"]) == [40, 20, 10]
+
+
+def test_compact_schema_roundtrip_and_projection():
+    import numpy as np
+
+    from swing_trade_b3.services.signals import (
+        COMPACT_DTYPES,
+        STD_DTYPES,
+        clean_and_validate,
+        to_canonical,
+        to_compact,
+    )
+
+    clean = clean_and_validate(
+        pd.DataFrame(
+            {
+                "date": ["2023-01-02", "2023-01-03", "2023-01-02"],
+                "symbol": ["B", "B", "A"],
+                "open": [10.37, 0.0, 99999.99],
+                "high": [10.5, 0.01, 100000.0],
+                "low": [1e-4, 0.0, 12345.67],
+                "close": [10.4, 0.01, 0.07],
+                "volume": [100, 2**31 - 1, 0],
+            }
+        )
+    )
+    compact = to_compact(clean)
+    assert {c: str(t) for c, t in compact.dtypes.items() if c != "symbol"} == {
+        c: t for c, t in COMPACT_DTYPES.items() if c != "symbol"
+    }
+    assert isinstance(compact["symbol"].dtype, pd.CategoricalDtype)
+    assert compact.memory_usage(deep=True).sum() < clean.memory_usage(deep=True).sum()
+
+    # canonical schema restored exactly (float32 values widen to the decimal written)
+    back = to_canonical(compact)
+    assert {c: str(t) for c, t in back.dtypes.items()} == STD_DTYPES
+    pd.testing.assert_frame_equal(back, clean)
+    # the cleaning kernel and writers accept compact frames directly
+    pd.testing.assert_frame_equal(clean_and_validate(compact), clean)
+
+    # volume above int32 stays int64 (lossless); projections are only cast
+    big = to_compact(clean.assign(volume=[1, 2**31, 3]))
+    assert big["volume"].dtype == np.int64
+    part = to_compact(clean[["close"]].assign(close=[np.nan, 1.5, 2.0]))
+    assert list(part.columns) == ["close"] and part["close"].dtype == np.float32
+    assert np.isnan(to_canonical(part)["close"].iloc[0])
+    # non-OHLCV columns pass through untouched both ways
+    extra = to_canonical(to_compact(pd.DataFrame({"close": [1.25], "note": ["x"]})))
+    assert list(extra["note"]) == ["x"] and extra["close"].dtype == np.float64
+
+
+def test_compact_keeps_intraday_timestamps():
+    from swing_trade_b3.services.signals import clean_and_validate, to_canonical, to_compact
+
+    # yfinance stamps daily bars at 03:00 UTC, brapi at the actual quote time
+    clean = clean_and_validate(
+        pd.DataFrame(
+            {
+                "date": ["2024-01-02T03:00:00Z", "2024-01-03T03:00:00Z", "2024-01-02T20:07:31Z"],
+                "symbol": ["B", "B", "A"],
+                "open": [1.0, 2.0, 3.0],
+                "high": [1.0, 2.0, 3.0],
+                "low": [1.0, 2.0, 3.0],
+                "close": [1.0, 2.0, 3.0],
+                "volume": [1, 2, 3],
+            }
+        )
+    )
+    compact = to_compact(clean)
+    assert str(compact["date"].dtype) == "datetime64[s, UTC]"
+    assert list(compact["date"].dt.hour) == [20, 3, 3]
+    pd.testing.assert_frame_equal(to_canonical(compact), clean)
+    pd.testing.assert_frame_equal(clean_and_validate(compact), clean)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+
+from swing_trade_b3.adapters.persistence.dataset import (
+    dataset_filter,
+    load_dataset,
+    save_dataset,
+    symbol_bucket,
+)
+
+
+def make_universe(symbols, days):
+    dates = pd.bdate_range(days[0], days[1], tz="UTC")
+    return pd.DataFrame(
+        {
+            "date": [d for _ in symbols for d in dates],
+            "symbol": [s for s in symbols for _ in dates],
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": [float(i) for i in range(len(symbols) * len(dates))],
+            "volume": 100,
+        }
+    )
+
+
+def test_save_dataset_layout_and_upsert(tmp_path):
+    base = tmp_path / "dataset"
+    df = make_universe(["PETR4", "VALE3", "ITUB4"], ("2023-12-27", "2024-01-05"))
+    paths = save_dataset(df, base, buckets=4)
+    assert all(p.name == "data.parquet" for p in paths)
+    assert {p.parent.parent.name for p in paths} == {"year=2023", "year=2024"}
+    assert {p.parent.name for p in paths} <= {f"bucket={b:02d}" for b in range(4)}
+
+    # upsert: overlapping row replaced, nothing duplicated
+    fix = df[(df["symbol"] == "VALE3") & (df["date"] == pd.Timestamp("2024-01-02", tz="UTC"))]
+    save_dataset(fix.assign(close=999.0), base, buckets=4, compression="none")
+    out = load_dataset(base, buckets=4)
+    assert len(out) == len(df)
+    assert out.duplicated(["symbol", "date"]).sum() == 0
+    row = out[(out["symbol"] == "VALE3") & (out["date"] == pd.Timestamp("2024-01-02", tz="UTC"))]
+    assert row["close"].item() == 999.0
+    assert list(out.columns) == ["date", "symbol", "open", "high", "low", "close", "volume"]
+    assert out["symbol"].dtype == "string" and str(out["date"].dt.tz) == "UTC"
+
+    assert save_dataset(df.iloc[0:0], base) == []
+
+
+def test_load_dataset_filters_and_projection(tmp_path):
+    base = tmp_path / "dataset"
+    assert load_dataset(base).empty
+    base.mkdir()
+    assert load_dataset(base).empty
+
+    df = make_universe(["PETR4", "VALE3", "ITUB4", "BBDC4"], ("2022-12-01", "2024-02-29"))
+    save_dataset(df, base)
+
+    # cross-sectional: all closes on a date
+    snap = load_dataset(
+        base, start=date(2024, 1, 2), end=date(2024, 1, 2), columns=["symbol", "close"]
+    )
+    assert list(snap.columns) == ["symbol", "close"] and len(snap) == 4
+
+    one = load_dataset(base, symbols=["VALE3"], start=pd.Timestamp("2023-06-01"))
+    assert set(one["symbol"]) == {"VALE3"}
+    assert one["date"].min() >= pd.Timestamp("2023-06-01", tz="UTC")
+    assert one["date"].is_monotonic_increasing
+
+    dates_only = load_dataset(base, symbols=["PETR4"], columns=["date"])
+    assert list(dates_only.columns) == ["date"] and len(dates_only) == len(df) // 4
+    assert load_dataset(base, columns=["volume"])["volume"].eq(100).all()
+
+
+def test_dataset_filter_prunes_partitions():
+    assert dataset_filter() is None
+    expr = str(
+        dataset_filter(symbols=["PETR4"], end=pd.Timestamp("2024-01-31", tz="America/Sao_Paulo"))
+    )
+    assert "bucket" in expr and str(symbol_bucket("PETR4")) in expr
+    assert "year" in expr and "date" in expr
+
+
+def test_save_dataset_upserts_compact_frames_on_the_same_stamps(tmp_path):
+    from swing_trade_b3.services.signals import to_compact
+
+    base = tmp_path / "dataset"
+    df = make_universe(["PETR4"], ("2024-01-02", "2024-01-05"))
+    df["date"] += pd.Timedelta(hours=3)
+    save_dataset(df, base)
+    save_dataset(to_compact(df.tail(1).assign(close=9.0)), base)
+    out = load_dataset(base)
+    assert len(out) == len(df) and list(out["date"]) == list(df["date"])
+    assert out["close"].iloc[-1] == 9.0
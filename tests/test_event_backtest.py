@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swing_trade_b3.domain.ports import OrderExecutorPort
+from swing_trade_b3.services import event_backtest as eb
+
+
+def make_prices(rows: dict[str, list[tuple[float, float, float, float]]]) -> pd.DataFrame:
+    """Bars from (open, high, low, close) tuples, one business day apart per symbol."""
+    frames = []
+    for sym, bars in rows.items():
+        o, h, lo, c = (list(col) for col in zip(*bars))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": pd.bdate_range("2024-01-01", periods=len(bars), tz="UTC"),
+                    "symbol": sym,
+                    "open": o,
+                    "high": h,
+                    "low": lo,
+                    "close": c,
+                    "volume": 100,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+class Script:
+    """Places the scripted orders on the n-th bar seen of each symbol."""
+
+    def __init__(self, script: dict[tuple[str, int], list[tuple]]):
+        self.script = script
+        self.seen: dict[str, int] = {}
+        self.ids: list[str] = []
+
+    def on_bar(self, bar: eb.Bar, broker: eb.SimulatedBroker) -> None:
+        n = self.seen.get(bar.symbol, 0)
+        self.seen[bar.symbol] = n + 1
+        for qty, side, kwargs in self.script.get((bar.symbol, n), []):
+            self.ids.append(broker.place_order(bar.symbol, qty, side, **kwargs))
+
+
+FLAT = (100.0, 100.0, 100.0, 100.0)
+
+
+def test_market_orders_fill_next_open_and_mark_to_close():
+    prices = make_prices(
+        {"AAA": [FLAT, (101.0, 106.0, 100.0, 105.0), (107.0, 111.0, 106.0, 110.0), FLAT]}
+    )
+    strategy = Script({("AAA", 0): [(10, "buy", {})], ("AAA", 1): [(10, "sell", {})]})
+    res = eb.run_event_backtest(prices, strategy, cash=10_000.0, fee_rate=0.001)
+    orders = res.orders
+    assert list(orders["fill_price"]) == [101.0, 107.0]
+    assert list(orders["filled"].dt.day) == [2, 3]
+    assert list(orders["status"]) == ["filled", "filled"]
+    fees = 0.001 * 10 * (101 + 107)
+    assert orders["pnl"].iloc[1] == pytest.approx(60.0 - 1.07)
+    np.testing.assert_allclose(
+        res.equity.to_numpy(),
+        [10_000.0, 10_000 + 40 - 1.01, 10_000 + 60 - fees, 10_000 + 60 - fees],
+    )
+    assert res.metrics["hit_rate"] == 1.0 and res.metrics["fills"] == 2
+    assert res.metrics["total_return"] == pytest.approx((60 - fees) / 10_000)
+    assert res.positions["qty"].tolist() == [0]
+
+
+def test_stop_and_limit_orders_fill_at_trigger_or_gap():
+    prices = make_prices(
+        {
+            # sell stop 95: gap below on bar 2 (open 93); sell limit 110 reached intrabar
+            "AAA": [FLAT, FLAT, (93.0, 94.0, 90.0, 92.0)],
+            "BBB": [FLAT, (104.0, 112.0, 103.0, 108.0), FLAT],
+            # buy stop 105 and buy limit 97, both reached intrabar on bar 1
+            "CCC": [FLAT, (101.0, 106.0, 96.0, 100.0), FLAT],
+        }
+    )
+    script = {
+        ("AAA", 0): [(5, "sell", {"stop": 95.0})],
+        ("BBB", 0): [(5, "sell", {"limit": 110.0})],
+        ("CCC", 0): [(1, "buy", {"stop": 105.0}), (1, "buy", {"limit": 97.0})],
+    }
+    res = eb.run_event_backtest(prices, Script(script))
+    fills = res.orders.set_index(["symbol", "kind"])
+    assert fills.loc[("AAA", "stop"), "fill_price"] == 93.0
+    assert fills.loc[("AAA", "stop"), "filled"].day == 3
+    assert fills.loc[("BBB", "limit"), "fill_price"] == 110.0
+    assert fills.loc[("CCC", "stop"), "fill_price"] == 105.0
+    assert fills.loc[("CCC", "limit"), "fill_price"] == 97.0
+    pos = res.positions.set_index("symbol")
+    assert pos.loc["AAA", "qty"] == -5 and pos.loc["CCC", "qty"] == 2
+    assert math.isnan(res.metrics["hit_rate"])  # nothing was closed
+
+    # a gap through a take-profit fills at the better open
+    prices = make_prices({"AAA": [FLAT, (115.0, 116.0, 114.0, 115.0)]})
+    res = eb.run_event_backtest(prices, Script({("AAA", 0): [(1, "sell", {"limit": 110.0})]}))
+    assert res.orders["fill_price"].iloc[0] == 115.0
+
+
+def test_orders_placed_for_later_symbols_wait_for_their_next_bar():
+    prices = make_prices({"AAA": [FLAT, FLAT], "BBB": [FLAT, (102.0, 102.0, 102.0, 102.0)]})
+
+    class CrossSymbol:
+        def on_bar(self, bar: eb.Bar, broker: eb.SimulatedBroker) -> None:
+            if bar.symbol == "AAA" and bar.date.day == 1:
+                broker.place_order("BBB", 1, "buy")
+
+    res = eb.run_event_backtest(prices, CrossSymbol())
+    # BBB's first bar is on the same date, after AAA's: the order fills on the next one
+    assert res.orders["fill_price"].iloc[0] == 102.0
+
+
+def test_position_accounting_with_flips_and_working_orders():
+    broker = eb.SimulatedBroker(["AAA"], cash=1_000.0, capacity=1)
+    assert isinstance(broker, OrderExecutorPort)
+    bar = eb.Bar("AAA", 1, 10.0, 10.0, 10.0, 10.0, 1)
+    for qty, side in [(4, "buy"), (2, "buy"), (3, "sell"), (6, "sell"), (3, "buy")]:
+        broker.place_order("AAA", qty, side)
+        bar.time += 1
+        broker.step(0, bar)
+        bar.open = bar.high = bar.low = bar.close = bar.close + 1.0
+    assert len(broker.orders) >= 5 and broker.count == 5
+    pos = broker.position("AAA")
+    # +4@10, +2@11 (avg 31/3), -3@12 closes 3, -6@13 closes 3 and opens -3@13, +3@14 closes
+    assert pos.qty == 0 and pos.avg_price == 0.0
+    assert pos.realized == pytest.approx(3 * (12 - 31 / 3) + 3 * (13 - 31 / 3) - 3)
+    assert broker.equity == pytest.approx(1_000.0 + pos.realized)
+    frame = broker.order_frame()
+    assert frame["closed"].tolist() == [0, 0, 3, 3, 3]
+
+    order_id = broker.place_order("AAA", 1, "buy", limit=1.0)
+    assert broker.cancel_order(order_id) and not broker.cancel_order(order_id)
+    assert not broker.cancel_order("99")
+    assert broker.order_frame()["status"].iloc[-1] == "cancelled"
+
+    with pytest.raises(ValueError, match="unknown symbol"):
+        broker.place_order("ZZZ", 1, "buy")
+    with pytest.raises(ValueError, match="side"):
+        broker.place_order("AAA", 1, "hold")
+    with pytest.raises(ValueError, match="qty"):
+        broker.place_order("AAA", 0, "buy")
+    with pytest.raises(ValueError, match="either"):
+        broker.place_order("AAA", 1, "buy", stop=1.0, limit=1.0)
+
+
+def test_one_cancels_other_orders():
+    broker = eb.SimulatedBroker(["AAA", "BBB"], cash=1_000.0)
+    bar = eb.Bar("AAA", 1, 10.0, 10.0, 10.0, 10.0, 1)
+    broker.place_order("AAA", 5, "buy")
+    bar.time += 1
+    broker.step(0, bar)
+    stop = broker.place_order("AAA", 5, "sell", stop=9.0)
+    limit = broker.place_order("AAA", 5, "sell", limit=11.0, oco=stop)
+    bar.time, bar.high, bar.low = bar.time + 1, 12.0, 8.0  # wide bar: reaches both legs
+    broker.step(0, bar)
+    assert broker.order_frame()["status"].tolist() == ["filled", "filled", "cancelled"]
+    assert broker.position("AAA").qty == 0 and not broker._working[0]
+    assert not broker.cancel_order(limit)
+
+    # cancelling one leg unlinks the other, which stays working
+    stop = broker.place_order("AAA", 1, "sell", stop=1.0)
+    limit = broker.place_order("AAA", 1, "sell", limit=99.0, oco=stop)
+    assert broker.cancel_order(stop) and broker._working[0] == [int(limit)]
+    assert not broker._oco
+    linked = broker.place_order("AAA", 1, "buy", limit=1.0, oco=limit)  # already linked
+    for bad in ("99", stop, limit, linked, broker.place_order("BBB", 1, "buy")):
+        with pytest.raises(ValueError, match="oco"):
+            broker.place_order("AAA", 1, "sell", oco=bad)
+
+
+def test_empty_prices():
+    res = eb.run_event_backtest(make_prices({"AAA": [FLAT]}).iloc[:0], Script({}))
+    assert res.equity.empty and res.orders.empty and res.metrics["total_return"] == 0.0
+    assert math.isnan(res.metrics["hit_rate"]) and res.metrics["max_drawdown"] == 0.0
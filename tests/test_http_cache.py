@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+
+from swing_trade_b3.adapters.connectors.market_data.http_cache import (
+    CacheEntry,
+    HttpCache,
+    get_cache,
+)
+
+
+class Clock:
+    def __init__(self, now=1_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_put_get_refresh_and_validators(tmp_path):
+    clock = Clock()
+    cache = HttpCache(tmp_path / "http", ttl_s=60, clock=clock)
+    url = "https://brapi.dev/api/quote/PETR4?interval=1d&range=1mo"
+    assert cache.get(url) is None
+
+    cache.put(url, b'{"ok": 1}', etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    entry = cache.get(url)
+    assert entry is not None and entry.body == b'{"ok": 1}' and entry.is_fresh(60, clock())
+    assert entry.validators() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT",
+    }
+
+    clock.now += 61
+    stale = cache.get(url)
+    assert stale is not None and not stale.is_fresh(60, clock())
+    # freshness follows the TTL of the cache instance that serves the entry
+    assert not cache.is_fresh(stale)
+    assert HttpCache(tmp_path / "http", ttl_s=120, clock=clock).is_fresh(stale)
+    renewed = cache.refresh(stale)
+    assert renewed.body == stale.body and renewed.is_fresh(60, clock())
+    assert cache.get(url) == renewed
+    assert CacheEntry(url, b"", 0.0).validators() == {}
+
+    # corrupt/foreign sidecars are treated as misses
+    body_path, meta_path = cache._paths(url)
+    body_path.write_bytes(b"{")
+    assert cache.get(url) is None
+    meta_path.write_text("{not json")
+    assert cache.get(url) is None
+
+    cache.clear()
+    assert not list((tmp_path / "http").iterdir())
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = HttpCache(tmp_path, max_bytes=25)
+    for i, name in enumerate(("a", "b", "c")):
+        cache.put(f"https://x/{name}", b"x" * 10)
+        # deterministic LRU clock: older entries get older sidecar mtimes
+        os.utime(cache._paths(f"https://x/{name}")[1], (i, i))
+        if name == "b":
+            assert cache.get("https://x/a") is not None  # touch: a becomes most recent
+    assert cache.get("https://x/a") is not None
+    assert cache.get("https://x/b") is None
+    assert cache.get("https://x/c") is not None
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.body")) <= 25
+
+
+def test_cache_eviction_tolerates_orphan_sidecars(tmp_path):
+    cache = HttpCache(tmp_path, max_bytes=5)
+    (tmp_path / "orphan.json").write_text("{}")
+    cache.put("https://x/big", b"x" * 10)
+    # the only real entry exceeds the budget and is evicted; the orphan is skipped
+    assert cache.get("https://x/big") is None
+
+
+def test_get_cache_is_shared_per_configuration(tmp_path):
+    a = get_cache(tmp_path, 60, 1024)
+    assert get_cache(str(tmp_path), 60.0, 1024) is a
+    assert get_cache(tmp_path, 120, 1024) is not a
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swing_trade_b3.adapters.persistence import indicator_store as store
+from swing_trade_b3.adapters.persistence.repositories import save_processed
+from swing_trade_b3.services.indicator_state import (
+    STREAMING_COLUMNS,
+    IndicatorState,
+    RsiState,
+)
+from swing_trade_b3.services.indicators import compute_indicators
+from tests.test_indicators import make_bars
+
+
+def test_streaming_matches_batch_for_whole_history():
+    df = make_bars({"AAA": 80})
+    state = IndicatorState()
+    out = state.advance(df)
+    batch = compute_indicators(df)[STREAMING_COLUMNS]
+    pd.testing.assert_frame_equal(out, batch, rtol=1e-9)
+    assert state.last_date == df["date"].iloc[-1]
+    assert state.latest() == pytest.approx(dict(batch.iloc[-1]), rel=1e-9)
+
+
+def test_resume_after_round_trip_matches_batch():
+    df = make_bars({"BBB": 60})
+    state = IndicatorState.create(rsi_period=5, macd_spans=(3, 6, 4), atr_period=4)
+    state.advance(df.iloc[:20])
+    state = IndicatorState.from_dict(json.loads(json.dumps(state.to_dict())))
+    # bars already folded are skipped; only the new ones produce values
+    out = state.advance(df.iloc[10:])
+    batch = compute_indicators(df, rsi_period=5, macd_spans=(3, 6, 4), atr_period=4)
+    pd.testing.assert_frame_equal(out, batch[STREAMING_COLUMNS].iloc[20:], rtol=1e-9)
+
+
+def test_warm_up_and_flat_prices():
+    state = IndicatorState()
+    assert all(math.isnan(v) for v in state.latest().values())
+    day = pd.Timestamp("2024-01-02", tz="UTC")
+    for i in range(15):
+        state.update(day + pd.Timedelta(days=i), 1.0, 1.0, 1.0)
+    assert state.latest() == {
+        "rsi": 50.0,
+        "macd": 0.0,
+        "macd_signal": 0.0,
+        "macd_hist": 0.0,
+        "atr": 0.0,
+    }
+    rsi = RsiState(period=1)
+    assert math.isnan(rsi.update(10.0)) and rsi.update(11.0) == 100.0
+    with pytest.raises(ValueError, match="not newer"):
+        state.update(day, 1.0, 1.0, 1.0)
+    with pytest.raises(ValueError, match="version"):
+        IndicatorState.from_dict({**state.to_dict(), "version": 0})
+
+
+def test_update_indicator_state_is_incremental(tmp_path, monkeypatch):
+    df = make_bars({"CCC": 50})
+    save_processed("CCC", df.iloc[:30], tmp_path)
+    state, status = store.update_indicator_state("CCC", tmp_path)
+    assert status == "created" and store.indicator_state_path("CCC", tmp_path).exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+    def no_read(*a, **k):  # noqa: ANN001
+        raise AssertionError("folded history should not be read")
+
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_parquet", no_read)
+        _state, status = store.update_indicator_state("CCC", tmp_path)
+    assert status == "unchanged"
+
+    # new days land in tail files: only those are read, the base is not
+    save_processed("CCC", df.iloc[:40], tmp_path)
+    save_processed("CCC", df, tmp_path)
+    real_read = pd.read_parquet
+    read: list[str] = []
+
+    def spy(path, *a, **k):  # noqa: ANN001
+        read.append(Path(path).name)
+        return real_read(path, *a, **k)
+
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_parquet", spy)
+        state, status = store.update_indicator_state("CCC", tmp_path)
+    assert status == "updated" and state.last_date == df["date"].iloc[-1]
+    assert read == ["CCC.tail-000001.parquet", "CCC.tail-000002.parquet"]
+    batch = compute_indicators(df)[STREAMING_COLUMNS].iloc[-1]
+    loaded = store.load_indicator_state("CCC", tmp_path)
+    assert loaded is not None
+    assert loaded.latest() == pytest.approx(dict(batch), rel=1e-9)
+
+
+def test_update_indicator_state_rebuilds_on_changes(tmp_path):
+    df = make_bars({"DDD": 40})
+    save_processed("DDD", df, tmp_path)
+    store.update_indicator_state("DDD", tmp_path)
+
+    # the stored last bar's close was corrected
+    fixed = df.copy()
+    fixed.loc[fixed.index[-1], "close"] *= 1.1
+    save_processed("DDD", fixed, tmp_path)
+    state, status = store.update_indicator_state("DDD", tmp_path)
+    assert status == "rebuilt" and state.last_close == fixed["close"].iloc[-1]
+
+    # an earlier bar was corrected and a day appended in the same write
+    edited = pd.concat([fixed, make_bars({"DDD": 41}).iloc[-1:]], ignore_index=True)
+    edited.loc[edited.index[5], "close"] *= 0.9
+    save_processed("DDD", edited, tmp_path)
+    state, status = store.update_indicator_state("DDD", tmp_path)
+    assert status == "rebuilt"
+    expected = compute_indicators(edited)[STREAMING_COLUMNS].iloc[-1]
+    assert state.latest() == pytest.approx(dict(expected), rel=1e-9)
+    _state, status = store.update_indicator_state("DDD", tmp_path)
+    assert status == "unchanged"
+
+    # states saved without a fingerprint (or by older versions) are rebuilt once
+    payload = {**state.to_dict(), "history_fingerprint": None}
+    store.indicator_state_path("DDD", tmp_path).write_text(json.dumps(payload))
+    _state, status = store.update_indicator_state("DDD", tmp_path)
+    assert status == "rebuilt"
+
+    # other parameters
+    state, status = store.update_indicator_state("DDD", tmp_path, atr_period=5)
+    assert status == "rebuilt" and state.atr.period == 5
+    expected = compute_indicators(edited, atr_period=5)["atr"].iloc[-1]
+    assert np.isclose(state.atr.current(), expected, rtol=1e-9)
+
+    # CSV data has no parts fingerprint: rebuilt from the whole file on every call
+    save_processed("CSV", df, tmp_path, fmt="csv")
+    _state, status = store.update_indicator_state("CSV", tmp_path)
+    assert status == "created"
+    state, status = store.update_indicator_state("CSV", tmp_path)
+    assert status == "rebuilt" and state.last_close == df["close"].iloc[-1]
+
+
+def test_load_indicator_state_missing_and_unreadable(tmp_path):
+    assert store.load_indicator_state("EEE", tmp_path) is None
+    store.indicator_state_path("EEE", tmp_path).write_text("{not json", encoding="utf-8")
+    assert store.load_indicator_state("EEE", tmp_path) is None
+    save_processed("EEE", make_bars({"EEE": 5}).iloc[:0], tmp_path)
+    state, status = store.update_indicator_state("EEE", tmp_path)
+    assert status == "created" and state.last_date is None
+    _state, status = store.update_indicator_state("EEE", tmp_path)
+    assert status == "unchanged"
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.services import indicators as ind
+from swing_trade_b3.services.signals import STD_COLS, to_compact
+
+
+def make_bars(lengths: dict[str, int], seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, (sym, n) in enumerate(lengths.items()):
+        close = 10.0 ** (i + 1) * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": pd.bdate_range("2024-01-01", periods=n, tz="UTC"),
+                    "symbol": sym,
+                    "open": close,
+                    "high": close * 1.01,
+                    "low": close * 0.98,
+                    "close": close,
+                    "volume": 100,
+                }
+            )
+        )
+    df = pd.concat(frames, ignore_index=True)
+    return df.astype({"symbol": "string"})[STD_COLS]
+
+
+def reference(g: pd.DataFrame) -> pd.DataFrame:
+    """Textbook per-symbol pandas formulations."""
+    close = g["close"]
+    delta = close.diff().dropna()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta).clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    rsi = (100 * gain / (gain + loss)).reindex(close.index)
+    rsi.iloc[:14] = np.nan
+    line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    signal = line.ewm(span=9, adjust=False).mean()
+    prev = close.shift()
+    tr = pd.concat(
+        [g["high"] - g["low"], (g["high"] - prev).abs(), (g["low"] - prev).abs()], axis=1
+    ).max(axis=1)
+    atr = tr.ewm(alpha=1 / 14, adjust=False).mean()
+    atr.iloc[:13] = np.nan
+    mid = close.rolling(20).mean()
+    std = close.rolling(20).std(ddof=0)
+    return pd.DataFrame(
+        {
+            "rsi": rsi,
+            "macd": line,
+            "macd_signal": signal,
+            "macd_hist": line - signal,
+            "atr": atr,
+            "bb_mid": mid,
+            "bb_upper": mid + 2 * std,
+            "bb_lower": mid - 2 * std,
+        }
+    )
+
+
+def test_compute_indicators_matches_per_symbol_pandas():
+    # magnitudes differ by 10x per symbol; one symbol is shorter than every warm-up
+    df = make_bars({"AAA3": 300, "BBB4": 120, "CCC3": 5, "DDD3": 60})
+    out = ind.compute_indicators(df)
+    expected = pd.concat([reference(g) for _sym, g in df.groupby("symbol", sort=False)])
+    assert list(out.columns) == STD_COLS + list(expected.columns)
+    pd.testing.assert_frame_equal(out[STD_COLS], df)
+    pd.testing.assert_frame_equal(out[expected.columns], expected, rtol=1e-9)
+
+    # single-indicator helpers agree with the combined pass
+    pd.testing.assert_series_equal(ind.rsi(df), out["rsi"])
+    pd.testing.assert_frame_equal(ind.macd(df), out[["macd", "macd_signal", "macd_hist"]])
+    pd.testing.assert_series_equal(ind.atr(df), out["atr"])
+    pd.testing.assert_frame_equal(ind.bollinger(df), out[["bb_mid", "bb_upper", "bb_lower"]])
+    ema = ind.ema(df, 5, column="volume")
+    assert ema.name == "ema_5" and np.allclose(ema, 100.0)
+
+
+def test_unordered_and_compact_inputs_align_to_the_input_index():
+    df = make_bars({"AAA3": 80, "BBB4": 70, "CCC3": 90})
+    out = ind.compute_indicators(df)
+
+    shuffled = df.sample(frac=1.0, random_state=3)
+    pd.testing.assert_frame_equal(ind.compute_indicators(shuffled).loc[df.index], out)
+    # interleaved symbols in date order (e.g. a cross-section) are regrouped too
+    by_date = df.sort_values(["date", "symbol"])
+    pd.testing.assert_frame_equal(ind.compute_indicators(by_date).loc[df.index], out)
+
+    compact = ind.compute_indicators(to_compact(df))
+    assert compact["rsi"].dtype == "float64"
+    pd.testing.assert_series_equal(compact["macd"], out["macd"], rtol=1e-5, atol=1e-3)
+
+
+def test_edge_cases_flat_prices_and_empty_frames():
+    flat = make_bars({"FLAT3": 30}).assign(open=5.0, high=5.0, low=5.0, close=5.0)
+    out = ind.compute_indicators(flat)
+    assert out["rsi"].iloc[:14].isna().all() and (out["rsi"].iloc[14:] == 50.0).all()
+    assert (out["atr"].dropna() == 0).all() and (out["bb_upper"].dropna() == 5.0).all()
+
+    empty = make_bars({"NONE3": 0})
+    result = ind.compute_indicators(empty)
+    assert result.empty and "bb_lower" in result.columns
+    assert ind.rsi(make_bars({"ONE3": 1})).isna().all()
@@ -443,3 +443,350 @@ def test_cmd_process_exception_branch(monkeypatch, tmp_path):
     monkeypatch.setattr(main_mod, "save_processed", boom)
     rc = main_mod._cmd_process(ns3)
     assert rc == 1
+
+
+def test_fetch_command_concurrent_workers_keeps_order(monkeypatch, tmp_path, capsys):
+    import threading
+
+    seen_threads: set[int] = set()
+
+    def fake_fetch(symbol, start, end, throttle_wait=None, meta=None, **kwargs):  # noqa: ARG001
+        throttle_wait()
+        seen_threads.add(threading.get_ident())
+        if symbol == "ERR":
+            raise RuntimeError("boom")
+        if meta is not None:
+            meta["provider"] = "brapi"
+        return pd.DataFrame.from_records(
+            [
+                {
+                    "date": pd.Timestamp("2024-01-02", tz="UTC"),
+                    "symbol": symbol,
+                    "open": 1.0,
+                    "high": 2.0,
+                    "low": 0.5,
+                    "close": 1.5,
+                    "volume": 10,
+                }
+            ]
+        )
+
+    def fake_save_raw(symbol, df, base_dir, fmt="csv", **kwargs):  # noqa: ARG001
+        return [Path(base_dir) / symbol / "2024.csv"]
+
+    monkeypatch.setattr("swing_trade_b3.__main__.fetch_daily", fake_fetch)
+    monkeypatch.setattr("swing_trade_b3.__main__.save_raw", fake_save_raw)
+
+    symbols = ["A1", "B2", "ERR", "C3", "D4"]
+    rc = main(
+        ["fetch", "--symbol", *symbols]
+        + ["--start", "2024-01-01", "--end", "2024-01-10", "--out", str(tmp_path)]
+        + ["--workers", "3", "--json-summary", "-"]
+    )
+    assert rc == 0
+    out = capsys.readouterr().out
+    payload = json.loads(out.strip().splitlines()[-1])
+    assert [s["symbol"] for s in payload["symbols"]] == symbols
+    assert payload["summary"] == {
+        "ok": 4,
+        "up_to_date": 0,
+        "no_data": 0,
+        "failed": 1,
+        "total": 5,
+    }
+    assert "Resumo: 4/5 símbolos com sucesso." in out
+    assert seen_threads
+
+    # invalid worker count
+    rc = main(
+        ["fetch", "--symbol", "A1", "--start", "2024-01-01", "--end", "2024-01-02"]
+        + ["--out", str(tmp_path), "--workers", "0"]
+    )
+    assert rc == 2
+
+
+def test_fetch_incremental_skips_up_to_date_and_narrows_window(monkeypatch, tmp_path, capsys):
+    from datetime import date
+
+    base = tmp_path / "raw"
+    for sym, day in (("FRESH", "2024-01-10"), ("STALE", "2024-01-03"), ("HOLI", "2024-01-05")):
+        d = base / sym
+        d.mkdir(parents=True)
+        (d / "2024.csv").write_text(
+            "date,symbol,open,high,low,close,volume\n" f"{day} 00:00:00+00:00,{sym},1,1,1,1,1\n"
+        )
+
+    calls: list[tuple[str, date, date]] = []
+
+    def fake_fetch(symbol, start, end, meta=None, **kwargs):  # noqa: ARG001
+        calls.append((symbol, start, end))
+        if symbol == "HOLI":
+            return pd.DataFrame(
+                columns=["date", "symbol", "open", "high", "low", "close", "volume"]
+            )
+        return pd.DataFrame.from_records(
+            [
+                {
+                    "date": pd.Timestamp("2024-01-09", tz="UTC"),
+                    "symbol": symbol,
+                    "open": 1.0,
+                    "high": 1.0,
+                    "low": 1.0,
+                    "close": 1.0,
+                    "volume": 1,
+                }
+            ]
+        )
+
+    monkeypatch.setattr("swing_trade_b3.__main__.fetch_daily", fake_fetch)
+    rc = main(
+        ["fetch", "-s", "FRESH", "STALE", "HOLI", "NEW", "--start", "2024-01-01"]
+        + ["--end", "2024-01-10", "--out", str(base), "--incremental", "--json-summary", "-"]
+    )
+    assert rc == 0
+    out = capsys.readouterr().out
+    payload = json.loads(out.strip().splitlines()[-1])
+    statuses = {s["symbol"]: s["status"] for s in payload["symbols"]}
+    assert statuses == {"FRESH": "up_to_date", "STALE": "ok", "HOLI": "up_to_date", "NEW": "ok"}
+    assert payload["summary"]["up_to_date"] == 2 and payload["run"]["args"]["incremental"]
+    # FRESH never hits the network; STALE only asks for the gap
+    assert [c[0] for c in calls] == ["STALE", "HOLI", "NEW"]
+    assert calls[0][1] == date(2024, 1, 4) and calls[2][1] == date(2024, 1, 1)
+
+    # only a weekend left after the last stored session -> no request
+    calls.clear()
+    rc = main(
+        ["fetch", "-s", "HOLI", "--start", "2024-01-01", "--end", "2024-01-07"]
+        + ["--out", str(base), "--incremental"]
+    )
+    assert rc == 0 and calls == []
+
+
+def test_process_command_writes_consolidated_dataset(tmp_path, capsys):
+    from swing_trade_b3.adapters.persistence.dataset import load_dataset
+
+    raw_dir = tmp_path / "raw" / "DS3"
+    raw_dir.mkdir(parents=True)
+    (raw_dir / "2024.csv").write_text(
+        "date,symbol,open,high,low,close,volume\n"
+        "2024-01-02 00:00:00+00:00,DS3,1,2,0.5,1.5,10\n"
+        "2024-01-03 00:00:00+00:00,DS3,1,2,0.5,1.6,11\n"
+    )
+    rc = main(
+        ["process", "-s", "DS3", "--raw", str(tmp_path / "raw")]
+        + ["--out", str(tmp_path / "processed"), "--format", "csv"]
+        + ["--dataset", str(tmp_path / "dataset")]
+    )
+    assert rc == 0
+    out = load_dataset(tmp_path / "dataset", symbols=["DS3"])
+    assert list(out["close"]) == [1.5, 1.6]
+
+
+def _write_raw_csv(base, sym, closes):
+    sym_dir = base / sym
+    sym_dir.mkdir(parents=True, exist_ok=True)
+    lines = ["date,symbol,open,high,low,close,volume"]
+    for i, c in enumerate(closes):
+        lines.append(f"2024-01-0{i + 2} 00:00:00+00:00,{sym},1,9,0.5,{c},10")
+    (sym_dir / "2024.csv").write_text("\n".join(lines) + "\n")
+
+
+def test_process_command_workers_pool_and_json_summary(tmp_path, capsys):
+    from swing_trade_b3.adapters.persistence.dataset import load_dataset
+
+    raw = tmp_path / "raw"
+    _write_raw_csv(raw, "PA1", [1.5, 1.6])
+    _write_raw_csv(raw, "PA2", [2.5])
+    rc = main(
+        ["process", "-s", "PA1", "MISS", "PA2", "--raw", str(raw)]
+        + ["--out", str(tmp_path / "processed"), "--format", "csv"]
+        + ["--dataset", str(tmp_path / "dataset"), "--workers", "2", "--json-summary", "-"]
+    )
+    assert rc == 0
+    lines = capsys.readouterr().out.splitlines()
+    # results are reported in input order regardless of completion order
+    assert lines[0].startswith("[PA1] Processado 2 linhas")
+    assert lines[1].startswith("[MISS] Nenhum dado bruto")
+    assert lines[2].startswith("[PA2] Processado 1 linhas")
+    assert "Resumo processamento: 2/3" in lines[3]
+    payload = json.loads(lines[-1])
+    assert payload["summary"] == {"ok": 2, "no_data": 1, "failed": 0, "total": 3}
+    assert [s["status"] for s in payload["symbols"]] == ["ok", "no_data", "ok"]
+    assert payload["symbols"][0]["date_last"] == "2024-01-03"
+    assert payload["symbols"][0]["missing_sessions"] == 0
+    assert payload["run"]["args"]["workers"] == 2 and payload["dataset_error"] is None
+    ds = load_dataset(tmp_path / "dataset")
+    assert sorted(ds["symbol"].unique()) == ["PA1", "PA2"]
+
+
+def test_process_command_updates_indicator_state(tmp_path, capsys):
+    from swing_trade_b3.adapters.persistence.indicator_store import load_indicator_state
+
+    raw, out = tmp_path / "raw", tmp_path / "processed"
+    _write_raw_csv(raw, "IS1", [1.5, 1.6, 1.4])
+    base = ["process", "-s", "IS1", "--raw", str(raw), "--out", str(out), "--indicators"]
+    assert main(base + ["--json-summary", "-"]) == 0
+    payload = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert payload["symbols"][0]["indicators"] == "created"
+    state = load_indicator_state("IS1", out)
+    assert state is not None and state.last_close == 1.4
+
+    # a windowed run folds the merged processed history, not just the window
+    assert main(base + ["--start", "2024-01-04", "--json-summary", "-"]) == 0
+    payload = json.loads(capsys.readouterr().out.splitlines()[-1])
+    assert payload["symbols"][0]["indicators"] == "unchanged"
+
+
+def test_process_command_appends_new_raw_days_as_tail_file(tmp_path, capsys):
+    from swing_trade_b3.adapters.persistence.repositories import load_processed, processed_marker
+
+    raw, out = tmp_path / "raw", tmp_path / "processed"
+    base = ["process", "-s", "TL1", "--raw", str(raw), "--out", str(out)]
+    _write_raw_csv(raw, "TL1", [1.5, 1.6, 1.4])
+    assert main(base) == 0
+    stored = processed_marker(out / "TL1.parquet")
+    _write_raw_csv(raw, "TL1", [1.5, 1.6, 1.4, 1.7])  # one more raw day
+    assert main(base) == 0
+    capsys.readouterr()
+    assert processed_marker(out / "TL1.parquet") == stored  # the base is not rewritten
+    tail = processed_marker(out / "TL1.tail-000001.parquet")
+    assert tail is not None and tail["rows"] == 1
+    assert load_processed("TL1", out)["close"].tolist() == [1.5, 1.6, 1.4, 1.7]
+
+
+def test_process_command_invalid_workers_and_dataset_failure(monkeypatch, tmp_path, capsys):
+    raw = tmp_path / "raw"
+    _write_raw_csv(raw, "DF1", [1.5])
+    base = ["process", "-s", "DF1", "--raw", str(raw), "--out", str(tmp_path / "p")]
+    assert main(base + ["--format", "csv", "--workers", "0"]) == 2
+
+    def boom(*a, **k):  # noqa: ANN001
+        raise OSError("disk full")
+
+    monkeypatch.setattr(main_mod, "save_dataset", boom)
+    summary = tmp_path / "s" / "process.json"
+    rc = main(
+        base
+        + ["--format", "csv", "--dataset", str(tmp_path / "ds")]
+        + ["--json-summary", str(summary)]
+    )
+    assert rc == 1
+    assert "Erro ao gravar dataset: disk full" in capsys.readouterr().out
+    data = json.loads(summary.read_text(encoding="utf-8"))
+    assert data["summary"]["ok"] == 1 and data["dataset_error"] == "disk full"
+
+
+def test_fetch_command_passes_http_cache_settings(monkeypatch, tmp_path):
+    configs = []
+
+    def fake_fetch(symbol, start, end, http=None, **kwargs):  # noqa: ARG001
+        configs.append(http)
+        return pd.DataFrame(columns=["date", "symbol", "open", "high", "low", "close", "volume"])
+
+    monkeypatch.setattr("swing_trade_b3.__main__.fetch_daily", fake_fetch)
+    cache_dir = str(tmp_path / "http")
+    main(
+        ["fetch", "-s", "HC1", "--start", "2024-01-01", "--end", "2024-01-10"]
+        + ["--out", str(tmp_path), "--http-cache", cache_dir, "--http-cache-ttl", "120"]
+    )
+    main(["fetch", "-s", "HC1", "--start", "2024-01-01", "--end", "2024-01-10"])
+    assert (configs[0].cache_dir, configs[0].cache_ttl_s) == (cache_dir, 120.0)
+    assert configs[1].cache_dir is None
+
+
+def test_sweep_command_ranks_and_resumes(tmp_path, capsys):
+    from swing_trade_b3.adapters.persistence.repositories import save_processed
+    from tests.test_indicators import make_bars
+
+    processed, results = tmp_path / "processed", tmp_path / "sweep.jsonl"
+    bars = make_bars({"SW1": 125, "SW2": 120})
+    for sym, frame in bars.groupby("symbol"):
+        save_processed(str(sym), frame.iloc[:120].reset_index(drop=True), processed)
+    base = ["sweep", "-s", "SW1", "SW2", "--processed", str(processed)]
+    base += ["--results", str(results), "--grid", "rsi_period=7,14"]
+    args = base + ["--random", "stop_loss=0:0.05", "--samples", "2", "--workers", "2"]
+    assert main(args) == 0
+    out = capsys.readouterr().out
+    assert "Varredura: 8 avaliações novas, 0 reaproveitadas" in out
+    assert "rsi_period" in out and "total_return" in out
+    assert main(args + ["--top", "1"]) == 0
+    assert "0 avaliações novas, 8 reaproveitadas" in capsys.readouterr().out
+    # new processed bars for SW1: its results are stale and evaluated again
+    save_processed("SW1", bars[bars["symbol"] == "SW1"].iloc[120:], processed)
+    assert main(args) == 0
+    assert "4 avaliações novas, 4 reaproveitadas" in capsys.readouterr().out
+
+    assert main(base + ["--metric", "sharpe"]) == 1
+    assert "métrica desconhecida" in capsys.readouterr().out
+    assert main(base + ["-s", "NOPE", "--grid", "rsi_period=14"]) == 1
+    out = capsys.readouterr().out
+    assert "Falhas:" in out and "Nenhum resultado" in out
+
+
+def test_sweep_command_validations(tmp_path, capsys):
+    base = ["sweep", "-s", "SW1", "--results", str(tmp_path / "r.jsonl")]
+    assert main(["sweep", "-s", " "]) == 2
+    assert main(base + ["--workers", "0"]) == 2
+    assert main(base + ["--grid", "rsi_period"]) == 2
+    assert main(base + ["--random", "stop_loss=0:1:2", "--samples", "1"]) == 2
+    assert main(base + ["--grid", "rsi_len=7"]) == 2
+    out = capsys.readouterr().out
+    assert "eixo inválido" in out and "MIN:MAX" in out and "rsi_len" in out
+    assert not (tmp_path / "r.jsonl").exists()
+    # no axes: the strategy defaults, here on a symbol without processed data
+    assert main(base + ["--processed", str(tmp_path)]) == 1
+    assert "SW1: no processed data" in capsys.readouterr().out
+
+
+def test_sweep_command_shared_panel_matches_per_worker_loading(tmp_path, capsys):
+    from multiprocessing import shared_memory
+
+    from swing_trade_b3.adapters.persistence.repositories import save_processed
+    from swing_trade_b3.adapters.persistence.sweep_store import SweepStore
+    from swing_trade_b3.services.price_panel import PricePanel
+    from tests.test_indicators import make_bars
+
+    processed = tmp_path / "processed"
+    for sym, frame in make_bars({"SP1": 120, "SP2": 90}).groupby("symbol"):
+        save_processed(str(sym), frame.reset_index(drop=True), processed)
+    base = ["sweep", "-s", "SP1", "SP2", "--processed", str(processed), "--workers", "2"]
+    base += ["--grid", "stop_loss=0,0.02"]
+    created: list[str] = []
+    real_publish = PricePanel.publish
+
+    def spy(self):
+        shared = real_publish(self)
+        created.append(shared.handle.name)
+        return shared
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(PricePanel, "publish", spy)
+        assert main(base + ["--results", str(tmp_path / "a.jsonl"), "--shared-panel"]) == 0
+    assert main(base + ["--results", str(tmp_path / "b.jsonl")]) == 0
+    capsys.readouterr()
+    shared = SweepStore(tmp_path / "a.jsonl").load().sort_values("key", ignore_index=True)
+    loaded = SweepStore(tmp_path / "b.jsonl").load().sort_values("key", ignore_index=True)
+    pd.testing.assert_frame_equal(shared, loaded[shared.columns])
+    assert len(created) == 1
+    with pytest.raises(FileNotFoundError):  # the segment was released after the sweep
+        shared_memory.SharedMemory(name=created[0])
+
+
+def test_panel_command_refreshes_wide_cache(tmp_path, capsys):
+    from swing_trade_b3.adapters.persistence.repositories import save_processed
+    from tests.test_indicators import make_bars
+
+    processed = tmp_path / "processed"
+    bars = make_bars({"PN1": 30})
+    save_processed("PN1", bars.iloc[:20], processed)
+    base = ["panel", "--processed", str(processed), "-s"]
+    assert main(base + ["PN1", "PN2"]) == 0
+    out = capsys.readouterr().out
+    assert "[PN1] created" in out and "[PN2] missing" in out
+    assert "Painel: 20 pregões × 1 símbolos de 2024-01-01 a 2024-01-26" in out
+    save_processed("PN1", bars.iloc[20:], processed)
+    assert main(base + ["PN1"]) == 0
+    assert "[PN1] appended" in capsys.readouterr().out
+    assert main(base + ["PN2"]) == 1
+    assert "Painel: 30 pregões × 0 símbolos ->" in capsys.readouterr().out
+    assert main(["panel", "-s", " "]) == 2
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from swing_trade_b3.adapters.persistence import mmap_cache as mc
+from swing_trade_b3.adapters.persistence.repositories import load_processed, save_processed
+
+
+def make_bars(days, sym="MM", close=1.0):
+    dates = pd.bdate_range(days[0], days[1], tz="UTC")
+    return pd.DataFrame(
+        {
+            "date": dates,
+            "symbol": sym,
+            "open": 1.0,
+            "high": 2.0,
+            "low": 0.5,
+            "close": [close + i for i in range(len(dates))],
+            "volume": 100,
+        }
+    )
+
+
+def test_open_cached_is_memory_mapped_and_zero_copy(tmp_path):
+    save_processed("MM", make_bars(("2024-01-01", "2024-03-29")), base_dir=tmp_path)
+    assert not mc.cache_path("MM", tmp_path).exists()
+
+    table = mc.open_cached("MM", tmp_path)
+    assert table is not None and mc.cache_path("MM", tmp_path).exists()
+    df = mc.load_cached("MM", tmp_path)
+    pd.testing.assert_frame_equal(df, load_processed("MM", tmp_path))
+
+    # numeric/date columns are views over the mapped buffers (read-only, no copy)
+    view = table.select(["date", "close"]).to_pandas(split_blocks=True)
+    close_buf = np.frombuffer(table.column("close").chunk(0).buffers()[1], dtype="float64")
+    assert np.shares_memory(view["close"].to_numpy(), close_buf)
+    assert not view["close"].to_numpy().flags.writeable
+
+    closes = mc.load_cached("MM", tmp_path, columns=["close"])
+    assert list(closes.columns) == ["close"] and len(closes) == len(df)
+
+
+def test_cache_follows_save_processed_and_recovers(tmp_path):
+    save_processed("MM", make_bars(("2024-01-01", "2024-01-31")), base_dir=tmp_path)
+    first = mc.load_cached("MM", tmp_path)
+    fingerprint = mc.processed_fingerprint("MM", tmp_path)
+
+    # tail append changes the fingerprint -> the next open rebuilds the cache
+    save_processed("MM", make_bars(("2024-02-01", "2024-02-09")), base_dir=tmp_path)
+    assert str(mc.processed_fingerprint("MM", tmp_path)).startswith(f"{fingerprint};")
+    after = mc.load_cached("MM", tmp_path)
+    assert len(after) == len(first) + 7
+    pd.testing.assert_frame_equal(after, load_processed("MM", tmp_path))
+
+    # a truncated/corrupt cache file is rebuilt transparently (copy first: `after` views the
+    # mapping, and this test truncates the file in place, which the cache itself never does)
+    after = after.copy()
+    mc.cache_path("MM", tmp_path).write_bytes(b"garbage")
+    pd.testing.assert_frame_equal(mc.load_cached("MM", tmp_path), after)
+
+
+def test_uncacheable_data_falls_back_to_load_processed(tmp_path):
+    # CSV output and missing symbols carry no marker: never cached
+    save_processed("CV", make_bars(("2024-01-01", "2024-01-05"), sym="CV"), tmp_path, fmt="csv")
+    assert mc.open_cached("CV", tmp_path) is None
+    assert mc.build_cache("CV", tmp_path) is None
+    assert len(mc.load_cached("CV", tmp_path, columns=["date", "close"])) == 5
+    assert mc.load_cached("NONE", tmp_path).empty
+    assert not (tmp_path / mc.CACHE_DIRNAME).exists()
+
+
+def test_loaders_return_compact_schema_on_request(tmp_path):
+    from swing_trade_b3.adapters.persistence.dataset import load_dataset, save_dataset
+    from swing_trade_b3.adapters.persistence.repositories import load_raw, save_raw
+    from swing_trade_b3.services.signals import to_canonical, to_compact
+
+    bars = make_bars(("2023-12-27", "2024-01-05"))
+    save_raw("MM", bars, base_dir=tmp_path / "raw", fmt="parquet")
+    raw = load_raw("MM", tmp_path / "raw", compact=True)
+    assert str(raw["close"].dtype) == "float32" and str(raw["date"].dtype) == "datetime64[s, UTC]"
+    closes = load_raw("MM", tmp_path / "raw", columns=["close"], compact=True)
+    assert list(closes.columns) == ["close"]
+
+    # writers take compact frames and persist the canonical schema
+    save_processed("MM", to_compact(bars), base_dir=tmp_path)
+    canonical = load_processed("MM", tmp_path)
+    pd.testing.assert_frame_equal(canonical, to_canonical(raw))
+    pd.testing.assert_frame_equal(load_processed("MM", tmp_path, compact=True), raw)
+    pd.testing.assert_frame_equal(mc.load_cached("MM", tmp_path, compact=True), raw)
+    save_processed("CV", bars.assign(symbol="CV"), tmp_path, fmt="csv")
+    assert mc.load_cached("CV", tmp_path, compact=True)["symbol"].dtype == "category"
+
+    save_dataset(bars, tmp_path / "ds")
+    pd.testing.assert_frame_equal(load_dataset(tmp_path / "ds", compact=True), raw)
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swing_trade_b3.adapters.persistence import panel_cache as pc
+from swing_trade_b3.adapters.persistence.repositories import load_processed, save_processed
+from swing_trade_b3.services.calendar import sessions
+from tests.test_indicators import make_bars
+
+BARS = make_bars({"AAA": 60, "BBB": 40}, seed=11)
+
+
+def wide_close(base, symbols):
+    """Reference: pivot of the full processed frames on the calendar-aligned axis."""
+    df = pd.concat([load_processed(s, base) for s in symbols], ignore_index=True)
+    wide = df.astype({"symbol": object}).pivot(index="date", columns="symbol", values="close")
+    axis = wide.index.union(sessions(wide.index[0], wide.index[-1]))
+    return wide.reindex(axis)[list(symbols)]
+
+
+def manifest(base):
+    return json.loads((pc.panel_cache_dir(base) / pc.MANIFEST_NAME).read_text())
+
+
+def test_panel_is_calendar_aligned_and_reused(tmp_path):
+    gap = BARS["date"] != pd.Timestamp("2024-01-16", tz="UTC")  # a session nobody traded
+    save_processed("AAA", BARS[gap & (BARS["symbol"] == "AAA")].iloc[:50], tmp_path)
+    save_processed("BBB", BARS[gap & (BARS["symbol"] == "BBB")], tmp_path)
+    panel, statuses = pc.update_wide_panel(["BBB", "AAA", "BBB"], tmp_path)
+    assert statuses == {"BBB": "created", "AAA": "created"}
+    assert panel.symbols == ["BBB", "AAA"]
+    expected = wide_close(tmp_path, ["BBB", "AAA"])
+    pd.testing.assert_frame_equal(panel.field("close"), expected, check_freq=False)
+    # 2024-01-01 is a holiday with a bar (kept); sessions without any bar are NaN rows
+    assert pd.Timestamp("2024-01-01", tz="UTC") in panel.dates
+    assert panel.field("close").loc["2024-01-16"].isna().all()
+    assert panel.field("volume").dropna().eq(100).all().all()
+
+    values_file = manifest(tmp_path)["values"]
+    panel, statuses = pc.update_wide_panel(["AAA"], tmp_path)
+    assert statuses == {"AAA": "unchanged"} and manifest(tmp_path)["values"] == values_file
+    pd.testing.assert_frame_equal(panel.field("close"), expected[["AAA"]], check_freq=False)
+
+
+def test_appended_days_read_only_new_tail_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(pc, "PANEL_CHUNK_DATES", 10)
+    aaa, bbb = BARS[BARS["symbol"] == "AAA"], BARS[BARS["symbol"] == "BBB"]
+    save_processed("AAA", aaa.iloc[:50], tmp_path)
+    save_processed("BBB", bbb.iloc[:30], tmp_path)
+    pc.update_wide_panel(["AAA", "BBB"], tmp_path)
+    old_files = manifest(tmp_path)["values"]
+    assert len(old_files) == 5  # 50 dates in chunks of 10
+
+    save_processed("AAA", aaa.iloc[50:55], tmp_path)
+    save_processed("AAA", aaa.iloc[55:], tmp_path)
+    save_processed("BBB", bbb.iloc[30:], tmp_path)  # lagging symbol: dates already cached
+    assert len(list(tmp_path.glob("AAA.tail-*.parquet"))) == 2
+
+    def no_full_reload(*args, **kwargs):
+        raise AssertionError("full reload")
+
+    with monkeypatch.context() as mp:
+        mp.setattr(pc, "load_processed", no_full_reload)
+        panel, statuses = pc.update_wide_panel(["AAA", "BBB"], tmp_path)
+    assert statuses == {"AAA": "appended", "BBB": "appended"}
+    expected = wide_close(tmp_path, ["AAA", "BBB"])
+    pd.testing.assert_frame_equal(panel.field("close"), expected, check_freq=False)
+    assert panel.dates[-1] == aaa["date"].iloc[-1]
+
+    # only the chunks holding new cells were written: BBB's days 30-39 and AAA's new chunk
+    directory = pc.panel_cache_dir(tmp_path)
+    new_files = manifest(tmp_path)["values"]
+    assert len(new_files) == 6 and new_files[5] not in old_files
+    assert [n == o for n, o in zip(new_files, old_files)] == [True, True, True, False, True]
+    assert not (directory / old_files[3]).exists()
+    assert not list(directory.glob(".*.tmp"))
+    pd.testing.assert_frame_equal(
+        pc.update_wide_panel(["AAA", "BBB"], tmp_path)[0].field("close"),
+        expected,
+        check_freq=False,
+    )
+
+
+def test_rewritten_removed_and_unmarked_symbols(tmp_path):
+    save_processed("AAA", BARS[BARS["symbol"] == "AAA"], tmp_path)
+    bbb = BARS[BARS["symbol"] == "BBB"].copy()
+    save_processed("BBB", bbb, tmp_path)
+    pc.update_wide_panel(["AAA", "BBB"], tmp_path)
+
+    bbb.loc[bbb.index[5], "close"] = 1234.0  # history correction: full rewrite
+    save_processed("BBB", bbb, tmp_path)
+    panel, statuses = pc.update_wide_panel(["BBB", "ZZZ"], tmp_path)
+    assert statuses == {"BBB": "rebuilt", "ZZZ": "missing"}
+    assert (
+        panel.symbols == ["BBB"] and panel.field("close").at[bbb["date"].iloc[5], "BBB"] == 1234.0
+    )
+
+    (tmp_path / "BBB.parquet").unlink()
+    panel, statuses = pc.update_wide_panel(["AAA", "BBB"], tmp_path)
+    assert statuses == {"AAA": "unchanged", "BBB": "missing"} and panel.symbols == ["AAA"]
+    assert manifest(tmp_path)["symbols"] == ["AAA"]
+
+    # CSV data has no processed marker: reloaded every time
+    save_processed("CSV", bbb.assign(symbol="CSV"), tmp_path, fmt="csv")
+    _panel, statuses = pc.update_wide_panel(["CSV"], tmp_path)
+    assert statuses == {"CSV": "created"}
+    panel, statuses = pc.update_wide_panel(["CSV", "AAA"], tmp_path)
+    assert statuses == {"CSV": "rebuilt", "AAA": "unchanged"}
+    assert manifest(tmp_path)["fingerprints"]["CSV"] is None
+    np.testing.assert_allclose(panel.frame("CSV")["close"], bbb["close"])
+
+    empty, statuses = pc.update_wide_panel(["NOPE"], tmp_path / "empty")
+    assert statuses == {"NOPE": "missing"} and empty.values.shape == (5, 0, 0)
+
+
+@pytest.mark.parametrize(
+    "damage",
+    ["manifest", "values", "shape", "fields"],
+)
+def test_unusable_cache_is_rebuilt(tmp_path, damage):
+    save_processed("AAA", BARS[BARS["symbol"] == "AAA"], tmp_path)
+    pc.update_wide_panel(["AAA"], tmp_path)
+    directory = pc.panel_cache_dir(tmp_path)
+    data = manifest(tmp_path)
+    if damage == "manifest":
+        (directory / pc.MANIFEST_NAME).write_text("{not json")
+    elif damage == "values":
+        (directory / data["values"][0]).write_bytes(b"garbage")
+    elif damage == "shape":
+        (directory / pc.MANIFEST_NAME).write_text(json.dumps({**data, "symbols": ["A", "B"]}))
+    else:
+        pc.update_wide_panel(["AAA"], tmp_path, fields=("close",))
+    panel, statuses = pc.update_wide_panel(["AAA"], tmp_path)
+    assert statuses == {"AAA": "created"}
+    pd.testing.assert_frame_equal(
+        panel.field("close"), wide_close(tmp_path, ["AAA"]), check_freq=False
+    )
@@ -65,3 +65,58 @@ def test_save_raw_parquet_with_compression(tmp_path):
     # read back
     back = pd.read_parquet(p)
     assert len(back) == 2
+
+
+def test_last_raw_date_reads_newest_partition_only(tmp_path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from swing_trade_b3.adapters.persistence.repositories import last_raw_date, save_raw
+
+    base = tmp_path / "data" / "raw"
+    assert last_raw_date("NOPE", base) is None
+    (base / "HDR").mkdir(parents=True)
+    (base / "HDR" / "2024.csv").write_text("date,symbol,open,high,low,close,volume\n")
+    assert last_raw_date("HDR", base) is None
+
+    df = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2022-12-29", "2023-01-02", "2023-01-03"], utc=True),
+            "symbol": ["T3"] * 3,
+            "open": [1.0, 1.0, 1.0],
+            "high": [1.0, 1.0, 1.0],
+            "low": [1.0, 1.0, 1.0],
+            "close": [1.0, 1.0, 1.0],
+            "volume": [1, 1, 1],
+        }
+    )
+    save_raw("T3", df, base_dir=base, fmt="parquet")
+    # a broken, older partition is never opened
+    (base / "T3" / "2001.parquet").write_bytes(b"not parquet")
+    (base / "T3" / "notes.csv").write_text("x\n")
+    assert last_raw_date("T3", base) == pd.Timestamp("2023-01-03", tz="UTC")
+
+    # CSV partition in the newest year wins; read from the file tail
+    save_raw("T3", df.assign(date=df["date"] + pd.Timedelta(days=400)), base_dir=base, fmt="csv")
+    assert last_raw_date("T3", base) == pd.Timestamp("2024-02-07", tz="UTC")
+
+    # header-only / dateless files are ignored and the previous year is used
+    (base / "T3" / "2025.csv").write_text("date,symbol\n")
+    (base / "T3" / "2026.csv").write_text("symbol\nT3\n")
+    (base / "T3" / "2027.parquet").write_bytes(b"")
+    pq.write_table(pa.table({"symbol": ["T3"]}), base / "T3" / "2027.parquet")
+    assert last_raw_date("T3", base) == pd.Timestamp("2024-02-07", tz="UTC")
+
+    # Parquet without statistics falls back to reading the date column only
+    table = pa.Table.from_pandas(df.assign(date=df["date"] + pd.Timedelta(days=3000)))
+    pq.write_table(table, base / "T3" / "2031.parquet", write_statistics=False)
+    assert last_raw_date("T3", base) == pd.Timestamp("2031-03-22", tz="UTC")
+
+
+def test_last_raw_date_large_csv_tail(tmp_path):
+    from swing_trade_b3.adapters.persistence.repositories import _last_date_csv
+
+    p = tmp_path / "2020.csv"
+    rows = "\n".join(f"2020-01-01T00:00:00,SYM,{i},1,1,1,1" for i in range(500))
+    p.write_text("date,symbol,open,high,low,close,volume\n" + rows + "\n2020-12-30,SYM,1,1,1,1,1\n")
+    assert _last_date_csv(p, tail_bytes=64) == pd.Timestamp("2020-12-30", tz="UTC")
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swing_trade_b3.services import price_panel as pp
+from tests.test_indicators import make_bars
+
+BARS = make_bars({"AAA": 40, "BBB": 25, "CCC": 30}, seed=5)
+
+
+def close_sum(loader: pp.PanelLoader, symbol: str) -> tuple[float, bool]:
+    panel = pp.attach_panel(loader.handle)
+    return float(loader(symbol)["close"].sum()), panel.values.flags.writeable
+
+
+def test_panel_pivots_and_round_trips_symbol_frames():
+    # holes: BBB misses a date that the others have
+    df = BARS.drop(index=BARS.index[(BARS["symbol"] == "BBB")][3]).sample(frac=1, random_state=1)
+    panel = pp.PricePanel.from_frame(df)
+    assert panel.symbols == ["AAA", "BBB", "CCC"] and len(panel.dates) == 40
+    close = panel.field("close")
+    expected = df.astype({"symbol": object}).pivot(index="date", columns="symbol", values="close")
+    pd.testing.assert_frame_equal(close, expected, check_freq=False)
+    assert np.shares_memory(close.to_numpy(), panel.values)
+    assert panel.values[0, 1].flags.c_contiguous  # a symbol's column is contiguous
+
+    for sym, group in df.groupby("symbol"):
+        original = group.sort_values("date", ignore_index=True)
+        pd.testing.assert_frame_equal(panel.frame(str(sym)), original, check_freq=False)
+    assert panel.frame("ZZZ").empty
+    closes = pp.PricePanel.from_frame(df, fields=("close",))
+    assert list(closes.frame("AAA").columns) == ["date", "symbol", "close"]
+    with pytest.raises(ValueError, match="axes"):
+        pp.PricePanel(panel.dates, ["AAA"], panel.fields, panel.values)
+
+
+def test_publish_attach_share_pages_and_close_unlinks():
+    panel = pp.PricePanel.from_frame(BARS)
+    with panel.publish() as shared:
+        handle = pickle.loads(pickle.dumps(shared.handle))
+        assert len(pickle.dumps(handle)) < 2_000  # axes only, no prices
+        attached = pp.attach_panel(handle)
+        assert pp.attach_panel(handle) is attached
+        pd.testing.assert_frame_equal(attached.field("close"), panel.field("close"))
+        pd.testing.assert_frame_equal(pp.PanelLoader(handle)("CCC"), panel.frame("CCC"))
+        with pytest.raises(ValueError, match="read-only"):
+            attached.values[0, 0, 0] = 1.0
+
+        other = shared_memory.SharedMemory(name=handle.name)  # a second mapping
+        np.ndarray(attached.values.shape, buffer=other.buf)[3, 0, 0] = -1.0
+        assert attached.field("close").iloc[0, 0] == -1.0
+        other.close()
+        assert not shared.closed
+    assert shared.closed and handle.name not in pp._ATTACHED
+    shared.close()  # idempotent
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=handle.name)
+
+
+def test_workers_attach_the_published_panel():
+    panel = pp.PricePanel.load(["AAA", "BBB", "NOPE"], lambda s: BARS[BARS["symbol"] == s])
+    assert panel.symbols == ["AAA", "BBB"]
+    shared = panel.publish()
+    loader = pp.PanelLoader(shared.handle)
+    try:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            sums = list(pool.map(close_sum, [loader] * 3, ["AAA", "BBB", "NOPE"]))
+    finally:
+        shared.close()
+    expected = BARS.groupby("symbol")["close"].sum()
+    assert sums[0] == (pytest.approx(expected["AAA"]), False)
+    assert sums[1][0] == pytest.approx(expected["BBB"]) and sums[2][0] == 0.0
+
+
+def test_empty_panel_and_finalizer_cleanup():
+    panel = pp.PricePanel.load(["NOPE"], lambda s: BARS.iloc[:0])
+    assert panel.values.shape == (5, 0, 0) and panel.field("close").empty
+    shared = panel.publish()
+    name = shared.handle.name
+    assert pp.attach_panel(shared.handle).frame("NOPE").empty
+    del shared  # dropped without close(): the finalizer unlinks the segment
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
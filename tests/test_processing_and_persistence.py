@@ -1,4 +1,7 @@
+from pathlib import Path
+
 import pandas as pd
+import pytest
 
 from swing_trade_b3.adapters.persistence.repositories import save_raw, load_raw, save_processed
 from swing_trade_b3.services.signals import clean_and_validate, STD_COLS
@@ -340,3 +343,281 @@ def test_load_raw_empty_dir_returns_empty(tmp_path):
     sym_dir.mkdir(parents=True, exist_ok=True)
     out = load_raw("EMPTY", base_dir=tmp_path / "data" / "raw")
     assert out.empty
+
+
+def _bar(day, close=1.0, sym="AP"):
+    return {
+        "date": pd.Timestamp(day, tz="UTC"),
+        "symbol": sym,
+        "open": 1.0,
+        "high": 2.0,
+        "low": 0.5,
+        "close": close,
+        "volume": 10,
+    }
+
+
+def test_save_raw_append_deltas_and_compaction(tmp_path):
+    from swing_trade_b3.adapters.persistence.repositories import last_raw_date
+
+    base = tmp_path / "raw"
+    save_raw("AP", make_df([_bar("2024-01-02"), _bar("2024-01-03")]), base_dir=base)
+    p1 = save_raw(
+        "AP",
+        make_df([_bar("2024-01-03", close=9.0), _bar("2024-01-04")]),
+        base_dir=base,
+        append=True,
+        compact_threshold=3,
+    )
+    p2 = save_raw(
+        "AP", make_df([_bar("2024-01-05")]), base_dir=base, append=True, compact_threshold=3
+    )
+    assert [p.name for p in p1 + p2] == ["2024.delta-000001.csv", "2024.delta-000002.csv"]
+    # base partition untouched: 2 rows
+    assert len(pd.read_csv(base / "AP" / "2024.csv")) == 2
+
+    # readers see base + deltas transparently, later writes win
+    df = load_raw("AP", base_dir=base)
+    assert len(df) == 4 and df["date"].is_monotonic_increasing
+    assert df.loc[df["date"] == pd.Timestamp("2024-01-03", tz="UTC"), "close"].item() == 9.0
+    assert last_raw_date("AP", base) == pd.Timestamp("2024-01-05", tz="UTC")
+
+    # third delta reaches the threshold -> folded back into 2024.csv
+    p3 = save_raw(
+        "AP", make_df([_bar("2024-01-08")]), base_dir=base, append=True, compact_threshold=3
+    )
+    assert [p.name for p in p3] == ["2024.csv"]
+    assert sorted(p.name for p in (base / "AP").iterdir()) == ["2024.csv"]
+    assert len(load_raw("AP", base_dir=base)) == 5
+
+    # a new year starts as a base partition even in append mode
+    p4 = save_raw("AP", make_df([_bar("2025-01-02")]), base_dir=base, append=True)
+    assert [p.name for p in p4] == ["2025.csv"]
+
+
+def test_compact_raw_parquet_and_full_rewrite_folds_deltas(tmp_path):
+    from swing_trade_b3.adapters.persistence.repositories import compact_raw
+
+    base = tmp_path / "raw"
+    assert compact_raw("NONE", base) == []
+    kw = {"base_dir": base, "fmt": "parquet", "compression": "snappy"}
+    save_raw("AP", make_df([_bar("2023-12-28"), _bar("2024-01-02")]), **kw)
+    save_raw("AP", make_df([_bar("2023-12-29"), _bar("2024-01-03")]), append=True, **kw)
+    names = sorted(p.name for p in (base / "AP").iterdir())
+    assert names == [
+        "2023.delta-000001.parquet",
+        "2023.parquet",
+        "2024.delta-000001.parquet",
+        "2024.parquet",
+    ]
+    (base / "AP" / "old.delta-1.bak").write_text("ignored")
+
+    out = compact_raw("AP", base, compression="snappy")
+    assert sorted(p.name for p in out) == ["2023.parquet", "2024.parquet"]
+    assert len(pd.read_parquet(base / "AP" / "2024.parquet")) == 2
+    assert compact_raw("AP", base) == []
+
+    # a regular (non-append) save also folds pending deltas so nothing stale survives
+    save_raw("AP", make_df([_bar("2024-01-04", close=3.0)]), append=True, **kw)
+    save_raw("AP", make_df([_bar("2024-01-04", close=5.0)]), **kw)
+    assert not list((base / "AP").glob("2024.delta-*"))
+    df = load_raw("AP", base_dir=base)
+    assert df.loc[df["date"] == pd.Timestamp("2024-01-04", tz="UTC"), "close"].item() == 5.0
+
+
+def test_load_raw_prunes_years_pushes_filters_and_projects(tmp_path, monkeypatch):
+    import pytest
+
+    base = tmp_path / "raw"
+    rows = [_bar(d) for d in ("2021-06-01", "2022-06-01", "2023-01-10", "2023-02-10")]
+    save_raw("PR", make_df(rows), base_dir=base, fmt="parquet")
+    save_raw("PR", make_df([_bar("2024-03-01")]), base_dir=base, fmt="csv")
+    # an unreadable partition in a year outside the window is never opened
+    (base / "PR" / "2021.parquet").write_bytes(b"corrupt")
+
+    seen: list[tuple[str, dict]] = []
+    real_read_parquet = pd.read_parquet
+
+    def spy(path, **kwargs):  # noqa: ANN001
+        seen.append((str(path), kwargs))
+        return real_read_parquet(path, **kwargs)
+
+    monkeypatch.setattr(pd, "read_parquet", spy)
+    out = load_raw(
+        "PR",
+        base_dir=base,
+        start=pd.Timestamp("2023-02-01"),
+        end=pd.Timestamp("2023-12-31", tz="UTC"),
+        columns=["date", "close"],
+    )
+    assert list(out.columns) == ["date", "close"] and len(out) == 1
+    assert [p.rsplit("/", 1)[1] for p, _ in seen] == ["2023.parquet"]
+    assert seen[0][1]["columns"] == ["date", "close"] and len(seen[0][1]["filters"]) == 2
+
+    # projection without date and without filters
+    closes = load_raw("PR", base_dir=base, columns=["close"], start=None)
+    assert list(closes.columns) == ["close"]
+
+    # window with no partition at all
+    assert load_raw("PR", base_dir=base, start=pd.Timestamp("2030-01-01")).empty
+
+    with pytest.raises(ValueError):
+        load_raw("PR", base_dir=base, columns=["adjclose"])
+
+
+def test_load_raw_parquet_pushdown_falls_back(tmp_path):
+    base = tmp_path / "raw" / "FB"
+    base.mkdir(parents=True)
+    # dates stored as strings: the typed filter cannot be pushed down
+    pd.DataFrame.from_records([{**_bar("2023-01-10"), "date": "2023-01-10"}]).to_parquet(
+        base / "2023.parquet", index=False
+    )
+    out = load_raw("FB", base_dir=tmp_path / "raw", start=pd.Timestamp("2023-01-01"))
+    assert len(out) == 1 and str(out["date"].dt.tz) == "UTC"
+
+
+def test_save_processed_marker_skips_unchanged_and_load_processed(tmp_path, monkeypatch):
+    from swing_trade_b3.adapters.persistence import repositories as repo
+    from swing_trade_b3.services.signals import content_hash
+
+    out = tmp_path / "processed"
+    df = clean_and_validate(make_df([_bar("2024-01-02"), _bar("2024-01-03")]))
+    path = save_processed("MK", df, base_dir=out)
+    marker = repo.processed_marker(path)
+    assert marker == {
+        "schema_version": 1,
+        "rows": 2,
+        "hash": content_hash(df),
+        "first": ["AP", "2024-01-02T00:00:00+00:00"],
+        "last": ["AP", "2024-01-03T00:00:00+00:00"],
+    }
+
+    # unchanged content: neither read nor rewritten
+    def no_read(*a, **k):  # noqa: ANN001
+        raise AssertionError("existing file should not be read")
+
+    mtime = path.stat().st_mtime_ns
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_parquet", no_read)
+        assert save_processed("MK", df.copy(), base_dir=out) == path
+    assert path.stat().st_mtime_ns == mtime
+
+    # overlapping rows merge into the base and refresh the marker
+    save_processed("MK", make_df([_bar("2024-01-03", close=3.0)]), base_dir=out)
+    merged = repo.load_processed("MK", out)
+    assert list(merged["close"]) == [1.0, 3.0]
+    assert repo.processed_marker(path) == {**marker, "hash": content_hash(merged)}
+
+    # stale schema version invalidates the marker: readers fall back to full cleaning
+    monkeypatch.setattr(repo, "SCHEMA_VERSION", 2)
+    assert repo.processed_marker(path) is None
+    assert repo.load_processed("MK", out).equals(merged)
+
+
+def test_processed_marker_absent_and_load_processed_fallbacks(tmp_path):
+    from swing_trade_b3.adapters.persistence import repositories as repo
+
+    out = tmp_path / "processed"
+    out.mkdir()
+    legacy = make_df([_bar("2024-01-03"), _bar("2024-01-02")])
+    legacy.to_parquet(out / "LG.parquet", index=False)
+    (out / "BAD.parquet").write_bytes(b"not parquet")
+    assert repo.processed_marker(out / "LG.parquet") is None
+    assert repo.processed_marker(out / "BAD.parquet") is None
+
+    # legacy (unmarked) file is cleaned on load and marked on the next save
+    back = repo.load_processed("LG", out)
+    assert back["date"].is_monotonic_increasing and str(back["volume"].dtype) == "int64"
+    save_processed("LG", back, base_dir=out)
+    assert repo.processed_marker(out / "LG.parquet") is not None
+
+    legacy.to_csv(out / "CS.csv", index=False)
+    assert len(repo.load_processed("CS", out)) == 2
+    empty = repo.load_processed("NONE", out)
+    assert empty.empty and list(empty.columns) == STD_COLS
+
+
+def test_save_processed_appends_tail_files_and_folds_on_overlap(tmp_path, monkeypatch):
+    from swing_trade_b3.adapters.persistence import repositories as repo
+
+    out = tmp_path / "processed"
+    days = pd.bdate_range("2024-01-02", periods=6)
+    save_processed("TL", make_df([_bar(d) for d in days[:2]]), base_dir=out)
+    base_mtime = (out / "TL.parquet").stat().st_mtime_ns
+
+    # rows strictly after the stored tail: only a small tail file is written, history untouched
+    def no_read(*a, **k):  # noqa: ANN001
+        raise AssertionError("history should not be read on tail appends")
+
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_parquet", no_read)
+        save_processed("TL", make_df([_bar(days[2])]), base_dir=out)
+        save_processed("TL", make_df([_bar(days[3]), _bar(days[4])]), base_dir=out)
+    tails = sorted(p.name for p in out.glob("TL.tail-*.parquet"))
+    assert tails == ["TL.tail-000001.parquet", "TL.tail-000002.parquet"]
+    assert (out / "TL.parquet").stat().st_mtime_ns == base_mtime
+    assert [p.name for p in repo.processed_parts("TL", out)] == ["TL.parquet", *tails]
+
+    full = repo.load_processed("TL", out)
+    assert list(full["date"]) == list(days[:5].tz_localize("UTC")) and full.index.is_unique
+    # the whole logical content (base + tails) is recognized as unchanged
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_parquet", no_read)
+        save_processed("TL", full, base_dir=out)
+    # same length, different values: not unchanged -> full merge folds the tails
+    save_processed("TL", full.assign(close=2.0), base_dir=out)
+    assert not list(out.glob("TL.tail-*"))
+    assert list(repo.load_processed("TL", out)["close"]) == [2.0] * 5
+
+    # threshold reached: the next tail is folded back into the base instead
+    save_processed("TL", make_df([_bar(days[5])]), base_dir=out, compact_threshold=1)
+    assert not list(out.glob("TL.tail-*")) and len(repo.load_processed("TL", out)) == 6
+
+    # empty input never adds tails; an empty stored base cannot be extended
+    save_processed("TL", make_df([]), base_dir=out)
+    assert not list(out.glob("TL.tail-*"))
+    save_processed("EM", make_df([]), base_dir=out)
+    save_processed("EM", make_df([_bar(days[0])]), base_dir=out)
+    assert not list(out.glob("EM.tail-*")) and len(repo.load_processed("EM", out)) == 1
+
+    # an interrupted full rewrite never leaves the merged base next to the old tails
+    save_processed("CR", make_df([_bar(d) for d in days[:2]]), base_dir=out)
+    save_processed("CR", make_df([_bar(days[2])]), base_dir=out)
+    real_replace = Path.replace
+
+    def crash_on_base(self, target):  # noqa: ANN001
+        if Path(target).name == "CR.parquet":
+            raise KeyboardInterrupt
+        return real_replace(self, target)
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, "replace", crash_on_base)
+        with pytest.raises(KeyboardInterrupt):
+            save_processed("CR", make_df([_bar(days[1], close=3.0)]), base_dir=out)
+    assert not list(out.glob("CR.tail-*"))
+    assert list(repo.load_processed("CR", out)["date"]) == list(days[:2].tz_localize("UTC"))
+
+    # an unmarked tail makes readers fall back to full cleaning
+    make_df([_bar(days[5], close=9.0)]).to_parquet(out / "EM.tail-000007.parquet", index=False)
+    assert len(repo.load_processed("EM", out)) == 2
+
+
+def test_save_processed_accepts_compact_frames_with_intraday_stamps(tmp_path):
+    from swing_trade_b3.adapters.persistence.repositories import load_processed
+    from swing_trade_b3.services.signals import to_compact
+
+    out = tmp_path / "processed"
+    days = pd.bdate_range("2024-01-02", periods=5, tz="UTC") + pd.Timedelta(hours=3)
+    df = clean_and_validate(
+        make_df([_bar(d.tz_localize(None), float(i)) for i, d in enumerate(days)])
+    )
+    save_processed("HR", df, base_dir=out)
+
+    # same bars in compact form: no new rows, same stamps
+    save_processed("HR", to_compact(df), base_dir=out)
+    pd.testing.assert_frame_equal(load_processed("HR", out), df)
+    # a compact update of the last bar replaces it instead of adding a midnight twin
+    save_processed("HR", to_compact(df.tail(1).assign(close=9.0)), base_dir=out)
+    back = load_processed("HR", out)
+    assert len(back) == 5 and list(back["date"]) == list(days)
+    assert back["close"].iloc[-1] == 9.0
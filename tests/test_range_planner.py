@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+
+from swing_trade_b3.adapters.connectors.market_data import range_planner as rp
+
+
+def test_plan_range_uses_lookback_sessions_and_first_date():
+    today = date(2024, 6, 28)
+    # lookback to `start` (not the window span) picks the range
+    assert rp.plan_range(date(2024, 6, 3), date(2024, 6, 4), today=today) == "1mo"
+    assert rp.plan_range(date(2023, 1, 2), date(2023, 1, 3), today=today) == "5y"
+    assert rp.plan_range(date(2010, 1, 4), date(2010, 1, 5), today=today) == "max"
+    # weekends have no sessions
+    assert rp.plan_range(date(2024, 6, 22), date(2024, 6, 23), today=today) is None
+    # nor do holidays (Carnival Monday/Tuesday)
+    assert rp.plan_range(date(2024, 2, 10), date(2024, 2, 13), today=today) is None
+    # known first date: nothing before it, and no need to reach past it
+    first = date(2024, 3, 1)
+    assert rp.plan_range(date(2024, 1, 2), date(2024, 2, 28), today=today, earliest=first) is None
+    assert rp.plan_range(date(2000, 1, 3), today, today=today, earliest=first) == "6mo"
+
+    assert rp.range_floor("max", today) is None
+    assert rp.history_starts_at("max", date(2000, 1, 3), today=today)
+    assert rp.history_starts_at("1mo", date(2024, 6, 20), today=today)
+    assert not rp.history_starts_at("1mo", date(2024, 5, 30), today=today)
+
+
+def test_range_floors_follow_calendar_months_and_sessions():
+    today = date(2025, 3, 31)
+    assert rp.range_floor("1mo", today) == date(2025, 2, 28)  # clamped to the month's end
+    assert rp.range_floor("3mo", today) == date(2024, 12, 31)
+    assert rp.range_floor("5y", today) == date(2020, 3, 31)
+    assert rp.choose_range(date(2024, 12, 31), today) == "3mo"
+    assert rp.choose_range(date(2024, 12, 30), today) == "6mo"
+    assert rp.choose_range(date(2020, 3, 30), today) == "max"
+    # 3mo from 2025-03-31 starts on the year-end closure: the first bar on Jan 2 is still at
+    # the range edge, not a listing date
+    assert not rp.history_starts_at("3mo", date(2025, 1, 2), today=today)
+    # 1mo from 2025-03-07 starts right before Carnival (Mar 3-4): a first bar on Mar 5 too
+    assert not rp.history_starts_at("1mo", date(2025, 3, 5), today=date(2025, 3, 28))
+    assert rp.history_starts_at("1mo", date(2025, 3, 14), today=date(2025, 3, 28))
+
+
+def test_first_date_store_persists_merges_and_keeps_oldest(tmp_path):
+    store = rp.FirstDateStore(tmp_path / "fd.json")
+    assert store.get("AAA3") is None
+    store.record("AAA3", date(2020, 5, 4))
+    store.record("AAA3", date(2021, 1, 4))  # newer observation is ignored
+    assert store.get("AAA3") == date(2020, 5, 4)
+
+    # another process stored a symbol meanwhile: merged, not clobbered
+    other = rp.FirstDateStore(tmp_path / "fd.json")
+    other.record("BBB4", date(2019, 1, 2))
+    store.record("AAA3", date(2018, 1, 2))
+    saved = json.loads((tmp_path / "fd.json").read_text())
+    assert saved == {"AAA3": "2018-01-02", "BBB4": "2019-01-02"}
+    assert rp.FirstDateStore(tmp_path / "fd.json").get("AAA3") == date(2018, 1, 2)
+
+    (tmp_path / "fd.json").write_text("[not a mapping")
+    assert rp.FirstDateStore(tmp_path / "fd.json").get("AAA3") is None
+
+    memory = rp.FirstDateStore()
+    memory.record("CCC3", date(2022, 1, 3))
+    assert memory.get("CCC3") == date(2022, 1, 3)
+
+
+def test_get_first_dates_is_shared_per_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(rp, "_STORES", {})
+    a = rp.get_first_dates(tmp_path)
+    path = tmp_path / rp.FIRST_DATES_DIRNAME / rp.FIRST_DATES_FILENAME
+    assert rp.get_first_dates(str(tmp_path)) is a and a.path == path
+    assert rp.get_first_dates() is rp.get_first_dates() is not a
+    a.record("PETR4", date(2000, 1, 3))
+    assert path.exists()
+
+    # clearing an HTTP cache sharing the directory keeps the learned dates
+    from swing_trade_b3.adapters.connectors.market_data.http_cache import HttpCache
+
+    cache = HttpCache(tmp_path)
+    cache.put("http://x/api", b"{}")
+    cache.clear()
+    assert cache.get("http://x/api") is None and path.exists()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import math
+from functools import partial
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from swing_trade_b3.adapters.persistence.sweep_store import SweepStore
+from swing_trade_b3.services import sweep
+from swing_trade_b3.services.event_backtest import run_event_backtest
+from tests.test_event_backtest import FLAT, make_prices
+from tests.test_indicators import make_bars
+
+BARS = make_bars({"AAA": 300, "BBB": 250, "CCC": 200}, seed=3)
+
+
+def load_bars(symbol: str) -> pd.DataFrame:
+    return BARS[BARS["symbol"] == symbol].reset_index(drop=True)
+
+
+def failing_evaluate(df, params, cache):
+    if df["symbol"].iloc[0] == "BBB":
+        raise RuntimeError("boom")
+    return {"total_return": 0.0}
+
+
+class ZeroEvaluator:
+    def __call__(self, df, params, cache):
+        return {"total_return": 0.0}
+
+
+def test_param_grid_and_random_samples():
+    grid = sweep.param_grid({"b": [1, 2], "a": ["x"]})
+    assert grid == [{"a": "x", "b": 1}, {"a": "x", "b": 2}]
+    space = {"rsi_period": (5, 30), "stop_loss": (0.01, 0.1), "macd_fast": [8, 12]}
+    samples = sweep.random_samples(space, 20, seed=1)
+    assert samples == sweep.random_samples(space, 20, seed=1)
+    assert all(isinstance(s["rsi_period"], int) and 5 <= s["rsi_period"] <= 30 for s in samples)
+    assert all(0.01 <= s["stop_loss"] <= 0.1 and s["macd_fast"] in (8, 12) for s in samples)
+    assert sweep.result_key("A", {"x": 1, "y": 2}) == sweep.result_key("A", {"y": 2, "x": 1})
+    assert sweep.result_key("A", {"x": 1}) != sweep.result_key("B", {"x": 1})
+    assert sweep.result_key("A", {"x": 1}) != sweep.result_key("A", {"x": 1}, data="1:ab")
+    assert sweep.result_key("A", {"x": 1}) != sweep.result_key("A", {"x": 1}, evaluator="f")
+    assert sweep.evaluator_name(sweep.evaluate_rsi_macd) == (
+        "swing_trade_b3.services.sweep.evaluate_rsi_macd"
+    )
+    bound = sweep.evaluator_name(partial(sweep.evaluate_rsi_macd, cash=1.0))
+    assert bound == 'swing_trade_b3.services.sweep.evaluate_rsi_macd[[], {"cash": 1.0}]'
+    assert sweep.evaluator_name(ZeroEvaluator()) == "tests.test_sweep.ZeroEvaluator"
+
+
+def test_indicator_cache_shares_series_between_parameter_sets():
+    cache = sweep.IndicatorCache(load_bars("AAA"))
+    for stop in (0.0, 0.02, 0.05):
+        sweep.evaluate_rsi_macd(cache.df, {"stop_loss": stop}, cache)
+    assert cache.hits == 4  # rsi and macd computed once, reused by the two later sets
+    sweep.evaluate_rsi_macd(cache.df, {"rsi_period": 7}, cache)
+    assert cache.hits == 5 and len(cache._values) == 3
+    with pytest.raises(ValueError, match="unknown parameter"):
+        sweep.evaluate_rsi_macd(cache.df, {"rsi_len": 7}, cache)
+    assert sweep.evaluate_rsi_macd(cache.df, {}, cache, cash=1.0)["orders"] == 0  # can't afford
+
+
+def test_rsi_macd_rule_brackets_and_exits():
+    df = load_bars("AAA")
+    cache = sweep.IndicatorCache(df)
+    params = {**sweep.RSI_MACD_DEFAULTS, "stop_loss": 0.01, "take_profit": 0.02}
+    rule = sweep._RsiMacdRule(cache.rsi(14), cache.macd_hist(12, 26, 9), params)
+    orders = run_event_backtest(df, rule, cash=100_000.0).orders
+    filled = orders[orders["status"] == "filled"]
+    assert {"market", "stop", "limit"} <= set(filled["kind"])
+    # one leg of each bracket fills and the other is cancelled: at most the last bar's
+    # orders are still working
+    assert (orders["status"] == "working").sum() <= 2
+    buys, sells = filled[filled["side"] == "buy"], filled[filled["side"] == "sell"]
+    assert len(buys) - len(sells) in (0, 1)
+    assert sweep.evaluate_rsi_macd(df, {}, cache)["orders"] > 0
+
+
+def test_bracket_legs_reached_by_one_bar_do_not_open_a_short():
+    wide = (100.0, 110.0, 90.0, 100.0)
+    df = make_prices({"AAA": [FLAT, FLAT, FLAT, wide, FLAT, FLAT]})
+    params = {**sweep.RSI_MACD_DEFAULTS, "stop_loss": 0.02, "take_profit": 0.02}
+    rsi, hist = np.full(6, 50.0), np.array([-1.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+    result = run_event_backtest(df, sweep._RsiMacdRule(rsi, hist, params))
+    orders = result.orders
+    assert orders["kind"].tolist() == ["market", "stop", "limit"]
+    assert orders["status"].tolist() == ["filled", "filled", "cancelled"]
+    assert orders["fill_price"].iloc[1] == 98.0
+    assert result.positions["qty"].tolist() == [0]
+
+
+def test_run_sweep_resumes_and_matches_parallel_run(tmp_path):
+    sets = sweep.param_grid({"rsi_period": [7, 14], "stop_loss": [0.0, 0.03]})
+    serial = SweepStore(tmp_path / "serial.jsonl")
+    first = sweep.run_sweep(["AAA", "BBB"], sets, serial, loader=load_bars, chunk_size=3)
+    assert first == sweep.SweepSummary(evaluated=8, skipped=0, failures={})
+    again = sweep.run_sweep(["AAA", "BBB", "CCC"], sets, serial, loader=load_bars)
+    assert (again.evaluated, again.skipped) == (4, 8)
+
+    parallel = SweepStore(tmp_path / "parallel.jsonl")
+    summary = sweep.run_sweep(
+        ["AAA", "BBB", "CCC"], sets, parallel, loader=load_bars, workers=2, chunk_size=2
+    )
+    assert summary.evaluated == 12
+    left = serial.load().sort_values("key", ignore_index=True)
+    right = parallel.load().sort_values("key", ignore_index=True)
+    pd.testing.assert_frame_equal(left[right.columns], right)
+
+    ranked = sweep.rank(left, "total_return", top=2)
+    params = [f"param.{name}" for name in sweep.RSI_MACD_DEFAULTS]  # completed with defaults
+    assert sorted(ranked.columns) == sorted([*params, "total_return", "symbols"])
+    assert len(ranked) == 2 and (ranked["symbols"] == 3).all()
+    assert ranked["total_return"].is_monotonic_decreasing
+    assert sweep.rank(left.iloc[:0], "total_return").empty
+
+
+def test_run_sweep_reports_failures_and_retries_them(tmp_path):
+    store = SweepStore(tmp_path / "s.jsonl")
+    summary = sweep.run_sweep(["AAA"], [{}], store, loader=lambda sym: load_bars(sym).iloc[:0])
+    assert summary.evaluated == 0 and "no processed data" in summary.failures["AAA"]
+    summary = sweep.run_sweep(
+        ["AAA", "BBB"], [{}], store, loader=load_bars, evaluate=failing_evaluate, workers=2
+    )
+    assert summary.evaluated == 1 and summary.failures == {"BBB": "boom"}
+    name = sweep.evaluator_name(failing_evaluate)
+    assert store.done() == {sweep.result_key("AAA", sweep.RSI_MACD_DEFAULTS, evaluator=name)}
+
+
+def test_run_sweep_keys_follow_data_version_and_defaults(tmp_path):
+    store = SweepStore(tmp_path / "s.jsonl")
+    versions = {"AAA": "300:aa"}
+    kwargs: Dict[str, Any] = {"loader": load_bars, "version": versions.get}
+    assert sweep.run_sweep(["AAA"], [{}], store, **kwargs).evaluated == 1
+    # the explicit defaults are the same parameter set
+    summary = sweep.run_sweep(["AAA"], [dict(sweep.RSI_MACD_DEFAULTS)], store, **kwargs)
+    assert (summary.evaluated, summary.skipped) == (0, 1)
+    # new bars: evaluated again, and only the newer result is loaded
+    versions["AAA"] = "300:aa;1:bb"
+    assert sweep.run_sweep(["AAA"], [{"rsi_period": 14}], store, **kwargs).evaluated == 1
+    assert len(store.done()) == 2 and len(store.load()) == 1
+    # another evaluator does not reuse (nor supersede) the rule's results
+    summary = sweep.run_sweep(["AAA"], [{}], store, evaluate=ZeroEvaluator(), **kwargs)
+    assert summary.evaluated == 1 and len(store.load()) == 2
+
+
+def test_sweep_store_tolerates_truncated_rows(tmp_path):
+    store = SweepStore(tmp_path / "nested" / "s.jsonl")
+    assert store.done() == set() and store.load().empty
+    store.append([])
+    assert not store.path.exists()
+    row = {"key": "k1", "symbol": "AAA", "params": {"a": 1}, "metrics": {"m": 0.5}}
+    store.append([row])
+    with store.path.open("a", encoding="utf-8") as fh:
+        fh.write('\n{"key": "k2", "sym')  # interrupted mid-write
+    assert store.done() == {"k1"}
+    store.append([{**row, "key": "k3", "params": {"a": 2}, "metrics": {"m": math.nan}}])
+    table = store.load()
+    assert table["key"].tolist() == ["k1", "k3"]
+    assert table["param.a"].tolist() == [1, 2] and math.isnan(table["m"].iloc[1])
+    store.append([{**row, "key": "k4", "data": "v2"}])  # same set on newer data
+    assert store.load()["key"].tolist() == ["k3", "k4"]
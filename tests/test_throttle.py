@@ -39,3 +39,48 @@ def test_throttler_waits_and_validates():
 def test_throttler_rejects_negative_interval():
     with pytest.raises(ValueError):
         Throttler(-0.1)
+
+
+def test_throttler_shared_across_threads_spaces_calls():
+    import threading
+
+    clock = [0.0]
+    lock = threading.Lock()
+    slept: list[float] = []
+
+    def sleep_fn(s):
+        with lock:
+            slept.append(s)
+
+    t = Throttler(0.5, now_fn=lambda: clock[0], sleep_fn=sleep_fn)
+    threads = [threading.Thread(target=t.wait) for _ in range(4)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+    # clock never advances: each caller reserves a distinct slot 0.5s apart
+    assert sorted(slept) == pytest.approx([0.5, 1.0, 1.5])
+
+
+def test_async_throttler_spaces_coroutines_and_validates():
+    import asyncio
+
+    from swing_trade_b3.services.throttling import AsyncThrottler
+
+    clock = [0.0]
+    slept: list[float] = []
+
+    async def sleep_fn(s):
+        slept.append(s)
+
+    t = AsyncThrottler(0.25, now_fn=lambda: clock[0], sleep_fn=sleep_fn)
+
+    async def burst():
+        await asyncio.gather(*(t.wait() for _ in range(3)))
+
+    asyncio.run(burst())
+    assert sorted(slept) == pytest.approx([0.25, 0.5])
+
+    with pytest.raises(ValueError):
+        AsyncThrottler(-1.0)
@@ -77,3 +77,23 @@ def test_fetch_daily_volume_nullable_branch(monkeypatch):
     assert not out.empty
     # volume remains nullable Int64, not int64
     assert str(out["volume"].dtype) == "Int64"
+
+
+def test_fetch_daily_async_runs_blocking_download_in_thread(monkeypatch):
+    import asyncio
+
+    calls = {"throttle": 0}
+
+    def fake_fetch(symbol, start, end, meta=None):  # noqa: ARG001
+        return pd.DataFrame({"symbol": [symbol]})
+
+    async def throttle():
+        calls["throttle"] += 1
+
+    monkeypatch.setattr(yf, "fetch_daily", fake_fetch)
+    out = asyncio.run(
+        yf.fetch_daily_async("TEST3", date(2024, 1, 1), date(2024, 1, 2), throttle_wait=throttle)
+    )
+    assert list(out["symbol"]) == ["TEST3"] and calls["throttle"] == 1
+    out = asyncio.run(yf.fetch_daily_async("TEST3", date(2024, 1, 1), date(2024, 1, 2)))
+    assert len(out) == 1